@@ -7,6 +7,11 @@ from alembic import context
 from models.user import User
 from models.student import Student
 from models.document import Document
+from models.document_blob import DocumentBlob
+from models.storage_deletion import StorageDeletion
+from models.upload_session import UploadSession, UploadChunk
+from models.chat_sync_outbox import ChatSyncOutbox
+from models.email_outbox import EmailOutbox
 from models.follow import Follow
 from models.comments import Comment
 from models.likes import Like
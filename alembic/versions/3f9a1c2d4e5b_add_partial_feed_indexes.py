@@ -0,0 +1,102 @@
+"""add partial and covering indexes for hot feed predicates
+
+Revision ID: 3f9a1c2d4e5b
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d4e5b'
+down_revision: Union[str, Sequence[str], None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> (table, columns, partial predicate, covering columns)
+# Column order matches the ORDER BY of the query each index serves, so
+# Postgres can walk the index and stop after LIMIT rows (no sort step).
+# Predicates are written exactly as SQLAlchemy renders them:
+# Document.is_deleted.is_(False) -> "is_deleted IS false". The planner only
+# uses a partial index when it can prove the query implies the predicate,
+# and it does not treat "= false" and "IS false" as equivalent.
+INDEXES = {
+    # FeedService.get_public_feed:
+    #   WHERE visibility = 'public' AND is_deleted IS false ORDER BY created_at DESC
+    'ix_documents_public_feed': (
+        'documents',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        "visibility = 'public' AND is_deleted IS false",
+        ['user_id'],
+    ),
+    # /users/{id}/documents, GET /documents/ and following feed:
+    #   WHERE user_id = ? AND is_deleted IS false ORDER BY created_at DESC
+    'ix_documents_user_live_created': (
+        'documents',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        'is_deleted IS false',
+        ['visibility'],
+    ),
+    # BookmarkService.get_my_bookmarks: WHERE user_id = ? ORDER BY created_at DESC
+    'ix_bookmarks_user_created': (
+        'bookmarks',
+        ['user_id', sa.text('created_at DESC')],
+        None,
+        ['document_id'],
+    ),
+    # LikeService.get_like_users: WHERE document_id = ? ORDER BY created_at DESC
+    'ix_likes_document_created': (
+        'likes',
+        ['document_id', sa.text('created_at DESC')],
+        None,
+        ['user_id'],
+    ),
+    # /users/{id}/following: WHERE follower_id = ? ORDER BY created_at DESC
+    'ix_follows_follower_created': (
+        'follows',
+        ['follower_id', sa.text('created_at DESC')],
+        None,
+        ['following_id'],
+    ),
+    # /users/{id}/followers: WHERE following_id = ? ORDER BY created_at DESC
+    'ix_follows_following_created': (
+        'follows',
+        ['following_id', sa.text('created_at DESC')],
+        None,
+        ['follower_id'],
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where, include) in INDEXES.items():
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_include=include,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, (table, _, _, _) in INDEXES.items():
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,60 @@
+"""add content index for upload deduplication
+
+Revision ID: 4b8e2d7c1a9f
+Revises: 3f9a1c2d4e5b
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2d7c1a9f'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d4e5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'document_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('object_key', sa.String(length=500), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('object_key'),
+    )
+
+    op.add_column('documents', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_documents_content_sha256'), 'documents', ['content_sha256'], unique=False)
+
+    # Deduplicated documents share an object key; keys stay unique for the rest
+    # (existing rows and presigned uploads), which keeps commit idempotent
+    op.drop_index(op.f('ix_documents_object_key'), table_name='documents')
+    op.create_index(op.f('ix_documents_object_key'), 'documents', ['object_key'], unique=False)
+    op.create_index(
+        'uq_documents_object_key_unshared',
+        'documents',
+        ['object_key'],
+        unique=True,
+        postgresql_where=sa.text('content_sha256 IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Caution: fails while several documents share an object key
+    op.drop_index('uq_documents_object_key_unshared', table_name='documents')
+    op.drop_index(op.f('ix_documents_object_key'), table_name='documents')
+    op.create_index(op.f('ix_documents_object_key'), 'documents', ['object_key'], unique=True)
+
+    op.drop_index(op.f('ix_documents_content_sha256'), table_name='documents')
+    op.drop_column('documents', 'content_sha256')
+    op.drop_table('document_blobs')
@@ -0,0 +1,30 @@
+"""add rendered thumbnail keys to documents
+
+Revision ID: 9c3f5a1e7b2d
+Revises: 4b8e2d7c1a9f
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f5a1e7b2d'
+down_revision: Union[str, Sequence[str], None] = '4b8e2d7c1a9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('thumbnail_key', sa.String(length=500), nullable=True))
+    op.add_column('documents', sa.Column('preview_key', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'preview_key')
+    op.drop_column('documents', 'thumbnail_key')
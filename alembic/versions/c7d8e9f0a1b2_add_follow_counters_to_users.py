@@ -0,0 +1,52 @@
+"""add follow counters to users
+
+Revision ID: c7d8e9f0a1b2
+Revises: b462f89b5748
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, Sequence[str], None] = 'b462f89b5748'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('followers_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('following_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the existing follows table
+    op.execute("""
+        UPDATE users u
+        SET followers_count = COALESCE(f.cnt, 0)
+        FROM (
+            SELECT following_id, COUNT(*) AS cnt
+            FROM follows
+            GROUP BY following_id
+        ) f
+        WHERE f.following_id = u.id
+    """)
+    op.execute("""
+        UPDATE users u
+        SET following_count = COALESCE(f.cnt, 0)
+        FROM (
+            SELECT follower_id, COUNT(*) AS cnt
+            FROM follows
+            GROUP BY follower_id
+        ) f
+        WHERE f.follower_id = u.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'following_count')
+    op.drop_column('users', 'followers_count')
@@ -0,0 +1,39 @@
+"""add storage deletion outbox
+
+Revision ID: d5a7c9e1f3b4
+Revises: 9c3f5a1e7b2d
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c9e1f3b4'
+down_revision: Union[str, Sequence[str], None] = '9c3f5a1e7b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'storage_deletions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('object_key', sa.String(length=500), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('not_before', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_storage_deletions_not_before'), 'storage_deletions', ['not_before'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_storage_deletions_not_before'), table_name='storage_deletions')
+    op.drop_table('storage_deletions')
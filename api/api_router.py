@@ -8,6 +8,7 @@ from api.profile.upload_url import router as avator
 from api.profile.public_profile import router as public_profile
 from api.profile.avatar_upload import router as avatar_upload
 from api.document.document_upload import router as update_document
+from api.document.resumable_upload import router as resumable_upload
 from api.document.get_document import router as get_doc
 from api.document.user_documents import router as user_documents
 from api.feed.feed import router as feed
@@ -25,6 +26,7 @@ from api.like.like import router as like
 from api.bookmark.bookmark import router as bookmark
 from api.document.post import router as create_post_router
 from api.chat.chat_sync import router as chat_sync
+from api.storage.files import router as files
 
 api_router = APIRouter()
 
@@ -37,6 +39,7 @@ api_router.include_router(avator)
 api_router.include_router(public_profile)
 api_router.include_router(avatar_upload)
 api_router.include_router(update_document)
+api_router.include_router(resumable_upload)
 api_router.include_router(get_doc)
 api_router.include_router(user_documents)
 api_router.include_router(feed)
@@ -55,10 +58,4 @@ api_router.include_router(bookmark)
 
 api_router.include_router(create_post_router)
 api_router.include_router(chat_sync)
-
-
-
-
-
-
-
+api_router.include_router(files)
@@ -1,6 +1,12 @@
-from fastapi import APIRouter, Response, Request
-from dependencies.refresh_cookie_store import revoke_refresh_token
+from fastapi import APIRouter, Depends, Response, Request
+from dependencies.refresh_cookie_store import (
+    revoke_refresh_token,
+    revoke_all_refresh_tokens,
+    list_refresh_sessions,
+)
 from dependencies.auth import get_token_payload
+from dependencies.get_current_user import get_current_user
+from models.user import User
 from core.exceptions import DomainError
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -29,3 +35,47 @@ def logout(response: Response, request: Request):
     response.delete_cookie("refresh_token", path="/")
 
     return {"message": "Logged out successfully"}
+
+
+@router.post("/logout-all")
+def logout_all(
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
+    """Revoke every refresh session of the user (access tokens expire on their own)"""
+    revoked = revoke_all_refresh_tokens(current_user.id)
+
+    response.delete_cookie("access_token", path="/")
+    response.delete_cookie("refresh_token", path="/")
+
+    return {"message": "Logged out from all devices", "sessions_revoked": revoked}
+
+
+@router.get("/sessions")
+def list_sessions(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    current_session_id = None
+    refresh_token = request.cookies.get("refresh_token")
+    if refresh_token:
+        try:
+            current_session_id = get_token_payload(refresh_token).get("jti")
+        except Exception:
+            pass
+
+    sessions = list_refresh_sessions(current_user.id)
+    for session in sessions:
+        session["current"] = session["session_id"] == current_session_id
+
+    return {"sessions": sessions}
+
+
+@router.delete("/sessions/{session_id}")
+def revoke_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    # Keys are namespaced by user id, so a user can only revoke their own sessions
+    revoke_refresh_token(current_user.id, session_id)
+    return {"message": "Session revoked"}
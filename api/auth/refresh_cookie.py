@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Response, Request
 from jose import JWTError
 from core.exceptions import DomainError
-from dependencies.rotate_refresh_token import rotate_refresh_token
 from services.auth.jwt import create_access_token, create_refresh_token
 from dependencies.auth import get_token_payload
-from dependencies.refresh_cookie_store import is_refresh_token_valid
+from dependencies.refresh_cookie_store import rotate_refresh_token, device_metadata
 from core.config import mail_setting, app_settings
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -35,11 +34,15 @@ async def refresh_session(response: Response, request: Request):
     user_id = int(payload["sub"])
     refresh_token_id = payload["jti"]
 
-    if not is_refresh_token_valid(user_id, refresh_token_id):
+    # Atomic check-and-swap: a replayed or concurrently used token loses here
+    new_refresh_token_id = rotate_refresh_token(
+        user_id,
+        refresh_token_id,
+        device=device_metadata(request),
+    )
+    if not new_refresh_token_id:
         raise DomainError("Session expired")
 
-    new_refresh_token_id = rotate_refresh_token(user_id, refresh_token_id)
-
     new_access_token = create_access_token(user_id)
     new_refresh_token = create_refresh_token(user_id, new_refresh_token_id)
 
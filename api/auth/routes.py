@@ -1,29 +1,29 @@
-from fastapi import APIRouter, Depends, Response, BackgroundTasks
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
 from api.auth.schema import login, otp_verify, google_login
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from core.config import mail_setting, DatabaseSetting, app_settings
+from core.config import mail_setting, app_settings
 from db.deps import get_db
 from models.user import User
 from services.auth.jwt import create_access_token, create_refresh_token
-from dependencies.refresh_cookie_store import store_refresh_token
-from services.auth.otp import save_otp, otp_generator, invalidate_otp, verify_otp
-from services.email.brevo_provider import BrevoProvider
+from dependencies.rate_limit import rate_limit
+from dependencies.refresh_cookie_store import store_refresh_token, device_metadata
+from services.auth.google_verifier import get_google_verifier
+from services.auth.otp import OTP_TTL, save_otp, otp_generator, invalidate_otp, verify_otp
+from services.email.dispatcher import EmailDispatcher
 from core.exceptions import (
     RedisUploadFailed,
     OTPCooldownActive,
     EmailSendFailed,
     RedisFetchFailed,
 )
-from services.chat.sync_service import sync_user_to_chat
+from services.chat.sync_outbox import ChatSyncQueue
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-@router.post("/request-otp")
-def request_otp(data: login, background_tasks: BackgroundTasks):
+@router.post("/request-otp", dependencies=[Depends(rate_limit("otp_request"))])
+def request_otp(data: login):
     otp = otp_generator()
     email = data.email.strip().lower()
 
@@ -33,8 +33,8 @@ def request_otp(data: login, background_tasks: BackgroundTasks):
         subject = "EduStore OTP"
         body = f"This is your OTP {otp} valid for 5 minutes"
 
-        emailer = BrevoProvider()
-        background_tasks.add_task(emailer.send_email, email, subject, body)
+        # Queued for the dispatcher workers; dropped if undelivered past the OTP's validity
+        EmailDispatcher.send(to_email=email, subject=subject, body=body, ttl=OTP_TTL)
 
         return {"message": "OTP sent successfully"}
 
@@ -43,11 +43,11 @@ def request_otp(data: login, background_tasks: BackgroundTasks):
         raise exc
 
 
-@router.post("/verify-otp")
+@router.post("/verify-otp", dependencies=[Depends(rate_limit("otp_verify"))])
 def verify_otp_endpoint(
     data: otp_verify,
+    request: Request,
     response: Response,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     email = data.email.strip().lower()
@@ -65,44 +65,18 @@ def verify_otp_endpoint(
     else:
         user.is_verified = True
 
+    # Sync to Chat Server (outbox, same transaction; repeated logins coalesce)
+    db.flush()
+    ChatSyncQueue.enqueue(db=db, user_id=user.id)
+
     db.commit()
     db.refresh(user)
+    ChatSyncQueue.notify()
 
+    from services.cache.cache_manager import CacheManager
+    CacheManager.invalidate_principal(user.id)
 
-
-    # Sync to Chat Server
-    # Get profile picture URL
-    from models.student import Student
-    from services.storage.factory import StorageFactory
-    
-    student = db.query(Student).filter(Student.user_id == user.id).first()
-    profile_url_signed = ""
-    
-    if student and student.profile_url:
-        if student.profile_url.startswith("http"):
-             profile_url_signed = student.profile_url
-        else:
-            try:
-                storage = StorageFactory.get_storage()
-                profile_url_signed = storage.generate_download_url(
-                    object_key=student.profile_url,
-                    expires_in=31536000,
-                )
-            except Exception:
-                profile_url_signed = ""
-
-    full_name = student.name if student and student.name else email.split("@")[0]
-    
-    sync_data = {
-        "email": user.email,
-        "fullName": full_name,
-        "postgresId": str(user.id),
-        "profilePic": profile_url_signed,
-        "bio": ""
-    }
-    background_tasks.add_task(sync_user_to_chat, sync_data)
-
-    refresh_token_id = store_refresh_token(user.id)
+    refresh_token_id = store_refresh_token(user.id, device=device_metadata(request))
 
 
     access_token = create_access_token(user.id)
@@ -137,21 +111,13 @@ def verify_otp_endpoint(
 @router.post("/google")
 def google_auth_endpoint(
     data: google_login,
+    request: Request,
     response: Response,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     try:
-        # Verify Google ID Token
-        idinfo = id_token.verify_oauth2_token(
-            data.credential, 
-            google_requests.Request(), 
-            DatabaseSetting.GOOGLE_CLIENT_ID
-        )
-
-        if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
-            from core.exceptions import DomainError
-            raise DomainError("Invalid issuer")
+        # Verify Google ID Token (certs cached in process, issuer checked)
+        idinfo = get_google_verifier().verify(data.credential)
 
         email = idinfo["email"].lower()
         full_name = idinfo.get("name", email.split("@")[0])
@@ -173,6 +139,9 @@ def google_auth_endpoint(
         else:
             user.is_verified = True
             db.commit()
+
+            from services.cache.cache_manager import CacheManager
+            CacheManager.invalidate_principal(user.id)
             
             # Update student info if missing
             from models.student import Student
@@ -185,18 +154,13 @@ def google_auth_endpoint(
                 student.name = full_name
                 db.commit()
 
-        # Sync to Chat Server
-        sync_data = {
-            "email": user.email,
-            "fullName": full_name,
-            "postgresId": str(user.id),
-            "profilePic": picture,
-            "bio": ""
-        }
-        background_tasks.add_task(sync_user_to_chat, sync_data)
+        # Sync to Chat Server (outbox; repeated logins coalesce)
+        ChatSyncQueue.enqueue(db=db, user_id=user.id)
+        db.commit()
+        ChatSyncQueue.notify()
 
         # Issue Tokens
-        refresh_token_id = store_refresh_token(user.id)
+        refresh_token_id = store_refresh_token(user.id, device=device_metadata(request))
         access_token = create_access_token(user.id)
         refresh_token = create_refresh_token(user.id, refresh_token_id)
 
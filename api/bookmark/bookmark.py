@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
+from dependencies.rate_limit import rate_limit
 from dependencies.get_current_user import get_current_user
 from models.user import User
 from services.bookmark.bookmark_service import BookmarkService
@@ -14,6 +15,7 @@ router = APIRouter(prefix="/documents", tags=["Bookmark"])
 
 @router.post(
     "/{document_id}/bookmark",
+    dependencies=[Depends(rate_limit("bookmark_toggle"))],
     response_model=ToggleResponse,
     status_code=status.HTTP_200_OK,
 )
@@ -31,6 +33,7 @@ def bookmark_document(
 
 @router.delete(
     "/{document_id}/bookmark",
+    dependencies=[Depends(rate_limit("bookmark_toggle"))],
     response_model=ToggleResponse,
     status_code=status.HTTP_200_OK,
 )
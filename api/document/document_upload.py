@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, Request, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from core.exceptions import (
     StorageOperationFailed,
+    StorageBusy,
     DocumentNotFound,
     DocumentOwnershipError,
     DownloadUrlGenerationFailed,
+    UnsupportedDocumentType,
 )
 from models.user import User
 from models.document import Document
 from dependencies.get_current_user import get_current_user
 from dependencies.helper import _validate_document_key
 from services.storage.factory import StorageFactory
+from services.storage.executor import AsyncStorage
+from services.storage.deletion_queue import DeletionQueue
 from services.storage.keys import document_upload_key
+from services.file_service.upload_stream import StreamedUpload, read_upload
+from services.file_service.content_index import ContentIndex
+from services.file_service.thumbnail_service import ThumbnailService
 from api.document.schema import (
     DocumentUploadRequest,
     DocumentCommitRequest,
@@ -21,14 +28,109 @@ from api.document.schema import (
 )
 from dependencies.content_type import _extension_from_document_content_type
 from db.deps import get_db
+from db.session import release_connection
 
 router = APIRouter(prefix="/documents", tags=["Document"])
 
 
+MAX_DOCUMENT_SIZE = 20 * 1024 * 1024
+
+
+async def _add_document_from_upload(
+    db: Session,
+    *,
+    user_id: int,
+    upload: StreamedUpload,
+    title: str,
+    doc_type: str,
+    visibility: str,
+    content: str | None,
+) -> Document:
+    """
+    Store an upload (or take a reference on identical stored bytes) and add
+    its Document to the session. The caller commits, then calls
+    _document_committed.
+    """
+    try:
+        extension = _extension_from_document_content_type(upload.content_type)
+    except ValueError:
+        raise UnsupportedDocumentType()
+
+    # Same bytes already stored? Reference them, transfer nothing
+    object_key = ContentIndex.acquire(db=db, sha256=upload.sha256, size=upload.size)
+
+    if object_key:
+        print(f"♻️ Dedup hit {object_key} ({upload.size} bytes, sha256={upload.sha256[:12]})")
+    else:
+        # No DB work during the upload: give the connection back meanwhile
+        release_connection(db)
+
+        # Generate object key
+        new_key = document_upload_key(
+            user_id=user_id,
+            extension=extension,
+        )
+
+        # Stream the spooled file to storage (never fully in memory),
+        # on the storage pool so the event loop keeps serving other requests
+        await AsyncStorage.upload_file(
+            object_key=new_key,
+            file_content=upload.file,
+            content_type=upload.content_type,
+        )
+        print(f"📦 Uploaded {new_key} ({upload.size} bytes, sha256={upload.sha256[:12]})")
+
+        object_key = ContentIndex.register(
+            db=db,
+            sha256=upload.sha256,
+            object_key=new_key,
+            size=upload.size,
+            content_type=upload.content_type,
+        )
+        if object_key != new_key:
+            # An identical upload finished first; keep theirs, drop ours
+            DeletionQueue.enqueue(db=db, object_keys=[new_key])
+
+    document = Document(
+        user_id=user_id,
+        title=title,
+        doc_type=doc_type,
+        object_key=object_key,
+        original_filename=upload.filename,
+        content_type=upload.content_type,
+        file_size=upload.size,
+        content_sha256=upload.sha256,
+        visibility=visibility,
+        content=content,
+    )
+    db.add(document)
+    return document
+
+
+def _document_committed(db: Session, document: Document) -> DocumentResponse:
+    """Post-commit work for a new document; returns the API response."""
+    db.refresh(document)
+
+    # Invalidate caches
+    from services.cache.cache_manager import CacheManager
+    CacheManager.invalidate_user_docs(document.user_id)
+    CacheManager.invalidate_feed()
+
+    ThumbnailService.schedule(document_id=document.id, content_type=document.content_type)
+
+    # Generate download URL (built locally, no network)
+    download_url = StorageFactory.get_storage().generate_download_url(
+        object_key=document.object_key,
+        expires_in=300,
+    )
+    return DocumentResponse.from_orm(document).copy(
+        update={"doc_url": download_url}
+    )
+
+
 # -------------------- Direct Upload (Cloudinary) --------------------
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_document_direct(
-    request: Request,
     file: UploadFile = File(...),
     title: str = Form(...),
     doc_type: str = Form(...),
@@ -38,63 +140,26 @@ async def upload_document_direct(
     db: Session = Depends(get_db),
 ):
     """Direct upload endpoint for Cloudinary - uploads file and creates document in one step"""
+    # Size limit (20MB), sha256 and type sniffing in one chunked read.
+    # FastAPI has already spooled the multipart body by now, so this bounds
+    # what is kept and hashed, not what the client may send.
+    upload = await read_upload(file, max_size=MAX_DOCUMENT_SIZE)
+
     try:
-        # 0. Size Validation (20MB)
-        MAX_DOCUMENT_SIZE = 20 * 1024 * 1024
-        
-        # Check Content-Length header first for optimization
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > MAX_DOCUMENT_SIZE:
-             raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="Document size exceeds 20 MB limit",
-            )
-            
-        # Generate object key
-        extension = _extension_from_document_content_type(file.content_type)
-        object_key = document_upload_key(
-            user_id=current_user.id,
-            extension=extension,
-        )
-        
-        # Read file content
-        file_content = await file.read()
-        
-        # Upload to Cloudinary
-        storage = StorageFactory.get_storage()
-        storage.upload_file(
-            object_key=object_key,
-            file_content=file_content,
-            content_type=file.content_type,
-        )
-        
-        # Generate download URL
-        download_url = storage.generate_download_url(
-            object_key=object_key,
-            expires_in=300,
-        )
-        
-        # Create document record
-        document = Document(
+        document = await _add_document_from_upload(
+            db,
             user_id=current_user.id,
+            upload=upload,
             title=title,
             doc_type=doc_type,
-            object_key=object_key,
-            original_filename=file.filename,
-            content_type=file.content_type,
-            file_size=len(file_content),
             visibility=visibility,
             content=content,
         )
-        
-        db.add(document)
         db.commit()
-        db.refresh(document)
-        
-        return DocumentResponse.from_orm(document).copy(
-            update={"doc_url": download_url}
-        )
-        
+        return _document_committed(db, document)
+
+    except (StorageBusy, UnsupportedDocumentType):
+        raise
     except Exception as e:
         db.rollback()
         raise StorageOperationFailed(f"Upload failed: {str(e)}")
@@ -152,6 +217,7 @@ def commit_document(
         db.query(Document)
         .filter(
             Document.object_key == data.object_key,
+            Document.user_id == current_user.id,
             Document.is_deleted.is_(False),
         )
         .first()
@@ -166,6 +232,10 @@ def commit_document(
             update={"doc_url": download_url}
         )
 
+    # Deduplicated objects are shared and reference counted: never commit them directly
+    if ContentIndex.is_indexed(db=db, object_key=data.object_key):
+        raise StorageOperationFailed("Document already committed")
+
     # 3️⃣ Validate object exists in storage
     try:
         download_url = storage.generate_download_url(
@@ -200,6 +270,8 @@ def commit_document(
         db.rollback()
         raise StorageOperationFailed("Document already committed")
 
+    ThumbnailService.schedule(document_id=document.id, content_type=document.content_type)
+
     return DocumentResponse.from_orm(document).copy(
         update={"doc_url": download_url}
     )
@@ -227,17 +299,24 @@ def delete_document(
 
     # soft delete
     document.is_deleted = True
+
+    # Shared content is only removed with its last reference
+    orphaned_key = document.object_key
+    if document.content_sha256:
+        orphaned_key = ContentIndex.release(db=db, sha256=document.content_sha256)
+
+    # Queued in the same transaction, deleted in bulk by the worker
+    # (variants go with their source object)
+    if orphaned_key:
+        DeletionQueue.enqueue(
+            db=db,
+            object_keys=[orphaned_key, document.thumbnail_key, document.preview_key],
+        )
     db.commit()
+    DeletionQueue.notify()
 
     from services.cache.cache_manager import CacheManager
     CacheManager.invalidate_document(document_id)
     CacheManager.invalidate_user_docs(current_user.id)
 
-    # optional: async/background cleanup
-    try:
-        storage = StorageFactory.get_storage()
-        storage.delete_object(document.object_key)
-    except Exception:
-        pass
-
     return {"message": "Document deleted successfully"}
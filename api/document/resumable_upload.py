@@ -0,0 +1,374 @@
+"""
+Resumable document uploads.
+
+  POST   /documents/uploads                      create a session (total size)
+  PUT    /documents/uploads/{id}?offset=N        append one chunk (raw body)
+  GET    /documents/uploads/{id}                 progress: received_size
+  POST   /documents/uploads/{id}/complete        assemble and create the document
+  DELETE /documents/uploads/{id}                 abort
+
+Chunks must arrive in order: a PUT is accepted only at offset ==
+received_size, otherwise 409 and the client resumes from GET's
+received_size. Each chunk is stored as its own object through the storage
+backend, so a dropped connection costs at most one chunk.
+
+Finalizing streams the chunks back one by one into a temp file (hashing on
+the way, never the whole file in memory) and hands it to the same
+dedup/store path as /documents/upload. Chunk objects then go through the
+deletion queue; sessions left unfinished are expired by the orphan sweeper.
+"""
+import tempfile
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from core.config import storage_setting
+from core.exceptions import (
+    StorageOperationFailed,
+    StorageBusy,
+    DocumentTooLarge,
+    UnsupportedDocumentType,
+    UploadSessionNotFound,
+    UploadOffsetMismatch,
+    InvalidUploadChunk,
+    UploadIncomplete,
+    UploadSessionLocked,
+)
+from models.user import User
+from models.document import Document
+from models.upload_session import UploadSession, UploadChunk
+from dependencies.get_current_user import get_current_user
+from dependencies.content_type import _extension_from_document_content_type
+from services.storage.factory import StorageFactory
+from services.storage.executor import AsyncStorage
+from services.storage.deletion_queue import DeletionQueue
+from services.storage.keys import upload_chunk_key
+from services.file_service.upload_stream import (
+    CHUNK_SIZE,
+    HashingWriter,
+    StreamedUpload,
+    sniff_content_type,
+    spool_request_body,
+)
+from api.document.document_upload import (
+    MAX_DOCUMENT_SIZE,
+    _add_document_from_upload,
+    _document_committed,
+)
+from api.document.schema import (
+    UploadSessionCreateRequest,
+    UploadSessionCompleteRequest,
+    UploadSessionResponse,
+    DocumentResponse,
+)
+from db.deps import get_db
+from db.session import release_connection
+
+router = APIRouter(prefix="/documents/uploads", tags=["Document"])
+
+# A finalize that died mid-assembly (worker restart) may be retried after this
+FINALIZE_STALE_AFTER = timedelta(minutes=10)
+
+
+def _get_session(db: Session, *, upload_id: str, user_id: int) -> UploadSession:
+    session = (
+        db.query(UploadSession)
+        .filter(
+            UploadSession.id == upload_id,
+            UploadSession.user_id == user_id,
+            UploadSession.expires_at > func.now(),
+        )
+        .first()
+    )
+    if not session:
+        raise UploadSessionNotFound()
+    return session
+
+
+def _session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=session.id,
+        status=session.status,
+        total_size=session.total_size,
+        received_size=session.received_size,
+        min_chunk_size=storage_setting.UPLOAD_CHUNK_MIN_SIZE,
+        max_chunk_size=storage_setting.UPLOAD_CHUNK_MAX_SIZE,
+        expires_at=session.expires_at,
+        document_id=session.document_id,
+    )
+
+
+# -------------------- Create Session --------------------
+@router.post("", response_model=UploadSessionResponse, status_code=201)
+def create_upload_session(
+    data: UploadSessionCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if data.total_size > MAX_DOCUMENT_SIZE:
+        raise DocumentTooLarge()
+
+    session = UploadSession(
+        id=uuid4().hex,
+        user_id=current_user.id,
+        total_size=data.total_size,
+        original_filename=data.original_filename,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=storage_setting.UPLOAD_SESSION_TTL),
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+
+    return _session_response(session)
+
+
+# -------------------- Progress --------------------
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    upload_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return _session_response(_get_session(db, upload_id=upload_id, user_id=current_user.id))
+
+
+# -------------------- Append Chunk --------------------
+@router.put("/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = _get_session(db, upload_id=upload_id, user_id=current_user.id)
+
+    if session.status != "open":
+        raise UploadSessionLocked("Upload no longer accepts chunks")
+    if offset != session.received_size:
+        raise UploadOffsetMismatch(f"Expected offset {session.received_size}")
+
+    remaining = session.total_size - offset
+    max_size = min(storage_setting.UPLOAD_CHUNK_MAX_SIZE, remaining)
+    content_type = session.content_type
+
+    # Cheap early reject; the limit is enforced while spooling below
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise InvalidUploadChunk(f"Chunk larger than {max_size} bytes")
+
+    # No DB work while the body arrives and is stored
+    release_connection(db)
+
+    chunk, size = await spool_request_body(request, max_size=max_size)
+    try:
+        if size == 0:
+            raise InvalidUploadChunk("Empty chunk")
+        if size < remaining and size < storage_setting.UPLOAD_CHUNK_MIN_SIZE:
+            raise InvalidUploadChunk(
+                f"Chunks must be at least {storage_setting.UPLOAD_CHUNK_MIN_SIZE} bytes, except the last"
+            )
+
+        # Reject unsupported files on the first chunk, not after the whole upload
+        if offset == 0:
+            content_type = sniff_content_type(chunk.read(CHUNK_SIZE))
+            chunk.seek(0)
+            try:
+                _extension_from_document_content_type(content_type or "")
+            except ValueError:
+                raise UnsupportedDocumentType()
+
+        object_key = upload_chunk_key(user_id=current_user.id, upload_id=upload_id, offset=offset)
+        await AsyncStorage.upload_file(
+            object_key=object_key,
+            file_content=chunk,
+            content_type="application/octet-stream",
+        )
+    finally:
+        chunk.close()
+
+    # Only one request can advance the session past this offset
+    advanced = db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload_id,
+            UploadSession.status == "open",
+            UploadSession.received_size == offset,
+        )
+        .values(received_size=offset + size, content_type=content_type)
+        .returning(UploadSession.id)
+    ).scalar()
+
+    if advanced is None:
+        # A concurrent request stored this range first; drop our copy
+        db.rollback()
+        DeletionQueue.enqueue(db=db, object_keys=[object_key])
+        db.commit()
+        DeletionQueue.notify()
+        raise UploadOffsetMismatch()
+
+    db.add(UploadChunk(session_id=upload_id, offset=offset, size=size, object_key=object_key))
+    db.commit()
+
+    return _session_response(_get_session(db, upload_id=upload_id, user_id=current_user.id))
+
+
+# -------------------- Finalize --------------------
+async def _assemble(chunks, *, total_size: int, content_type: str, filename: str | None) -> StreamedUpload:
+    """Stream the chunks, in order, into one temp file (bounded memory)."""
+    target = tempfile.TemporaryFile()
+    writer = HashingWriter(target)
+    try:
+        for chunk in chunks:
+            await AsyncStorage.download_file(object_key=chunk.object_key, destination=writer)
+        if writer.size != total_size:
+            raise StorageOperationFailed(
+                f"Assembled {writer.size} bytes, expected {total_size}"
+            )
+    except BaseException:
+        target.close()
+        raise
+
+    target.seek(0)
+    return StreamedUpload(
+        file=target,
+        size=writer.size,
+        sha256=writer.hexdigest(),
+        content_type=content_type,
+        filename=filename,
+    )
+
+
+@router.post("/{upload_id}/complete", response_model=DocumentResponse)
+async def complete_upload(
+    upload_id: str,
+    data: UploadSessionCompleteRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = _get_session(db, upload_id=upload_id, user_id=current_user.id)
+
+    # Idempotency: a retried finalize returns the document already created
+    if session.status == "completed":
+        document = (
+            db.query(Document)
+            .filter(Document.id == session.document_id, Document.is_deleted.is_(False))
+            .first()
+        )
+        if not document:
+            raise UploadSessionNotFound()
+        download_url = StorageFactory.get_storage().generate_download_url(
+            object_key=document.object_key,
+            expires_in=300,
+        )
+        return DocumentResponse.from_orm(document).copy(
+            update={"doc_url": download_url}
+        )
+
+    if session.received_size != session.total_size:
+        raise UploadIncomplete(f"Received {session.received_size} of {session.total_size} bytes")
+
+    total_size = session.total_size
+    content_type = session.content_type
+    filename = session.original_filename
+
+    claimed = db.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.id == upload_id,
+            or_(
+                UploadSession.status == "open",
+                and_(
+                    UploadSession.status == "finalizing",
+                    UploadSession.updated_at < func.now() - FINALIZE_STALE_AFTER,
+                ),
+            ),
+        )
+        .values(status="finalizing")
+        .returning(UploadSession.id)
+    ).scalar()
+    if claimed is None:
+        db.rollback()
+        raise UploadSessionLocked()
+
+    chunks = (
+        db.query(UploadChunk.object_key)
+        .filter(UploadChunk.session_id == upload_id)
+        .order_by(UploadChunk.offset)
+        .all()
+    )
+    db.commit()
+
+    upload = None
+    try:
+        upload = await _assemble(
+            chunks,
+            total_size=total_size,
+            content_type=content_type,
+            filename=filename,
+        )
+        document = await _add_document_from_upload(
+            db,
+            user_id=current_user.id,
+            upload=upload,
+            title=data.title,
+            doc_type=data.doc_type,
+            visibility=data.visibility,
+            content=data.content,
+        )
+        db.flush()
+
+        # Same transaction: session done, chunk objects queued for deletion
+        db.query(UploadSession).filter(UploadSession.id == upload_id).update(
+            {"status": "completed", "document_id": document.id},
+            synchronize_session=False,
+        )
+        db.query(UploadChunk).filter(UploadChunk.session_id == upload_id).delete(
+            synchronize_session=False,
+        )
+        DeletionQueue.enqueue(db=db, object_keys=[chunk.object_key for chunk in chunks])
+        db.commit()
+
+    except Exception as e:
+        db.rollback()
+        # Chunks are untouched: let the client retry the finalize
+        db.query(UploadSession).filter(UploadSession.id == upload_id).update(
+            {"status": "open"},
+            synchronize_session=False,
+        )
+        db.commit()
+        if isinstance(e, (StorageBusy, UnsupportedDocumentType, StorageOperationFailed)):
+            raise
+        raise StorageOperationFailed(f"Upload failed: {str(e)}")
+    finally:
+        if upload is not None:
+            upload.file.close()
+
+    DeletionQueue.notify()
+    print(f"🧩 Assembled upload {upload_id} into document {document.id} ({len(chunks)} chunks)")
+    return _document_committed(db, document)
+
+
+# -------------------- Abort --------------------
+@router.delete("/{upload_id}")
+def abort_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = _get_session(db, upload_id=upload_id, user_id=current_user.id)
+    if session.status == "finalizing":
+        raise UploadSessionLocked()
+
+    chunk_keys = [
+        key for (key,) in db.query(UploadChunk.object_key).filter(UploadChunk.session_id == upload_id)
+    ]
+    DeletionQueue.enqueue(db=db, object_keys=chunk_keys)
+    db.delete(session)  # chunk rows go with it (ON DELETE CASCADE)
+    db.commit()
+    DeletionQueue.notify()
+
+    return {"message": "Upload aborted"}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional,Literal
+from typing import Optional,Literal,List
+from datetime import datetime
 
 from enum import Enum
 
@@ -27,6 +28,29 @@ from pydantic import BaseModel, Field
 from typing import Optional
 
 
+class UploadSessionCreateRequest(BaseModel):
+    total_size: int = Field(..., gt=0)
+    original_filename: Optional[str] = Field(default=None, max_length=255)
+
+
+class UploadSessionCompleteRequest(BaseModel):
+    title: str
+    doc_type: str
+    visibility: Literal["private", "public"] = "public"
+    content: Optional[str] = ""
+
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    status: str
+    total_size: int
+    received_size: int
+    min_chunk_size: int
+    max_chunk_size: int
+    expires_at: datetime
+    document_id: Optional[int] = None
+
+
 class CreateTextPostSchema(BaseModel):
     title: str = Field(..., min_length=3, max_length=255)
     content: str = Field(..., min_length=1)
@@ -51,9 +75,25 @@ class DocumentResponse(BaseModel):
 
     class Config:
         from_attributes = True
-        
-
-
-
 
 
+class MyDocumentItem(BaseModel):
+    id: int
+    title: str
+    doc_type: str
+    visibility: str
+    file_size: Optional[int] = None
+    content: Optional[str] = None
+    created_at: datetime
+    owner_id: int
+    owner_name: Optional[str] = None
+    owner_email: Optional[str] = None
+    owner_avatar: Optional[str] = None
+    like_count: int = 0
+    is_liked: bool = False
+    is_owner: bool = True
+
+
+class MyDocumentListResponse(BaseModel):
+    items: List[MyDocumentItem]
+    next_cursor: Optional[str] = None
@@ -13,6 +13,7 @@ class DocumentFeedItem(BaseModel):
     owner_avatar: Optional[str] = None
     content_type: Optional[str] = None
     content: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     comment_count: int = 0
     like_count: int = 0
     is_liked: bool = False
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
+from db.session import release_connection
 from models.follow import Follow
 from models.user import User
 from models.student import Student
@@ -50,6 +51,7 @@ def my_following(
         .offset(offset)
         .all()
     )
+    release_connection(db)
 
     from services.storage.url_cache import StorageURLCache
     
@@ -112,6 +114,7 @@ def my_followers(
         .offset(offset)
         .all()
     )
+    release_connection(db)
 
     from services.storage.url_cache import StorageURLCache
     
@@ -6,6 +6,7 @@ from models.follow import Follow
 from models.user import User
 from dependencies.get_current_user import get_current_user
 from services.cache.redis_service import cache
+from services.follow.follow_counts import FollowCounters
 
 router = APIRouter(prefix="/users", tags=["Follow"])
 
@@ -28,9 +29,8 @@ def get_follow_status(
         Follow.following_id == user_id,
     ).first() is not None
     
-    # Get follower and following counts
-    follower_count = db.query(Follow).filter(Follow.following_id == user_id).count()
-    following_count = db.query(Follow).filter(Follow.follower_id == user_id).count()
+    # Denormalized counters on the target user (single PK lookup)
+    follower_count, following_count = FollowCounters.get_counts(db=db, user_id=user_id)
     
     status_data = {
         "is_following": is_following,
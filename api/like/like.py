@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
+from dependencies.rate_limit import rate_limit
 from dependencies.get_current_user import get_current_user
 from models.user import User
 from services.like.like_service import LikeService
@@ -16,6 +17,7 @@ router = APIRouter(prefix="/documents", tags=["Like"])
 
 @router.post(
     "/{document_id}/like",
+    dependencies=[Depends(rate_limit("like_toggle"))],
     response_model=LikeToggleResponse,
     status_code=status.HTTP_200_OK,
 )
@@ -47,6 +49,7 @@ def like_document(
 
 @router.delete(
     "/{document_id}/like",
+    dependencies=[Depends(rate_limit("like_toggle"))],
     response_model=LikeToggleResponse,
     status_code=status.HTTP_200_OK,
 )
@@ -7,8 +7,8 @@ from db.deps import get_db
 from dependencies.get_current_user import get_current_user
 from models.user import User
 from models.student import Student
-from services.storage.factory import StorageFactory
-from services.chat.sync_service import sync_user_to_chat
+from services.storage.executor import AsyncStorage
+from services.chat.sync_outbox import ChatSyncQueue
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
@@ -21,7 +21,6 @@ from db.session import SessionLocal
 
 async def _bg_upload_avatar(
     user_id: int,
-    user_email: str,
     object_key: str,
     content: bytes,
     content_type: str,
@@ -29,9 +28,8 @@ async def _bg_upload_avatar(
     """Background task to upload avatar and update database"""
     db = SessionLocal()
     try:
-        # 1. Upload to Cloudinary
-        storage = StorageFactory.get_storage()
-        avatar_url = storage.upload_file(
+        # 1. Upload to Cloudinary (storage pool, off the event loop)
+        avatar_url = await AsyncStorage.upload_file(
             object_key=object_key,
             file_content=content,
             content_type=content_type,
@@ -44,21 +42,16 @@ async def _bg_upload_avatar(
             db.add(student)
         
         student.profile_url = avatar_url
+        # Chat sync through the outbox, committed with the new avatar
+        ChatSyncQueue.enqueue(db=db, user_id=user_id)
         db.commit()
         
         # 3. Invalidate Cache
-        from services.cache.redis_service import cache
-        cache.delete(f"user_profile_static:{user_id}")
+        from services.cache.cache_manager import CacheManager
+        CacheManager.invalidate_profile(user_id)
         
-        # 4. Sync to Chat
-        sync_data = {
-            "email": user_email,
-            "fullName": student.name or user_email.split('@')[0],
-            "postgresId": str(user_id),
-            "profilePic": avatar_url,
-            "bio": "" 
-        }
-        await sync_user_to_chat(sync_data)
+        # 4. Wake the chat sync worker
+        ChatSyncQueue.notify()
         print(f"✅ Background avatar upload complete for user {user_id}")
         
     except Exception as e:
@@ -102,7 +95,6 @@ async def upload_avatar(
     background_tasks.add_task(
         _bg_upload_avatar,
         current_user.id,
-        current_user.email,
         object_key,
         content,
         file.content_type
@@ -16,8 +16,6 @@ def get_my_profile(
     """Get current user's profile - Optimized with caching"""
     from services.cache.redis_service import cache
     from services.storage.url_cache import StorageURLCache
-    from models.follow import Follow
-    from sqlalchemy import func, case
     
     # 1. Try Cache
     cache_key = f"user_profile_static:{current_user.id}"
@@ -34,16 +32,9 @@ def get_my_profile(
         .first()
     )
 
-    # 3. Optimized Count Query (Single trip)
-    counts = db.query(
-        func.sum(case((Follow.following_id == current_user.id, 1), else_=0)).label('followers'),
-        func.sum(case((Follow.follower_id == current_user.id, 1), else_=0)).label('following')
-    ).filter(
-        (Follow.following_id == current_user.id) | (Follow.follower_id == current_user.id)
-    ).first()
-    
-    followers_count = int(counts.followers or 0)
-    following_count = int(counts.following or 0)
+    # 3. Denormalized counters (current_user is a cached snapshot without them)
+    from services.follow.follow_counts import FollowCounters
+    followers_count, following_count = FollowCounters.get_counts(db=db, user_id=current_user.id)
 
     # 4. Centralized Avatar Logic (Handles defaults)
     profile_url = StorageURLCache.get_avatar_url(student.profile_url if student else None)
@@ -4,13 +4,13 @@ from sqlalchemy.orm import Session
 from models.student import Student
 from models.user import User
 from db.deps import get_db
+from db.session import release_connection
 from api.profile.schema import ProfileResponse
 from services.storage.factory import StorageFactory
 from services.cache.redis_service import cache
 
 router = APIRouter(prefix="/users", tags=["Profile"])
 
-from models.follow import Follow
 from dependencies.get_current_user import get_current_user_optional
 
 @router.get("/{user_id}/profile", response_model=ProfileResponse)
@@ -43,24 +43,12 @@ def get_user_profile(
             .filter(Student.user_id == user_id)
             .first()
         )
+        release_connection(db)
 
         # Generate avatar URL using cache service (handles defaults and signing)
         from services.storage.url_cache import StorageURLCache
         profile_url = StorageURLCache.get_avatar_url(student.profile_url if student else None)
 
-        # OPTIMIZED: Get follower and following counts in single query
-        from sqlalchemy import func, case
-        
-        counts = db.query(
-            func.sum(case((Follow.following_id == user_id, 1), else_=0)).label('followers'),
-            func.sum(case((Follow.follower_id == user_id, 1), else_=0)).label('following')
-        ).filter(
-            (Follow.following_id == user_id) | (Follow.follower_id == user_id)
-        ).first()
-        
-        followers_count = int(counts.followers or 0)
-        following_count = int(counts.following or 0)
-        
         profile_data = {
             "user_id": user.id,
             "email": user.email,
@@ -69,8 +57,8 @@ def get_user_profile(
             "course": student.course if student else None,
             "semester": student.semester if student else None,
             "profile_url": profile_url,
-            "followers_count": followers_count,
-            "following_count": following_count,
+            "followers_count": user.followers_count or 0,
+            "following_count": user.following_count or 0,
             "is_student": student is not None,
         }
         
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from models.student import Student
@@ -6,7 +6,7 @@ from db.deps import get_db
 from dependencies.get_current_user import get_current_user
 from api.profile.schema import profile_update
 from models.user import User
-from services.chat.sync_service import sync_user_to_chat
+from services.chat.sync_outbox import ChatSyncQueue
 
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
@@ -15,11 +15,10 @@ router = APIRouter(prefix="/profile", tags=["Profile"])
 @router.patch("/update")
 def update_profile_details(
     data: profile_update,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Update profile details - Optimized with background sync"""
+    """Update profile details - chat sync goes through the outbox"""
     student = db.query(Student).filter(
         Student.user_id == current_user.id
     ).first()
@@ -35,40 +34,22 @@ def update_profile_details(
     if data.semester is not None: student.semester = data.semester; update_sync_needed = True
     if data.name is not None: student.name = data.name; update_sync_needed = True
 
+    # Same transaction; quick successive edits collapse into one push
+    if update_sync_needed:
+        ChatSyncQueue.enqueue(db=db, user_id=current_user.id)
+
     db.commit()
     db.refresh(student)
     
     # 2. Invalidate Profile Cache
-    from services.cache.redis_service import cache
-    cache.delete(f"user_profile_static:{current_user.id}")
+    from services.cache.cache_manager import CacheManager
+    CacheManager.invalidate_profile(current_user.id)
 
-    # 3. Offload Chat Sync & URL Signing to Background
+    # 3. Wake the chat sync worker
     if update_sync_needed:
-        background_tasks.add_task(
-            _bg_sync_profile_to_chat,
-            current_user.id,
-            current_user.email,
-            student.name,
-            student.profile_url
-        )
+        ChatSyncQueue.notify()
 
     return {
         "message": "Profile details updated successfully",
         "status": "success"
     }
-
-async def _bg_sync_profile_to_chat(user_id: int, email: str, name: str, profile_url: str):
-    """Helper to handle signing and syncing in background"""
-    from services.storage.url_cache import StorageURLCache
-    
-    # Use the centralized helper which handles defaults and caching
-    final_profile_url = StorageURLCache.get_avatar_url(profile_url)
-    
-    sync_data = {
-        "email": email,
-        "fullName": name or email.split('@')[0],
-        "postgresId": str(user_id),
-        "profilePic": final_profile_url,
-        "bio": "" 
-    }
-    await sync_user_to_chat(sync_data)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
+from dependencies.rate_limit import rate_limit
 from dependencies.get_current_user import get_current_user
 from models.user import User
 from services.search_service.document_search import DocumentSearchService
@@ -15,6 +16,7 @@ router = APIRouter(prefix="/search", tags=["Search"])
 
 @router.get(
     "/documents",
+    dependencies=[Depends(rate_limit("search"))],
     response_model=DocumentSearchResponse,
 )
 def search_documents(
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
+from dependencies.rate_limit import rate_limit
 from dependencies.get_current_user import get_current_user, get_current_user_optional
 from models.user import User
 from services.search_service.user_search import UserSearchService
@@ -15,6 +16,7 @@ router = APIRouter(prefix="/search", tags=["Search"])
 
 @router.get(
     "/users",
+    dependencies=[Depends(rate_limit("search"))],
     response_model=UserSearchResponse,
 )
 def search_users(
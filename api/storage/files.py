@@ -0,0 +1,144 @@
+"""
+Serves objects of the local storage backend (STORAGE_PROVIDER=local).
+
+URLs come from LocalStorage.generate_download_url and are checked by
+signature and expiry only, so serving a file costs no DB or Redis access.
+Bodies are never read whole into memory: full responses go through
+Starlette's FileResponse and ranges through FileRangeResponse, both
+streaming the file in 64 KB chunks.
+"""
+import mimetypes
+import os
+import re
+import time
+
+import anyio
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from core.config import storage_setting
+from services.storage.factory import StorageFactory
+from services.storage.local import verify_signature
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRangeResponse(FileResponse):
+    """206 response for one byte range of a file"""
+
+    def __init__(self, path, *, start: int, end: int, stat_result: os.stat_result, **kwargs):
+        super().__init__(path, status_code=206, stat_result=stat_result, **kwargs)
+        self.start = start
+        self.length = end - start + 1
+        self.headers["content-length"] = str(self.length)
+        self.headers["content-range"] = f"bytes {start}-{end}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break  # file shrank underneath us
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    (start, end) for a single `bytes=` range, None to serve the whole file
+    (no/unsupported header; multi-range requests get the full body, as the
+    RFC allows). Raises 416 for ranges outside the file.
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start = max(size - int(last), 0)  # suffix range: last N bytes
+        end = size - 1
+    else:
+        return None
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+@router.api_route("/{object_key:path}", methods=["GET", "HEAD"])
+async def serve_file(object_key: str, expires: int, sig: str, request: Request):
+    """Serve a locally stored object through a signed, expiring URL"""
+    if storage_setting.STORAGE_PROVIDER.lower() != "local":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    if not verify_signature(object_key, expires, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired link")
+
+    try:
+        path = StorageFactory.get_storage().path_for(object_key)
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except (ValueError, FileNotFoundError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    headers = {
+        "accept-ranges": "bytes",
+        # Keeps GZipMiddleware out: ranges and ETags refer to the stored bytes
+        "content-encoding": "identity",
+        # Cacheable until the signed link expires
+        "cache-control": f"private, max-age={max(expires - int(time.time()), 0)}",
+    }
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat_result,
+    )
+    etag = response.headers["etag"]
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"etag": etag, **headers})
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, stat_result.st_size)
+        if byte_range:
+            return FileRangeResponse(
+                path,
+                start=byte_range[0],
+                end=byte_range[1],
+                stat_result=stat_result,
+                media_type=media_type,
+                headers=headers,
+            )
+
+    return response
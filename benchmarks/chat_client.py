@@ -0,0 +1,180 @@
+"""
+Chat service client benchmark.
+
+Starts a local stub chat server (uvicorn, separate process) and sends the
+same profile sync through two clients:
+  - per-call:  a new httpx.AsyncClient per request (the old behaviour),
+  - pooled:    the shared ChatClient (keep-alive, connection reuse).
+
+Reports throughput, latency and how many TCP connections the stub saw.
+A local stub has no TLS and no network RTT, so the per-call overhead
+measured here is a lower bound of what a remote chat service costs.
+
+Usage:
+    python -m benchmarks.chat_client
+    python -m benchmarks.chat_client --requests 5000 --concurrency 50 --latency-ms 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+import httpx
+
+PAYLOAD = {
+    "postgresId": "42",
+    "email": "student@example.com",
+    "fullName": "Bench Student",
+    "profilePic": "",
+    "bio": "CS - Bench College",
+}
+
+
+# ------------------------------------------------------------------
+# STUB SERVER
+# ------------------------------------------------------------------
+def _stub_app(latency: float):
+    connections = set()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        connections.add(tuple(scope["client"] or ()))
+
+        if scope["path"] == "/__stats":
+            body = json.dumps({"connections": len(connections)}).encode()
+            if scope["method"] == "DELETE":
+                connections.clear()
+        else:
+            while (await receive()).get("more_body"):
+                pass
+            if latency:
+                await asyncio.sleep(latency)
+            body = b'{"token": "stub", "userData": {}}'
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def _serve(port: int, latency: float) -> None:
+    import uvicorn
+    uvicorn.run(_stub_app(latency), host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def _start_stub(port: int, latency_ms: float) -> subprocess.Popen:
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.chat_client",
+        "--serve", "--port", str(port), "--latency-ms", str(latency_ms),
+    ])
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/__stats", timeout=0.5)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("stub chat server did not start")
+
+
+# ------------------------------------------------------------------
+# CLIENTS
+# ------------------------------------------------------------------
+async def _per_call(base_url: str) -> None:
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.post(f"{base_url}/api/auth/sync", json=PAYLOAD)
+        response.raise_for_status()
+
+
+async def _pooled(base_url: str) -> None:
+    from services.chat.chat_service import sync_user_to_chat
+    await sync_user_to_chat(PAYLOAD)
+
+
+async def _measure(label: str, call, args, base_url: str) -> dict:
+    httpx.delete(f"{base_url}/__stats")
+    latencies = []
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await call(base_url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+
+    connections = httpx.get(f"{base_url}/__stats").json()["connections"]
+    latencies.sort()
+    result = {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "connections": connections,
+    }
+    print(
+        f"  {label:<10} {result['rps']:8.0f} req/s   p50={result['p50']:6.2f}ms   "
+        f"p99={result['p99']:6.2f}ms   tcp connections={connections}"
+    )
+    return result
+
+
+async def run(args) -> None:
+    base_url = f"http://127.0.0.1:{args.port}"
+    from services.chat.chat_service import ChatClient
+
+    print(f"💬 POST /api/auth/sync x{args.requests}, concurrency {args.concurrency}, stub latency {args.latency_ms}ms")
+    ChatClient.start()
+    try:
+        # Warm-up (imports, first connections)
+        await _per_call(base_url)
+        await _pooled(base_url)
+
+        per_call = await _measure("per-call", _per_call, args, base_url)
+        pooled = await _measure("pooled", _pooled, args, base_url)
+    finally:
+        await ChatClient.close()
+
+    print(f"\n  pooled: {pooled['rps'] / per_call['rps']:.1f}x throughput, "
+          f"p50 {per_call['p50'] - pooled['p50']:+.2f}ms saved per call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduStore chat client benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stub server processing delay")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args.port, args.latency_ms / 1000)
+        return
+
+    # The shared client targets CHAT_SERVICE_URL: point it at the stub
+    os.environ["CHAT_SERVICE_URL"] = f"http://127.0.0.1:{args.port}"
+    stub = _start_stub(args.port, args.latency_ms)
+    try:
+        asyncio.run(run(args))
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Email dispatch benchmark.
+
+Starts a minimal local SMTP sink (threaded, no TLS, no auth) and delivers
+the same OTP message two ways:
+  - per-message: a new SmtpProvider per send - connect, EHLO, send, QUIT
+                 (what a provider built inside the request handler costs),
+  - dispatcher:  EmailDispatcher.send() onto the queue, delivered by the
+                 EMAIL_WORKERS pool over persistent connections.
+
+Reports throughput, the time callers spent enqueueing, and how many SMTP
+connections the sink accepted. A local sink has no TLS handshake and no
+network RTT, so the per-message overhead measured here is a lower bound.
+
+Usage:
+    python -m benchmarks.email_dispatch
+    python -m benchmarks.email_dispatch --messages 2000 --workers 8 --latency-ms 5
+"""
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, '.')
+
+SUBJECT = "EduStore OTP"
+BODY = "This is your OTP 123456 valid for 5 minutes"
+
+
+# ------------------------------------------------------------------
+# SMTP SINK
+# ------------------------------------------------------------------
+class SinkStats:
+    lock = threading.Lock()
+    messages = 0
+    connections = 0
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls.lock:
+            cls.messages = cls.connections = 0
+
+
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    latency = 0.0
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with SinkStats.lock:
+            SinkStats.connections += 1
+        self.reply("220 sink ESMTP")
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command.startswith(("HELO", "MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                if self.latency:
+                    time.sleep(self.latency)
+                with SinkStats.lock:
+                    SinkStats.messages += 1
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# ------------------------------------------------------------------
+# RUNS
+# ------------------------------------------------------------------
+def _report(label: str, count: int, elapsed: float, caller_ms: float) -> float:
+    rate = count / elapsed
+    print(
+        f"  {label:<12} {rate:8.0f} msg/s   caller={caller_ms:7.3f}ms/msg   "
+        f"smtp connections={SinkStats.connections}"
+    )
+    return rate
+
+
+def _per_message(args) -> float:
+    from services.email.smtpprovider import SmtpProvider
+
+    def send(i):
+        provider = SmtpProvider()
+        try:
+            provider.send_email(f"student{i}@example.com", SUBJECT, BODY)
+        finally:
+            provider.close()
+
+    SinkStats.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(send, range(args.messages)))
+    elapsed = time.perf_counter() - started
+    # Callers wait for the whole SMTP exchange
+    return _report("per-message", args.messages, elapsed, elapsed * 1000 / args.messages * args.workers)
+
+
+def _dispatcher(args) -> float:
+    from services.email.dispatcher import EmailDispatcher
+
+    EmailDispatcher.start()
+    SinkStats.reset()
+    started = time.perf_counter()
+    for i in range(args.messages):
+        EmailDispatcher.send(to_email=f"student{i}@example.com", subject=SUBJECT, body=BODY)
+    enqueued = time.perf_counter() - started
+
+    while SinkStats.messages < args.messages:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    rate = _report("dispatcher", args.messages, elapsed, enqueued * 1000 / args.messages)
+
+    metrics = EmailDispatcher.metrics()
+    EmailDispatcher.stop()
+    print(f"               avg send {metrics['avg_send_ms']}ms, avg queue wait {metrics['avg_queue_wait_ms']}ms")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduStore email dispatch benchmark")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4, help="Sender threads / EMAIL_WORKERS")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Sink delay per accepted message")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    # Point the SMTP provider and the in-memory dispatcher at the sink
+    os.environ.update({
+        "EMAIL_PROVIDER": "smtp",
+        "EMAIL_QUEUE_BACKEND": "memory",
+        "EMAIL_WORKERS": str(args.workers),
+        "EMAIL_QUEUE_MAX_SIZE": str(max(args.messages, 1000)),
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(args.port),
+        "SMTP_SSL": "false",
+        "SMTP_STARTTLS": "false",
+        "SMTP_USER": "",
+        "SMTP_PASS": "",
+    })
+
+    SmtpSinkHandler.latency = args.latency_ms / 1000
+    sink = SmtpSink(("127.0.0.1", args.port), SmtpSinkHandler)
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+
+    print(f"📧 {args.messages} messages, {args.workers} workers, sink latency {args.latency_ms}ms")
+    try:
+        per_message = _per_message(args)
+        dispatcher = _dispatcher(args)
+    finally:
+        sink.shutdown()
+
+    print(f"\n  dispatcher: {dispatcher / per_message:.1f}x throughput")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Access-token verification microbenchmark.
+
+Compares full python-jose verification against the decoded-token cache
+used by get_current_user, for a single hot token and for a working set
+of many users' tokens.
+
+Usage:
+    python -m benchmarks.jwt_decode
+    python -m benchmarks.jwt_decode --tokens 5000 --number 20000
+"""
+import argparse
+import sys
+import timeit
+
+sys.path.insert(0, '.')
+
+
+def _report(label: str, seconds: float, number: int) -> float:
+    per_call_us = seconds / number * 1_000_000
+    print(f"  {label:<34} {per_call_us:9.2f} µs/call")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduStore JWT decode microbenchmark")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per measurement")
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens in the working set")
+    args = parser.parse_args()
+
+    from services.auth import jwt as jwt_service
+
+    hot = jwt_service.create_access_token(1)
+    tokens = [jwt_service.create_access_token(i) for i in range(1, args.tokens + 1)]
+
+    print(f"🔐 JWT decode ({args.number} calls, {args.tokens} tokens in working set)")
+
+    jwt_service.clear_decoded_cache()
+    full = _report(
+        "full verify (python-jose)",
+        timeit.timeit(lambda: jwt_service._verify_token(hot), number=args.number),
+        args.number,
+    )
+
+    jwt_service.clear_decoded_cache()
+    jwt_service.decode_token(hot)
+    cached = _report(
+        "decode_token, same token",
+        timeit.timeit(lambda: jwt_service.decode_token(hot), number=args.number),
+        args.number,
+    )
+
+    jwt_service.clear_decoded_cache()
+    for token in tokens:
+        jwt_service.decode_token(token)
+    it = iter(tokens * (args.number // len(tokens) + 1))
+    working_set = _report(
+        "decode_token, rotating working set",
+        timeit.timeit(lambda: jwt_service.decode_token(next(it)), number=args.number),
+        args.number,
+    )
+
+    print(f"\n✨ Speedup: {full / cached:.1f}x (hot token), {full / working_set:.1f}x (working set)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Middleware stack microbenchmark.
+
+Builds the same app twice - a trivial GET /ping route behind main.py's
+middleware order (timing, query stats, CORS, GZip, preflight, exception
+catcher) - once with the previous BaseHTTPMiddleware layers and once with
+the pure ASGI ones from core.middleware, then calls each directly through
+the ASGI interface (no server, no sockets) and reports requests/second.
+
+Only middleware overhead is measured: the route does no work and the rate
+limiter (Redis round trip) is left out.
+
+Usage:
+    python -m benchmarks.middleware_stack
+    python -m benchmarks.middleware_stack --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.config import app_settings, DatabaseSetting
+from db import query_stats
+
+
+# ------------------------------------------------------------------
+# PREVIOUS STACK (BaseHTTPMiddleware, as main.py had it)
+# ------------------------------------------------------------------
+async def legacy_catch_exceptions(request: Request, call_next):
+    try:
+        return await call_next(request)
+    except Exception:
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "Internal Server Error", "error_code": "unhandled_exception"},
+        )
+
+
+async def legacy_options_preflight(request: Request, call_next):
+    if request.method == "OPTIONS":
+        return JSONResponse(status_code=200, headers={"Access-Control-Allow-Origin": app_settings.FRONTEND_URL})
+    return await call_next(request)
+
+
+class LegacyTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{time.time() - start:.3f}"
+        return response
+
+
+class LegacyQueryStatsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        token = query_stats.start_request()
+        try:
+            response = await call_next(request)
+        finally:
+            stats = query_stats.end_request(token)
+
+        method, route = query_stats.metric_labels(request.method, request.scope.get("route"))
+        query_stats.report(
+            stats,
+            method=method,
+            route=route,
+            threshold=DatabaseSetting.SQL_NPLUSONE_THRESHOLD,
+        )
+        if app_settings.is_development:
+            response.headers["X-DB-Query-Count"] = str(stats.count)
+        return response
+
+
+# ------------------------------------------------------------------
+# APPS
+# ------------------------------------------------------------------
+def _app(pure_asgi: bool) -> FastAPI:
+    from core.middleware import (
+        CatchExceptionsMiddleware,
+        PreflightMiddleware,
+        QueryStatsMiddleware,
+        TimingMiddleware,
+    )
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if pure_asgi:
+        app.add_middleware(CatchExceptionsMiddleware)
+        app.add_middleware(PreflightMiddleware)
+    else:
+        app.add_middleware(BaseHTTPMiddleware, dispatch=legacy_catch_exceptions)
+        app.add_middleware(BaseHTTPMiddleware, dispatch=legacy_options_preflight)
+
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[app_settings.FRONTEND_URL],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+
+    if pure_asgi:
+        app.add_middleware(QueryStatsMiddleware)
+        app.add_middleware(TimingMiddleware)
+    else:
+        app.add_middleware(LegacyQueryStatsMiddleware)
+        app.add_middleware(LegacyTimingMiddleware)
+    return app
+
+
+async def _call(app) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"origin", app_settings.FRONTEND_URL.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _measure(label: str, app, args) -> float:
+    # Warm-up (route compilation, middleware stack build)
+    for _ in range(200):
+        await _call(app)
+
+    rates = []
+    for _ in range(args.rounds):
+        remaining = iter(range(args.requests))
+
+        async def worker():
+            for _ in remaining:
+                assert await _call(app) == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+        rates.append(args.requests / (time.perf_counter() - started))
+
+    rate = statistics.median(rates)
+    print(f"  {label:<18} {rate:8.0f} req/s   ({1e6 / rate:6.1f} µs/request, median of {args.rounds})")
+    return rate
+
+
+async def run(args) -> None:
+    print(f"🧱 GET /ping x{args.requests}, concurrency {args.concurrency}")
+    legacy = await _measure("BaseHTTPMiddleware", _app(pure_asgi=False), args)
+    pure = await _measure("pure ASGI", _app(pure_asgi=True), args)
+    print(f"\n  pure ASGI: {pure / legacy:.2f}x requests/second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduStore middleware stack microbenchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Rate limiter load test.
+
+Fires a burst of concurrent requests from a set of identities and checks
+that no identity got more than the sliding window allows: `limit` per
+window, plus the share of the previous window that slides out while the
+burst runs (limit * elapsed / window).
+
+Identities (--identity-mode):
+  - token: a distinct access token per identity (user:<id>). Tokens are
+           signed with this process's SECRET_KEY, so a remote server must
+           share it.
+  - ip:    a distinct X-Forwarded-For address per identity. The app only
+           honours the header behind trusted proxies: in-process this sets
+           TRUSTED_PROXY_HOPS=1; a remote server must be configured so.
+
+Usage:
+    # in-process against main.app
+    python -m benchmarks.rate_limit_load --policy search --path "/search/users?query=student"
+
+    # against a running deployment (several workers sharing Redis)
+    python -m benchmarks.rate_limit_load --url http://localhost:8000 --policy otp_verify \
+        --method POST --path /auth/verify-otp --json '{"email": "a@b.co", "otp": "000000"}'
+
+Exit status 1 if any identity exceeded its limit.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, '.')
+
+import httpx
+
+
+def _identity_headers(args, i: int) -> tuple[str, dict]:
+    if args.identity_mode == "token":
+        from services.auth.jwt import create_access_token
+        # Ids far above real users: the limiter keys on the token alone
+        user_id = 10_000_000 + i
+        return f"user:{user_id}", {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    ip = f"10.0.{i // 256}.{i % 256}"
+    return f"ip:{ip}", {"X-Forwarded-For": ip}
+
+
+async def _worker(client, queue, args, results):
+    while True:
+        try:
+            identity, headers = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.request(
+            args.method,
+            args.path,
+            headers=headers,
+            json=json.loads(args.json) if args.json else None,
+        )
+        results.append((identity, response.status_code, time.perf_counter() - start, response.headers))
+
+
+async def run(args) -> int:
+    from services.rate_limit.limiter import POLICIES
+    policy = POLICIES[args.policy]
+
+    if args.url:
+        transport = None
+        base_url = args.url
+    else:
+        import main
+        transport = httpx.ASGITransport(app=main.app)
+        base_url = "http://loadtest"
+
+    identities = [_identity_headers(args, i) for i in range(args.identities)]
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(identities[i % args.identities])
+
+    results = []
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as client:
+        await asyncio.gather(*[_worker(client, queue, args, results) for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for _, status, _, _ in results)
+    allowed = defaultdict(int)
+    for identity, status, _, _ in results:
+        if status != 429:
+            allowed[identity] += 1
+
+    latencies = sorted(latency * 1000 for _, _, latency, _ in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    limited = [headers for _, status, _, headers in results if status == 429]
+
+    print(f"🚦 {args.method} {args.path} policy={policy.name} ({policy.limit}/{policy.window}s)")
+    print(f"  requests      {len(results)} from {args.identities} identities, concurrency {args.concurrency}")
+    print(f"  throughput    {len(results) / elapsed:.0f} req/s")
+    print(f"  latency       p50={statistics.median(latencies):.2f}ms p99={p99:.2f}ms")
+    print(f"  statuses      {dict(sorted(statuses.items()))}")
+    print(f"  max allowed   {max(allowed.values(), default=0)} per identity")
+    if limited:
+        sample = limited[0]
+        print(f"  429 headers   RateLimit-Remaining={sample.get('ratelimit-remaining')} Retry-After={sample.get('retry-after')}")
+
+    bound = policy.limit + math.ceil(policy.limit * elapsed / policy.window)
+    print(f"  bound         {bound} per identity over {elapsed:.1f}s")
+
+    over = {identity: n for identity, n in allowed.items() if n > bound}
+    if over:
+        print(f"\n❌ {len(over)} identities exceeded the limit: {dict(list(over.items())[:5])}")
+        return 1
+
+    print("\n✅ Limit held for every identity")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EduStore rate limiter load test")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process main.app)")
+    parser.add_argument("--policy", default="search")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--path", default="/search/users?query=student")
+    parser.add_argument("--json", help="JSON request body")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--identities", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--identity-mode", choices=["token", "ip"], default="token")
+    args = parser.parse_args()
+
+    if args.identity_mode == "ip" and not args.url:
+        # In-process the peer is the ASGI transport: trust one proxy hop
+        os.environ["TRUSTED_PROXY_HOPS"] = "1"
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
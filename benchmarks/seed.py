@@ -0,0 +1,225 @@
+"""
+Synthetic social-graph generator for the query-plan benchmarks.
+
+Popularity follows a Zipf-like power law: a handful of users own most of
+the followers, documents and likes, the long tail has almost none. That
+is the shape that exposes bad plans (a seq scan that is fine for the
+median user explodes for the top one).
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.user import User
+from models.student import Student
+from models.document import Document
+from models.likes import Like
+from models.comments import Comment
+from models.follow import Follow
+from models.bookmark import Bookmark
+
+
+TOPICS = [
+    "machine learning", "data structures", "operating systems", "linear algebra",
+    "thermodynamics", "organic chemistry", "microeconomics", "compiler design",
+    "computer networks", "probability", "discrete mathematics", "databases",
+]
+KINDS = ["Lecture notes on", "Assignment:", "Cheat sheet for", "Past paper -", "Summary of"]
+COLLEGES = ["IIT Delhi", "NIT Trichy", "BITS Pilani", "DTU", "IIIT Hyderabad"]
+COURSES = ["B.Tech CSE", "B.Tech ECE", "B.Sc Physics", "BBA", "M.Tech AI"]
+DOC_TYPES = ["pdf", "pdf", "pdf", "image", "notes", "post"]
+
+BATCH_SIZE = 5000
+
+
+@dataclass
+class SeedConfig:
+    users: int = 2000
+    docs_per_user: float = 5.0
+    likes_per_user: float = 20.0
+    follows_per_user: float = 15.0
+    comments_per_user: float = 5.0
+    bookmarks_per_user: float = 5.0
+    alpha: float = 1.1  # Zipf exponent; higher = more skewed
+    seed: int = 42
+
+
+def _zipf_weights(n: int, alpha: float, rng: random.Random) -> list[float]:
+    """Power-law weights, randomly assigned so popularity is not ID-ordered."""
+    weights = [1.0 / (rank ** alpha) for rank in range(1, n + 1)]
+    rng.shuffle(weights)
+    return weights
+
+
+def _unique_pairs(
+    rng: random.Random,
+    *,
+    left: list[int],
+    left_weights: list[float] | None,
+    right: list[int],
+    right_weights: list[float] | None,
+    target: int,
+    allow_same: bool = True,
+) -> set[tuple[int, int]]:
+    pairs: set[tuple[int, int]] = set()
+    attempts = 0
+    max_attempts = target * 5
+
+    while len(pairs) < target and attempts < max_attempts:
+        k = min(BATCH_SIZE, target - len(pairs))
+        lefts = rng.choices(left, weights=left_weights, k=k)
+        rights = rng.choices(right, weights=right_weights, k=k)
+        for a, b in zip(lefts, rights):
+            if allow_same or a != b:
+                pairs.add((a, b))
+        attempts += k
+
+    return pairs
+
+
+def _bulk_insert(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(table), rows[start:start + BATCH_SIZE])
+
+
+def _random_ts(rng: random.Random, now: datetime, days: int = 365) -> datetime:
+    return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def seed_database(engine: Engine, config: SeedConfig) -> dict:
+    """
+    Wipe the benchmark database and fill it with a synthetic social graph.
+
+    Returns the number of rows written per table.
+    """
+    rng = random.Random(config.seed)
+    now = datetime.now(tz=timezone.utc)
+
+    user_ids = list(range(1, config.users + 1))
+    user_weights = _zipf_weights(config.users, config.alpha, rng)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "TRUNCATE users, students, documents, likes, comments, follows, bookmarks "
+            "RESTART IDENTITY CASCADE"
+        ))
+
+        # 1. Users + student profiles
+        _bulk_insert(conn, User.__table__, [
+            {
+                "email": f"user{i}@bench.local",
+                "is_verified": True,
+                "is_active": True,
+                "created_at": _random_ts(rng, now, days=730),
+            }
+            for i in user_ids
+        ])
+        _bulk_insert(conn, Student.__table__, [
+            {
+                "user_id": i,
+                "name": f"Student {i}",
+                "college": rng.choice(COLLEGES),
+                "course": rng.choice(COURSES),
+                "semester": str(rng.randint(1, 8)),
+                "profile_url": f"users/{i}/profile/{uuid4().hex}.png" if rng.random() < 0.3 else None,
+            }
+            for i in user_ids
+        ])
+
+        # 2. Documents - owners drawn by popularity
+        total_docs = int(config.users * config.docs_per_user)
+        owners = rng.choices(user_ids, weights=user_weights, k=total_docs)
+        documents = []
+        for owner_id in owners:
+            doc_type = rng.choice(DOC_TYPES)
+            is_post = doc_type == "post"
+            documents.append({
+                "user_id": owner_id,
+                "title": f"{rng.choice(KINDS)} {rng.choice(TOPICS)} {rng.randint(1, 99)}",
+                "doc_type": doc_type,
+                "object_key": None if is_post else f"users/{owner_id}/documents/{uuid4().hex}.pdf",
+                "content": "Synthetic benchmark content" if is_post else None,
+                "content_type": "text/plain" if is_post else "application/pdf",
+                "file_size": None if is_post else rng.randint(10_000, 20_000_000),
+                "visibility": "public" if rng.random() < 0.8 else "private",
+                "is_deleted": rng.random() < 0.03,
+                "created_at": _random_ts(rng, now),
+            })
+        _bulk_insert(conn, Document.__table__, documents)
+
+        doc_ids = list(range(1, total_docs + 1))
+        doc_weights = _zipf_weights(total_docs, config.alpha, rng)
+
+        # 3. Follows - in-degree follows the power law
+        follows = _unique_pairs(
+            rng,
+            left=user_ids, left_weights=None,
+            right=user_ids, right_weights=user_weights,
+            target=int(config.users * config.follows_per_user),
+            allow_same=False,
+        )
+        _bulk_insert(conn, Follow.__table__, [
+            {"follower_id": a, "following_id": b, "created_at": _random_ts(rng, now)}
+            for a, b in follows
+        ])
+
+        # 4. Likes / bookmarks - active users x popular documents
+        likes = _unique_pairs(
+            rng,
+            left=user_ids, left_weights=user_weights,
+            right=doc_ids, right_weights=doc_weights,
+            target=int(config.users * config.likes_per_user),
+        )
+        _bulk_insert(conn, Like.__table__, [
+            {"user_id": u, "document_id": d, "created_at": _random_ts(rng, now)}
+            for u, d in likes
+        ])
+
+        bookmarks = _unique_pairs(
+            rng,
+            left=user_ids, left_weights=user_weights,
+            right=doc_ids, right_weights=doc_weights,
+            target=int(config.users * config.bookmarks_per_user),
+        )
+        _bulk_insert(conn, Bookmark.__table__, [
+            {"user_id": u, "document_id": d, "created_at": _random_ts(rng, now)}
+            for u, d in bookmarks
+        ])
+
+        # 5. Comments (duplicates allowed)
+        total_comments = int(config.users * config.comments_per_user)
+        _bulk_insert(conn, Comment.__table__, [
+            {
+                "user_id": u,
+                "document_id": d,
+                "content": "Synthetic comment",
+                "is_deleted": False,
+                "created_at": _random_ts(rng, now),
+            }
+            for u, d in zip(
+                rng.choices(user_ids, k=total_comments),
+                rng.choices(doc_ids, weights=doc_weights, k=total_comments),
+            )
+        ])
+
+    # Denormalized counters + fresh planner statistics
+    from services.follow.follow_counts import FollowCounters
+    with Session(engine) as db:
+        FollowCounters.reconcile(db=db)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    return {
+        "users": config.users,
+        "documents": total_docs,
+        "follows": len(follows),
+        "likes": len(likes),
+        "bookmarks": len(bookmarks),
+        "comments": total_comments,
+    }
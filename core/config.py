@@ -15,6 +15,9 @@ class AppSettings(BaseSettings):
     
     # Google OAuth
     GOOGLE_CLIENT_ID: str = "715484256238-t9k2t4d6qoedf3bik945uk2depejkd8t.apps.googleusercontent.com"
+
+    # Internal token for /metrics/* outside development (see dependencies.metrics_access)
+    METRICS_TOKEN: str = ""
     
     @property
     def is_production(self) -> bool:
@@ -30,6 +33,16 @@ class AppSettings(BaseSettings):
 class Database_Setting(AppSettings):
     DATABASE_URL: str
 
+    # Per-request SQL instrumentation: flag a statement shape repeated
+    # more than this many times in one request as a likely N+1
+    SQL_NPLUSONE_THRESHOLD: int = 5
+
+    # Connection pool (per worker). A request waits at most DB_POOL_TIMEOUT
+    # seconds for a slot before failing fast with 503 instead of queueing.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 5
+
 
 class MailSetting(AppSettings):
     # Brevo API Settings
@@ -40,6 +53,22 @@ class MailSetting(AppSettings):
     # SMTP Settings (Legacy)
     SMTP_USER: str
     SMTP_PASS: str
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 465
+    SMTP_SSL: bool = True  # implicit TLS; false -> plain SMTP (local sink), see SMTP_STARTTLS
+    SMTP_STARTTLS: bool = False
+    SMTP_TIMEOUT: float = 10.0
+    SMTP_IDLE_TIMEOUT: float = 60.0  # reconnect instead of reusing a connection idle this long
+
+    # Email dispatch (see services.email.dispatcher)
+    EMAIL_PROVIDER: str = "brevo"  # brevo | smtp
+    EMAIL_QUEUE_BACKEND: str = "memory"  # memory | db (durable, survives restarts)
+    EMAIL_WORKERS: int = 4
+    EMAIL_QUEUE_MAX_SIZE: int = 1000  # memory backend; beyond this sends fail fast
+    EMAIL_MAX_ATTEMPTS: int = 5  # then the message is dead-lettered
+    EMAIL_RETRY_BACKOFF: float = 2.0  # base delay, doubled per attempt
+    EMAIL_BATCH_SIZE: int = 20  # db backend: rows claimed per poll
+    EMAIL_LEASE: int = 60  # db backend: seconds a claimed row is hidden from other workers
     
     # JWT Settings
     SECRET_KEY: str
@@ -50,6 +79,25 @@ class MailSetting(AppSettings):
 
 class ServiceSettings(AppSettings):
     CHAT_SERVICE_URL: str
+    # Shared client for the chat service (see services.chat.chat_service.ChatClient)
+    CHAT_HTTP2: bool = False
+    CHAT_TIMEOUT: float = 10.0
+    CHAT_CONNECT_TIMEOUT: float = 3.0
+    CHAT_MAX_CONNECTIONS: int = 50
+    CHAT_MAX_KEEPALIVE: int = 50  # below the concurrency, bursts churn connections
+    CHAT_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    CHAT_RETRIES: int = 2  # extra attempts on connect errors, timeouts, 429/502/503/504
+    CHAT_RETRY_BACKOFF: float = 0.2  # base delay, doubled per attempt (full jitter)
+
+    # Profile sync outbox (see services.chat.sync_outbox)
+    CHAT_SYNC_WORKER_ENABLED: bool = True
+    CHAT_SYNC_DELAY: float = 2.0  # coalescing window: changes within it become one push
+    CHAT_SYNC_BATCH_SIZE: int = 50
+    CHAT_SYNC_CONCURRENCY: int = 8  # parallel pushes per batch
+    CHAT_SYNC_MAX_ATTEMPTS: int = 10  # then the row stays as a dead letter until the next change
+    CHAT_SYNC_LEASE: int = 60  # seconds a claimed row is hidden from other workers
+    # Bulk endpoint taking {"users": [...]}; empty -> one /api/auth/sync per user
+    CHAT_SYNC_BULK_PATH: str = ""
 
 
 class RedisSetting(AppSettings):
@@ -57,13 +105,49 @@ class RedisSetting(AppSettings):
     UPSTASH_REDIS_REST_TOKEN: str = ""
 
 
+class RateLimitSetting(AppSettings):
+    RATE_LIMIT_ENABLED: bool = True
+    # Global per-identity budget enforced by RateLimitMiddleware
+    RATE_LIMIT_DEFAULT_PER_MINUTE: int = 300
+    # Proxies in front of the app that append to X-Forwarded-For (0: none,
+    # use the socket peer). See services.rate_limit.limiter.client_ip
+    TRUSTED_PROXY_HOPS: int = 0
+
+
 class StorageSetting(AppSettings):
-    # Cloudinary Settings
-    CLOUDINARY_CLOUD_NAME: str
-    CLOUDINARY_API_KEY: str
-    CLOUDINARY_API_SECRET: str
+    # Cloudinary Settings (required when STORAGE_PROVIDER=cloudinary)
+    CLOUDINARY_CLOUD_NAME: str = ""
+    CLOUDINARY_API_KEY: str = ""
+    CLOUDINARY_API_SECRET: str = ""
     
-    STORAGE_PROVIDER: str = "cloudinary"
+    STORAGE_PROVIDER: str = "cloudinary"  # cloudinary | local
+
+    # Local filesystem storage (served by this app on /files)
+    LOCAL_STORAGE_ROOT: str = "storage_data"
+    LOCAL_STORAGE_BASE_URL: str = ""  # public URL of this API; empty -> relative URLs
+    LOCAL_STORAGE_SIGNING_KEY: str = ""  # defaults to a key derived from SECRET_KEY
+    # Blocking SDK calls from async code run on a dedicated pool (see services.storage.executor)
+    STORAGE_MAX_WORKERS: int = 8
+    STORAGE_MAX_PENDING: int = 32  # running + queued; beyond this requests get 503
+    STORAGE_SLOW_OP_SECONDS: float = 2.0
+
+    # Thumbnail rendering after document commit (see services.file_service.thumbnail_service)
+    THUMBNAILS_ENABLED: bool = True
+    THUMBNAIL_WORKERS: int = 2  # rendering processes
+
+    # Deletion outbox worker and orphan sweeper (see services.storage.deletion_queue)
+    STORAGE_DELETION_WORKER_ENABLED: bool = True
+    STORAGE_DELETE_BATCH_SIZE: int = 100
+    STORAGE_DELETE_INTERVAL: int = 30  # seconds between queue polls
+    STORAGE_DELETE_MAX_ATTEMPTS: int = 8  # then the row stays as a dead letter
+    STORAGE_DELETE_LEASE: int = 300  # seconds a claimed batch is hidden from other workers
+    STORAGE_SWEEP_INTERVAL: int = 6 * 3600
+    STORAGE_SWEEP_MIN_AGE: int = 24 * 3600  # never touch objects younger than this
+
+    # Resumable document uploads (see api.document.resumable_upload)
+    UPLOAD_CHUNK_MIN_SIZE: int = 256 * 1024  # except the last chunk
+    UPLOAD_CHUNK_MAX_SIZE: int = 8 * 1024 * 1024
+    UPLOAD_SESSION_TTL: int = 24 * 3600
     DEFAULT_AVATAR_URL: str = "https://res.cloudinary.com/dly8p9v99/image/upload/v1736616449/edustore/avatars/default-avatar_v0r4j8.png"
 
 
@@ -73,6 +157,7 @@ DatabaseSetting = Database_Setting()
 mail_setting = MailSetting()
 redis_setting = RedisSetting()
 storage_setting = StorageSetting()
+rate_limit_setting = RateLimitSetting()
 service_setting = ServiceSettings()
 
 
@@ -85,6 +170,21 @@ def validate_environment():
     if app_settings.ENVIRONMENT not in ["development", "production"]:
         errors.append(f"ENVIRONMENT must be 'development' or 'production', got '{app_settings.ENVIRONMENT}'")
     
+    provider = storage_setting.STORAGE_PROVIDER.lower()
+    if provider not in ("cloudinary", "local"):
+        errors.append(f"STORAGE_PROVIDER must be 'cloudinary' or 'local', got '{provider}'")
+    elif provider == "cloudinary" and not (
+        storage_setting.CLOUDINARY_CLOUD_NAME
+        and storage_setting.CLOUDINARY_API_KEY
+        and storage_setting.CLOUDINARY_API_SECRET
+    ):
+        errors.append("CLOUDINARY_CLOUD_NAME, CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET must be set for cloudinary storage")
+
+    if mail_setting.EMAIL_PROVIDER.lower() not in ("brevo", "smtp"):
+        errors.append(f"EMAIL_PROVIDER must be 'brevo' or 'smtp', got '{mail_setting.EMAIL_PROVIDER}'")
+    if mail_setting.EMAIL_QUEUE_BACKEND.lower() not in ("memory", "db"):
+        errors.append(f"EMAIL_QUEUE_BACKEND must be 'memory' or 'db', got '{mail_setting.EMAIL_QUEUE_BACKEND}'")
+    
     # Production-specific validations
     if app_settings.is_production:
         # No localhost URLs in production
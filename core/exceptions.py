@@ -19,6 +19,12 @@ class EmailSendFailed(AppException):
     error_code = "EMAIL_SEND_FAILED"
 
 
+class EmailRejected(EmailSendFailed):
+    # Permanent failure (bad recipient, invalid request): retrying cannot help
+    default_message = "Email rejected by provider"
+    error_code = "EMAIL_REJECTED"
+
+
 class SMTPConnectionFailed(AppException):
     default_message = "SMTP connection failed"
     error_code = "SMTP_CONNECTION_FAILED"
@@ -44,10 +50,19 @@ class StorageOperationFailed(AppException):
     error_code = "STORAGE_OPERATION_FAILED"
 
 
+class StorageBusy(AppException):
+    default_message = "Storage is busy, please retry"
+    error_code = "STORAGE_BUSY"
+
+
 class RateLimitExceeded(AppException):
     default_message = "Too many requests, please try again later"
     error_code = "RATE_LIMIT_EXCEEDED"
 
+    def __init__(self, message: str | None = None, headers: dict | None = None):
+        super().__init__(message)
+        self.headers = headers or {}
+
 
 class DatabaseOperationFailed(AppException):
     default_message = "Database operation failed"
@@ -165,6 +180,46 @@ class DocumentDeleted(DocumentError):
     error_code = "DOCUMENT.DELETED"
 
 
+class InvalidCursor(DocumentError):
+    default_message = "Invalid pagination cursor"
+    error_code = "DOCUMENT.INVALID_CURSOR"
+
+
+class DocumentTooLarge(DocumentError):
+    default_message = "Document size exceeds 20 MB limit"
+    error_code = "DOCUMENT.TOO_LARGE"
+
+
+class UnsupportedDocumentType(DocumentError):
+    default_message = "Unsupported document type"
+    error_code = "DOCUMENT.UNSUPPORTED_TYPE"
+
+
+class UploadSessionNotFound(DocumentError):
+    default_message = "Upload session not found or expired"
+    error_code = "DOCUMENT.UPLOAD_NOT_FOUND"
+
+
+class UploadOffsetMismatch(DocumentError):
+    default_message = "Chunk offset does not match the uploaded size"
+    error_code = "DOCUMENT.UPLOAD_OFFSET_MISMATCH"
+
+
+class InvalidUploadChunk(DocumentError):
+    default_message = "Invalid upload chunk"
+    error_code = "DOCUMENT.INVALID_CHUNK"
+
+
+class UploadIncomplete(DocumentError):
+    default_message = "Upload is not complete"
+    error_code = "DOCUMENT.UPLOAD_INCOMPLETE"
+
+
+class UploadSessionLocked(DocumentError):
+    default_message = "Upload is being finalized"
+    error_code = "DOCUMENT.UPLOAD_LOCKED"
+
+
 # =========================
 # Avatar Errors
 # =========================
@@ -295,6 +350,14 @@ ERROR_STATUS_MAP = {
     DownloadUrlGenerationFailed: 500,
     DocumentOwnershipError: 403,
     DocumentDeleted: 404,
+    InvalidCursor: 400,
+    DocumentTooLarge: 413,
+    UnsupportedDocumentType: 415,
+    UploadSessionNotFound: 404,
+    UploadOffsetMismatch: 409,
+    InvalidUploadChunk: 400,
+    UploadIncomplete: 409,
+    UploadSessionLocked: 409,
     InvalidAvatarContentType: 400,
     InvalidAvatarKey: 400,
     AvatarUploadExpired: 404,
@@ -0,0 +1,157 @@
+"""
+App-wide HTTP middleware, written as plain ASGI callables.
+
+BaseHTTPMiddleware runs the downstream app in a separate task and pipes
+every response body, chunk by chunk, through a memory stream - per layer,
+per request. These wrap `send` instead: response headers are added as the
+http.response.start message goes out, and the body is passed through
+untouched.
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from core.config import app_settings, DatabaseSetting
+from db import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class CatchExceptionsMiddleware:
+    """Turns unhandled exceptions into a JSON 500 (if nothing was sent yet)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking)
+        except Exception:
+            logger.error(
+                "Unhandled exception %s %s",
+                scope["method"],
+                scope["path"],
+                exc_info=True,
+            )
+            if response_started:
+                # Headers are out: nothing left but to drop the connection
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content={
+                    "detail": "Internal Server Error",
+                    "error_code": "unhandled_exception",
+                },
+            )
+            await response(scope, receive, send)
+
+
+class PreflightMiddleware:
+    """Answers any OPTIONS request that CORSMiddleware did not treat as a preflight."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            content=None,
+            status_code=200,
+            headers={
+                "Access-Control-Allow-Origin": app_settings.FRONTEND_URL,
+                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, PATCH, OPTIONS",
+                "Access-Control-Allow-Headers": "*",
+                "Access-Control-Allow-Credentials": "true",
+                "Access-Control-Max-Age": "86400",
+            },
+        )
+        await response(scope, receive, send)
+
+
+class TimingMiddleware:
+    """X-Process-Time (until response headers) and a warning for slow requests."""
+
+    SLOW_REQUEST = 0.5
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.time()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                duration = time.time() - start
+                MutableHeaders(scope=message)["X-Process-Time"] = f"{duration:.3f}"
+
+                if duration > self.SLOW_REQUEST:
+                    logger.warning(
+                        "Slow request %s %s %.3fs",
+                        scope["method"],
+                        scope["path"],
+                        duration,
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class QueryStatsMiddleware:
+    """Per-request SQL stats (see db.query_stats); X-DB-* headers in development."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = query_stats.start_request()
+        stats = query_stats.current_stats()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                # The router records the matched route in the shared scope
+                method, route = query_stats.metric_labels(scope["method"], scope.get("route"))
+                repeated = query_stats.report(
+                    stats,
+                    method=method,
+                    route=route,
+                    threshold=DatabaseSetting.SQL_NPLUSONE_THRESHOLD,
+                )
+
+                if app_settings.is_development:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Time"] = f"{stats.total_time:.3f}"
+                    headers["X-DB-Slowest"] = f"{stats.slowest_time:.3f}"
+                    if repeated:
+                        headers["X-DB-N-Plus-One"] = str(repeated[0][1])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.end_request(token)
@@ -1,6 +1,7 @@
 from db.session import SessionLocal
 
 def get_db():
+    # No connection is held until the first query (see db.session)
     db = SessionLocal()
     try:
         yield db
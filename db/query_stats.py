@@ -0,0 +1,171 @@
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy cursor events on the engine record every statement into the
+QueryStats object of the current request (held in a ContextVar, which
+FastAPI propagates into the threadpool that runs sync routes). Requests
+without an active QueryStats (scripts, background jobs) are not tracked.
+"""
+import re
+import time
+import logging
+import threading
+from collections import Counter
+from contextvars import ContextVar, Token
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+# "IN (%(id_1_1)s, %(id_1_2)s, ...)" -> "IN (?)" so batch sizes share one shape
+_PARAM_LIST = re.compile(r"\((?:\s*%\([^)]+\)s\s*,?)+\)|\((?:\s*\?\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats differing only in bind values match"""
+    shape = _PARAM_LIST.sub("(?)", statement)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statement count, DB time and repeated shapes for one request"""
+
+    __slots__ = ("count", "total_time", "slowest_time", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times (likely N+1)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+def start_request() -> Token:
+    return _current_stats.set(QueryStats())
+
+
+def end_request(token: Token) -> QueryStats:
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+    return stats
+
+
+def current_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+# Metric keys must stay bounded: requests that matched no route, or used a
+# method outside this set, are folded into one label each
+UNMATCHED_ROUTE = "<unmatched>"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def metric_labels(method: str, route) -> tuple[str, str]:
+    """(method, route template) to aggregate a request under"""
+    return (
+        method if method in KNOWN_METHODS else "OTHER",
+        route.path if route is not None else UNMATCHED_ROUTE,
+    )
+
+
+class QueryMetrics:
+    """Process-wide per-route aggregates (exposed on /metrics/sql)"""
+
+    _lock = threading.Lock()
+    _routes: dict[str, dict] = {}
+
+    @classmethod
+    def record(cls, route: str, stats: QueryStats, n_plus_one: bool) -> None:
+        with cls._lock:
+            entry = cls._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "db_time_ms": 0.0,
+                "max_queries": 0,
+                "slowest_ms": 0.0,
+                "n_plus_one": 0,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["db_time_ms"] += stats.total_time * 1000
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["slowest_ms"] = max(entry["slowest_ms"], stats.slowest_time * 1000)
+            if n_plus_one:
+                entry["n_plus_one"] += 1
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        with cls._lock:
+            return {
+                route: {
+                    **entry,
+                    "db_time_ms": round(entry["db_time_ms"], 3),
+                    "slowest_ms": round(entry["slowest_ms"], 3),
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                }
+                for route, entry in cls._routes.items()
+            }
+
+
+def report(stats: QueryStats, *, method: str, route: str, threshold: int) -> list[tuple[str, int]]:
+    """Log likely N+1 patterns and fold the request into QueryMetrics"""
+    repeated = stats.repeated_shapes(threshold)
+    for shape, n in repeated:
+        logger.warning(
+            "Possible N+1 %s %s: statement repeated %d times: %s",
+            method,
+            route,
+            n,
+            shape[:300],
+        )
+    QueryMetrics.record(f"{method} {route}", stats, n_plus_one=bool(repeated))
+    return repeated
+
+
+def install(engine: Engine) -> None:
+    """Attach the timing hooks to the engine (idempotent)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute never fires for a failed statement - drop its start time
+    conn = exception_context.connection
+    if conn is not None and _current_stats.get() is not None:
+        starts = conn.info.get("query_start_time")
+        if starts:
+            starts.pop()
@@ -1,15 +1,51 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from core.config import DatabaseSetting
+from db import query_stats
 
 
 engine = create_engine(
     DatabaseSetting.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=30,
+    pool_size=DatabaseSetting.DB_POOL_SIZE,
+    max_overflow=DatabaseSetting.DB_MAX_OVERFLOW,
+    pool_timeout=DatabaseSetting.DB_POOL_TIMEOUT,
     pool_recycle=1800,
 )
+query_stats.install(engine)
+
+# Sessions are lazy: a pooled connection is only checked out by the first
+# statement, so requests served entirely from cache never touch the pool.
 SessionLocal = sessionmaker(bind=engine,autoflush=False)
 
+
+def release_connection(db: Session) -> None:
+    """
+    Hand the session's connection back to the pool after read-only work.
+
+    Call this once the rows a request needs are loaded and before slow
+    non-DB work (URL signing, Redis writes). Loaded objects stay usable;
+    a later query simply checks out a connection again. Sessions with
+    pending writes are left untouched.
+    """
+    if not db.in_transaction() or db.new or db.dirty or db.deleted:
+        return
+
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+def pool_status() -> dict:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"class": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checked_in": pool.checkedin(),
+    }
@@ -3,15 +3,15 @@ from jose import JWTError, ExpiredSignatureError
 from sqlalchemy.orm import Session
 
 from db.deps import get_db
-from models.user import User
 from services.auth.jwt import decode_token
+from services.cache.principal_cache import Principal, PrincipalCache
 
 
 def get_current_user(
     authorization: str | None = Header(default=None),
     access_token: str | None = Cookie(default=None),
     db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
     token = None
     
     if authorization and authorization.startswith("Bearer "):
@@ -53,13 +53,20 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # L1/Redis snapshot - no users query on the hot path
+    user = PrincipalCache.get(db=db, user_id=int(user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is inactive",
+        )
+
     return user
 
 
@@ -67,9 +74,9 @@ def get_current_user_optional(
     authorization: str | None = Header(default=None),
     access_token: str | None = Cookie(default=None),
     db: Session = Depends(get_db),
-) -> User | None:
+) -> Principal | None:
     """
-    Optional authentication - returns User if authenticated, None if not.
+    Optional authentication - returns Principal if authenticated, None if not.
     Does not raise HTTPException for missing/invalid tokens.
     """
     token = None
@@ -94,5 +101,7 @@ def get_current_user_optional(
     if not user_id:
         return None
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = PrincipalCache.get(db=db, user_id=int(user_id))
+    if not user or not user.is_active:
+        return None
     return user
@@ -0,0 +1,27 @@
+import secrets
+
+from fastapi import HTTPException, Request, status
+
+from core.config import app_settings
+
+
+def require_metrics_access(request: Request) -> None:
+    """
+    Guard for the /metrics/* endpoints (query shapes, timings, queue state).
+
+    Open in development. Elsewhere the caller must send METRICS_TOKEN in
+    the X-Metrics-Token header; without a configured token the endpoints
+    don't exist (404).
+    """
+    if app_settings.is_development:
+        return
+
+    if not app_settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    token = request.headers.get("x-metrics-token", "")
+    if not secrets.compare_digest(token.encode(), app_settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+        )
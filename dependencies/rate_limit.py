@@ -0,0 +1,27 @@
+from fastapi import Request, Response
+
+from core.config import rate_limit_setting
+from core.exceptions import RateLimitExceeded
+from services.rate_limit.limiter import POLICIES, RateLimiter, request_identity
+
+
+def rate_limit(policy_name: str):
+    """
+    Route-level limit, e.g. `dependencies=[Depends(rate_limit("search"))]`.
+
+    Counted per user for authenticated requests, per IP otherwise.
+    """
+    policy = POLICIES[policy_name]
+
+    def dependency(request: Request, response: Response) -> None:
+        if not rate_limit_setting.RATE_LIMIT_ENABLED:
+            return
+
+        result = RateLimiter.hit(policy, request_identity(request))
+        if not result.allowed:
+            raise RateLimitExceeded(headers=result.headers())
+
+        for name, value in result.headers().items():
+            response.headers[name] = value
+
+    return dependency
@@ -1,20 +1,177 @@
+import json
 import secrets
+import time
 from services.cache.redis_service import cache
+from services.rate_limit.limiter import client_ip
 from core.config import mail_setting
 
 REFRESH_TOKEN_TTL = mail_setting.REFRESH_TOKEN_EXPIRE_DAYS * 86400
-  
 
-def store_refresh_token(user_id: int) -> str:
+# Keys:
+#   refresh:{user_id}:{token_id}  -> JSON device metadata (one per live session)
+#   refresh_sessions:{user_id}    -> SET of live token_ids (per-user session index)
+#
+# Every multi-key change runs as one Lua script: a single REST round trip,
+# applied atomically by Redis.
+
+_STORE_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# Check-and-swap: only the first of two concurrent refreshes finds the old key
+_ROTATE_SCRIPT = """
+local old = redis.call('GET', KEYS[1])
+if not old then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[3], ARGV[1])
+
+local meta = cjson.decode(ARGV[3])
+local ok, prev = pcall(cjson.decode, old)
+if ok and type(prev) == 'table' and prev['created_at'] then
+    meta['created_at'] = prev['created_at']
+end
+
+redis.call('SET', KEYS[2], cjson.encode(meta), 'EX', ARGV[4])
+redis.call('SADD', KEYS[3], ARGV[2])
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+return 1
+"""
+
+_REVOKE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[1])
+return 1
+"""
+
+_REVOKE_ALL_SCRIPT = """
+local ids = redis.call('SMEMBERS', KEYS[1])
+for _, token_id in ipairs(ids) do
+    redis.call('DEL', ARGV[1] .. token_id)
+end
+redis.call('DEL', KEYS[1])
+return #ids
+"""
+
+
+def _session_key(user_id: int, token_id: str) -> str:
+    return f"refresh:{user_id}:{token_id}"
+
+
+def _index_key(user_id: int) -> str:
+    return f"refresh_sessions:{user_id}"
+
+
+def device_metadata(request) -> dict:
+    """Device info recorded with a session (shown in the session list)."""
+    return {
+        "user_agent": (request.headers.get("user-agent") or "")[:256],
+        "ip": client_ip(request),
+    }
+
+
+def _metadata(device: dict | None) -> str:
+    now = int(time.time())
+    return json.dumps({**(device or {}), "created_at": now, "last_used_at": now})
+
+
+def _eval(script: str, keys: list[str], args: list) -> int | None:
+    if not cache._client:
+        return None
+    try:
+        return cache._client.eval(script, keys=keys, args=[str(a) for a in args])
+    except Exception as e:
+        print(f"Redis session script error: {e}")
+        return None
+
+
+def store_refresh_token(user_id: int, device: dict | None = None) -> str:
     token_id = secrets.token_hex(16)
-    key = f"refresh:{user_id}:{token_id}"
-    cache.set(key, 1, REFRESH_TOKEN_TTL)
+    _eval(
+        _STORE_SCRIPT,
+        keys=[_session_key(user_id, token_id), _index_key(user_id)],
+        args=[token_id, _metadata(device), REFRESH_TOKEN_TTL],
+    )
     return token_id
 
 
+def rotate_refresh_token(user_id: int, token_id: str, device: dict | None = None) -> str | None:
+    """
+    Atomically replace a refresh session with a new one.
+
+    Returns the new token_id, or None if the old session no longer exists
+    (expired, revoked, or already rotated by a concurrent request).
+    """
+    new_token_id = secrets.token_hex(16)
+    rotated = _eval(
+        _ROTATE_SCRIPT,
+        keys=[
+            _session_key(user_id, token_id),
+            _session_key(user_id, new_token_id),
+            _index_key(user_id),
+        ],
+        args=[token_id, new_token_id, _metadata(device), REFRESH_TOKEN_TTL],
+    )
+    return new_token_id if rotated == 1 else None
+
+
 def is_refresh_token_valid(user_id: int, token_id: str) -> bool:
-    return cache.exists(f"refresh:{user_id}:{token_id}")
+    return cache.exists(_session_key(user_id, token_id))
 
 
 def revoke_refresh_token(user_id: int, token_id: str) -> None:
-    cache.delete(f"refresh:{user_id}:{token_id}")
+    _eval(
+        _REVOKE_SCRIPT,
+        keys=[_session_key(user_id, token_id), _index_key(user_id)],
+        args=[token_id],
+    )
+
+
+def revoke_all_refresh_tokens(user_id: int) -> int:
+    """Log out everywhere: O(sessions), no key scan. Returns sessions revoked."""
+    revoked = _eval(
+        _REVOKE_ALL_SCRIPT,
+        keys=[_index_key(user_id)],
+        args=[f"refresh:{user_id}:"],
+    )
+    return revoked or 0
+
+
+def list_refresh_sessions(user_id: int) -> list[dict]:
+    """Live sessions with their device metadata; prunes expired index entries."""
+    if not cache._client:
+        return []
+
+    try:
+        token_ids = sorted(cache._client.smembers(_index_key(user_id)) or [])
+        if not token_ids:
+            return []
+        values = cache._client.mget(*[_session_key(user_id, t) for t in token_ids])
+    except Exception as e:
+        print(f"Redis session list error: {e}")
+        return []
+
+    sessions, expired = [], []
+    for token_id, value in zip(token_ids, values):
+        if value is None:
+            expired.append(token_id)
+            continue
+        try:
+            meta = json.loads(value)
+        except (TypeError, ValueError):
+            meta = {}
+        if not isinstance(meta, dict):
+            meta = {}  # legacy sessions stored a bare flag
+        sessions.append({"session_id": token_id, **meta})
+
+    if expired:
+        try:
+            cache._client.srem(_index_key(user_id), *expired)
+        except Exception:
+            pass
+
+    return sessions
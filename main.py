@@ -1,19 +1,29 @@
 import os
-import time
 import sys
 import logging
 import traceback
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy.exc import TimeoutError as SQLAlchemyTimeoutError
 
 from api.api_router import api_router
-from core.config import app_settings
+from core.config import app_settings, rate_limit_setting
+from core.middleware import (
+    CatchExceptionsMiddleware,
+    PreflightMiddleware,
+    QueryStatsMiddleware,
+    TimingMiddleware,
+)
+from db import query_stats
+from dependencies.metrics_access import require_metrics_access
 from core.exceptions import (
     DomainError,
+    RateLimitExceeded,
+    StorageBusy,
     ERROR_STATUS_MAP,
 )
 
@@ -27,53 +37,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ------------------------------------------------------------------
+# LIFESPAN
+# ------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from services.chat.chat_service import ChatClient
+    from services.chat.sync_outbox import ChatSyncQueue
+    from services.storage.deletion_queue import DeletionQueue
+    from services.storage.executor import AsyncStorage
+    from services.file_service.thumbnail_service import ThumbnailService
+    from services.email.dispatcher import EmailDispatcher
+
+    ChatClient.start()
+    EmailDispatcher.start()
+    ChatSyncQueue.start()
+    DeletionQueue.start()
+    yield
+    # Let in-flight uploads finish before the worker exits; pending thumbnails are dropped
+    await ChatSyncQueue.stop()
+    await ChatClient.close()
+    DeletionQueue.stop()
+    EmailDispatcher.stop()
+    AsyncStorage.shutdown()
+    ThumbnailService.shutdown()
+
 # ------------------------------------------------------------------
 # APP INIT
 # ------------------------------------------------------------------
 app = FastAPI(
     title="EduStore",
     description="EduStore Backend API",
+    lifespan=lifespan,
 )
 
 # Router
 app.include_router(api_router)
 
 # ------------------------------------------------------------------
-# GLOBAL EXCEPTION MIDDLEWARE
+# MIDDLEWARE (pure ASGI, see core.middleware)
+# add_middleware wraps what is already there: the last added runs first
 # ------------------------------------------------------------------
-@app.middleware("http")
-async def catch_exceptions_middleware(request: Request, call_next):
-    try:
-        return await call_next(request)
-    except Exception as exc:
-        logger.error(
-            "Unhandled exception %s %s",
-            request.method,
-            request.url.path,
-            exc_info=True,
-        )
-        return JSONResponse(
-            status_code=500,
-            content={
-                "detail": "Internal Server Error",
-                "error_code": "unhandled_exception",
-            },
-        )
-
-@app.middleware("http")
-async def options_preflight_middleware(request: Request, call_next):
-    if request.method == "OPTIONS":
-        return JSONResponse(
-            status_code=200,
-            headers={
-                "Access-Control-Allow-Origin": app_settings.FRONTEND_URL,
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, PATCH, OPTIONS",
-                "Access-Control-Allow-Headers": "*",
-                "Access-Control-Allow-Credentials": "true",
-                "Access-Control-Max-Age": "86400",
-            },
-        )
-    return await call_next(request)
+app.add_middleware(CatchExceptionsMiddleware)
+app.add_middleware(PreflightMiddleware)
+
+# ------------------------------------------------------------------
+# RATE LIMITING (inside CORS so 429s stay readable by the frontend)
+# ------------------------------------------------------------------
+if rate_limit_setting.RATE_LIMIT_ENABLED:
+    from services.rate_limit.limiter import POLICIES
+    from services.rate_limit.middleware import RateLimitMiddleware
+    app.add_middleware(RateLimitMiddleware, policy=POLICIES["default"])
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
@@ -86,26 +100,7 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# ------------------------------------------------------------------
-# REQUEST TIMING MIDDLEWARE
-# ------------------------------------------------------------------
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
-        response = await call_next(request)
-        duration = time.time() - start
-        response.headers["X-Process-Time"] = f"{duration:.3f}"
-
-        if duration > 0.5:
-            logger.warning(
-                "Slow request %s %s %.3fs",
-                request.method,
-                request.url.path,
-                duration,
-            )
-        return response
-
-
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(TimingMiddleware)
 
 # ------------------------------------------------------------------
@@ -123,10 +118,51 @@ async def domain_exception_handler(request: Request, exc: DomainError):
     )
 
 
+@app.exception_handler(SQLAlchemyTimeoutError)
+async def db_pool_timeout_handler(request: Request, exc: SQLAlchemyTimeoutError):
+    # Pool exhausted: shed load instead of letting requests pile up
+    logger.warning("DB pool exhausted %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={
+            "detail": "Service busy, please retry",
+            "error_code": "db_pool_exhausted",
+        },
+    )
+
+
+@app.exception_handler(StorageBusy)
+async def storage_busy_handler(request: Request, exc: StorageBusy):
+    # Storage pool saturated: shed load instead of queueing behind the provider
+    logger.warning("Storage pool saturated %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "2"},
+        content={
+            "detail": str(exc),
+            "error_code": "storage_busy",
+        },
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        headers=exc.headers,
+        content={
+            "detail": str(exc),
+            "error_code": "rate_limit_exceeded",
+        },
+    )
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
         content={
             "detail": exc.detail,
             "error_code": "rate_limit_exceeded"
@@ -142,9 +178,26 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def home():
     return {"message": "EduStore API running"}
 
+@app.get("/metrics/sql", dependencies=[Depends(require_metrics_access)])
+async def sql_metrics():
+    """Per-route statement counts, DB time and N+1 flags for this worker"""
+    return query_stats.QueryMetrics.snapshot()
+
+@app.get("/metrics/storage", dependencies=[Depends(require_metrics_access)])
+async def storage_metrics():
+    """Storage pool load and per-operation timings for this worker"""
+    from services.storage.executor import StorageMetrics
+    return StorageMetrics.snapshot()
+
+@app.get("/metrics/email", dependencies=[Depends(require_metrics_access)])
+def email_metrics():
+    """Email queue depth, delivery counters and send timings for this worker"""
+    from services.email.dispatcher import EmailDispatcher
+    return EmailDispatcher.metrics()
+
 @app.get("/health")
 async def health_check():
-    from db.deps import get_db
+    from db.session import SessionLocal, pool_status
     from core.redis import redis_client
     from sqlalchemy import text
 
@@ -156,9 +209,10 @@ async def health_check():
     }
 
     try:
-        db = next(get_db())
-        db.execute(text("SELECT 1"))
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
         status["database"] = "connected"
+        status["db_pool"] = pool_status()
     except Exception as e:
         status["status"] = "unhealthy"
         status["database"] = str(e)
@@ -0,0 +1,47 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    Text,
+    DateTime,
+    ForeignKey,
+)
+from sqlalchemy.sql import func
+from db.base import Base
+
+
+class ChatSyncOutbox(Base):
+    """
+    Pending profile syncs to the chat service, one row per user.
+
+    Every profile change bumps `version` on the user's row instead of adding
+    a new one, so any number of changes collapse into a single push of the
+    latest state (see ChatSyncQueue).
+    """
+    __tablename__ = "chat_sync_outbox"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    version = Column(Integer, nullable=False, server_default="1")
+
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    # Coalescing window / retry backoff: not pushed before this time
+    not_before = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+    # Set while a worker pushes the row (no lock is held during the HTTP call)
+    leased_until = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -8,6 +8,8 @@ from sqlalchemy import (
     BigInteger,
     Enum,
     Text,   # 👈 ADD THIS
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -32,17 +34,23 @@ class Document(Base):
     doc_type = Column(String(50), nullable=False)
 
     # 🔥 file ke liye, post ke liye NULL
+    # Unique unless deduplicated: documents with the same bytes share one key
     object_key = Column(
         String(500),
         nullable=True,
-        unique=True,
-        index=True,
     )
 
     original_filename = Column(String(255))
     content_type = Column(String(100))
     file_size = Column(BigInteger)
 
+    # SHA-256 of the file for direct uploads (document_blobs entry), else NULL
+    content_sha256 = Column(String(64), nullable=True, index=True)
+
+    # Rendered WebP variants (set by ThumbnailService after commit)
+    thumbnail_key = Column(String(500), nullable=True)
+    preview_key = Column(String(500), nullable=True)
+
     # 🔥 UNIVERSAL TEXT (caption / post body)
     content = Column(Text, nullable=True)
 
@@ -76,3 +84,13 @@ class Document(Base):
 
     likes = relationship("Like", cascade="all, delete")
     bookmarks = relationship("Bookmark", cascade="all, delete")
+
+    __table_args__ = (
+        Index("ix_documents_object_key", "object_key"),
+        Index(
+            "uq_documents_object_key_unshared",
+            "object_key",
+            unique=True,
+            postgresql_where=text("content_sha256 IS NULL"),
+        ),
+    )
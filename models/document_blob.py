@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    BigInteger,
+    DateTime,
+)
+from sqlalchemy.sql import func
+from db.base import Base
+
+
+class DocumentBlob(Base):
+    """
+    Content index: one row per distinct stored file.
+
+    Documents with identical bytes share one object; ref_count is the
+    number of live documents pointing at it (see ContentIndex).
+    """
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+
+    object_key = Column(String(500), nullable=False, unique=True)
+
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100))
+
+    ref_count = Column(Integer, nullable=False, server_default="0")
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
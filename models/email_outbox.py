@@ -0,0 +1,47 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    Boolean,
+    DateTime,
+)
+from sqlalchemy.sql import func
+from db.base import Base
+
+
+class EmailOutbox(Base):
+    """
+    Durable email queue (EMAIL_QUEUE_BACKEND=db).
+
+    Rows are deleted once sent. Messages that exhausted their attempts or
+    expired stay with failed_at set, as dead letters.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    html = Column(Boolean, nullable=False, server_default="false")
+
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    # Retry backoff / claim lease: not picked up before this time
+    not_before = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+    # Pointless to deliver after this (e.g. an OTP past its validity)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    failed_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
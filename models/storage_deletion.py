@@ -0,0 +1,41 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+)
+from sqlalchemy.sql import func
+from db.base import Base
+
+
+class StorageDeletion(Base):
+    """
+    Outbox of storage objects to delete.
+
+    Rows are added in the same transaction as the change that orphans the
+    object (document delete, avatar replace), so a crash can never lose a
+    deletion. DeletionQueue drains them in batches.
+    """
+    __tablename__ = "storage_deletions"
+
+    id = Column(Integer, primary_key=True)
+
+    object_key = Column(String(500), nullable=False)
+
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+
+    # Retry backoff: not picked up before this time
+    not_before = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,78 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    UniqueConstraint,
+)
+from sqlalchemy.sql import func
+from db.base import Base
+
+
+class UploadSession(Base):
+    """
+    A resumable document upload in progress.
+
+    Chunks are appended strictly in order: received_size is the offset the
+    next chunk must start at. Finalizing assembles the chunks into one
+    document object (see api.document.resumable_upload).
+    """
+    __tablename__ = "upload_sessions"
+
+    # Random, unguessable id handed to the client
+    id = Column(String(32), primary_key=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    total_size = Column(BigInteger, nullable=False)
+    received_size = Column(BigInteger, nullable=False, server_default="0")
+
+    original_filename = Column(String(255))
+    # Sniffed from the first chunk
+    content_type = Column(String(100))
+
+    # open | finalizing | completed
+    status = Column(String(20), nullable=False, server_default="open")
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="SET NULL"))
+
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class UploadChunk(Base):
+    """One stored chunk of an upload session"""
+    __tablename__ = "upload_chunks"
+    __table_args__ = (
+        UniqueConstraint("session_id", "offset", name="uq_upload_chunks_session_offset"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    session_id = Column(
+        String(32),
+        ForeignKey("upload_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    offset = Column(BigInteger, nullable=False)
+    size = Column(BigInteger, nullable=False)
+
+    object_key = Column(String(500), nullable=False)
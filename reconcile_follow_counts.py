@@ -0,0 +1,29 @@
+"""
+Recompute users.followers_count / users.following_count from the follows table.
+
+Usage:
+    python reconcile_follow_counts.py
+"""
+import sys
+sys.path.insert(0, '.')
+
+from db.session import SessionLocal
+from services.follow.follow_counts import FollowCounters
+
+
+def reconcile():
+    print("🔄 Reconciling follow counters...")
+    db = SessionLocal()
+    try:
+        fixed = FollowCounters.reconcile(db=db)
+        print(f"✨ Follow counters reconciled ({fixed} users corrected)")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed to reconcile follow counters: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile()
@@ -0,0 +1,148 @@
+"""
+Google ID token verification with in-process signing certs.
+
+google.oauth2.id_token.verify_oauth2_token downloads Google's certs on
+every call unless the transport caches them. Here the certs are kept in
+process for as long as Google's Cache-Control allows, refreshed in the
+background shortly before they expire, and fetched through one pooled
+HTTP client. Token checks (signature, exp/iat, audience) are still done
+by google.auth.jwt.
+
+For offline use, pass `fetch_certs` returning ({kid: x509 PEM}, max_age).
+"""
+import re
+import threading
+import time
+from typing import Callable
+
+import httpx
+from google.auth import jwt as google_jwt
+
+from core.config import app_settings
+
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+DEFAULT_MAX_AGE = 3600
+REFRESH_AHEAD = 300       # start a background refresh this long before expiry
+MIN_FORCED_REFRESH = 30   # unknown `kid` triggers at most one refetch per 30s
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleIdTokenVerifier:
+    def __init__(
+        self,
+        client_id: str,
+        *,
+        certs_url: str = GOOGLE_CERTS_URL,
+        fetch_certs: Callable[[], tuple[dict, int]] | None = None,
+        clock_skew: int = 10,
+    ):
+        self.client_id = client_id
+        self.certs_url = certs_url
+        self.clock_skew = clock_skew
+        self._fetch_certs = fetch_certs or self._fetch_over_http
+        self._http: httpx.Client | None = None
+
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_forced = 0.0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()  # one synchronous fetch at a time
+        self._refreshing = False
+
+    # ------------------------------------------------------------------
+    # CERTS
+    # ------------------------------------------------------------------
+    def _fetch_over_http(self) -> tuple[dict, int]:
+        if self._http is None:
+            self._http = httpx.Client(timeout=5.0)
+        response = self._http.get(self.certs_url)
+        response.raise_for_status()
+
+        max_age = DEFAULT_MAX_AGE
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        if match:
+            max_age = int(match.group(1)) - int(response.headers.get("age", 0) or 0)
+        return response.json(), max_age
+
+    def _refresh(self) -> None:
+        certs, max_age = self._fetch_certs()
+        now = time.time()
+        with self._lock:
+            self._certs = dict(certs)
+            self._expires_at = now + max(max_age, 0)
+        print(f"🔑 Google certs refreshed ({len(certs)} keys, max-age {max_age}s)")
+
+    def _refresh_in_background(self) -> None:
+        def run():
+            try:
+                self._refresh()
+            except Exception as e:
+                # Keep serving the current certs until they expire
+                print(f"Google certs background refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="google-certs-refresh", daemon=True).start()
+
+    def get_certs(self, *, force: bool = False) -> dict[str, str]:
+        now = time.time()
+
+        if force and now - self._last_forced >= MIN_FORCED_REFRESH:
+            self._last_forced = now
+            self._refresh()
+        elif not self._certs or now >= self._expires_at:
+            with self._fetch_lock:
+                if not self._certs or time.time() >= self._expires_at:
+                    self._refresh()
+        elif now >= self._expires_at - REFRESH_AHEAD:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                self._refresh_in_background()
+
+        return self._certs
+
+    # ------------------------------------------------------------------
+    # VERIFY
+    # ------------------------------------------------------------------
+    def verify(self, token: str) -> dict:
+        """
+        Verify a Google ID token and return its claims.
+
+        Raises ValueError for any invalid token, like verify_oauth2_token.
+        """
+        header = google_jwt.decode_header(token)
+        certs = self.get_certs()
+        if header.get("kid") not in certs:
+            # Google rotated its keys before our copy expired
+            certs = self.get_certs(force=True)
+
+        claims = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=self.client_id,
+            clock_skew_in_seconds=self.clock_skew,
+        )
+
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError("Wrong issuer")
+
+        return claims
+
+
+_verifier: GoogleIdTokenVerifier | None = None
+_verifier_lock = threading.Lock()
+
+
+def get_google_verifier() -> GoogleIdTokenVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = GoogleIdTokenVerifier(app_settings.GOOGLE_CLIENT_ID)
+    return _verifier
@@ -1,3 +1,7 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from jose import jwt, ExpiredSignatureError, JWTError
 
@@ -7,6 +11,12 @@ from core.config import mail_setting
 ISSUER = "auth-service"
 AUDIENCE = "auth-client"
 
+# Verified access-token payloads, keyed by a digest of the token (the raw
+# token is never kept). An entry lives until the token's own `exp`.
+DECODED_CACHE_MAX_SIZE = 4096
+_decoded_cache: "OrderedDict[bytes, tuple[int, dict]]" = OrderedDict()
+_decoded_lock = threading.Lock()
+
 
 def _now_ts() -> int:
     return int(datetime.now(tz=timezone.utc).timestamp())
@@ -41,7 +51,8 @@ def create_refresh_token(user_id: int, token_id: str) -> str:
     return jwt.encode(payload, mail_setting.SECRET_KEY, algorithm=mail_setting.ALGORITHM)
 
 
-def decode_token(token: str) -> dict:
+def _verify_token(token: str) -> dict:
+    """Full signature + claims verification (no cache)."""
     return jwt.decode(
         token,
         mail_setting.SECRET_KEY,
@@ -49,5 +60,45 @@ def decode_token(token: str) -> dict:
         audience=AUDIENCE,
         issuer=ISSUER,
     )
-    
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a token, reusing the result for access tokens seen before.
+
+    Only successfully verified access tokens are cached; refresh tokens
+    and any failure always go through full verification, so expired or
+    forged tokens raise exactly as before.
+    """
+    digest = _token_digest(token)
+    now = time.time()
+
+    with _decoded_lock:
+        entry = _decoded_cache.get(digest)
+        if entry is not None:
+            exp, payload = entry
+            if exp > now:
+                _decoded_cache.move_to_end(digest)
+                return dict(payload)
+            del _decoded_cache[digest]
+
+    payload = _verify_token(token)
+
+    exp = payload.get("exp")
+    if payload.get("typ") == "access" and isinstance(exp, (int, float)):
+        with _decoded_lock:
+            _decoded_cache[digest] = (exp, dict(payload))
+            while len(_decoded_cache) > DECODED_CACHE_MAX_SIZE:
+                _decoded_cache.popitem(last=False)
+
+    return payload
+
+
+def clear_decoded_cache() -> None:
+    with _decoded_lock:
+        _decoded_cache.clear()
 
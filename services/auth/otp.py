@@ -29,73 +29,86 @@ def hash_otp(otp: str) -> str:
     ).hexdigest()
 
 
+# Each operation is one EVAL: a single round trip to Upstash, and Redis runs
+# the script atomically, so parallel guesses cannot slip past MAX_ATTEMPTS.
+
+# KEYS: otp, attempts, cooldown | ARGV: hash, ttl, cooldown
+_SAVE_OTP_SCRIPT = """
+if not redis.call('SET', KEYS[3], 1, 'EX', ARGV[3], 'NX') then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('SET', KEYS[2], 0, 'EX', ARGV[2])
+return 1
+"""
+
+# KEYS: otp, attempts, cooldown | ARGV: hash, max attempts
+# Returns 1 on match, 0 on mismatch (attempt counted), -1 when locked out,
+# -2 when no OTP is pending.
+_VERIFY_OTP_SCRIPT = """
+local attempts = tonumber(redis.call('GET', KEYS[2]) or '0')
+if attempts >= tonumber(ARGV[2]) then
+    return -1
+end
+
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -2
+end
+
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+    return 1
+end
+
+redis.call('INCR', KEYS[2])
+if redis.call('TTL', KEYS[2]) < 0 then
+    redis.call('EXPIRE', KEYS[2], math.max(redis.call('TTL', KEYS[1]), 1))
+end
+return 0
+"""
+
+
+def _otp_keys(email: str) -> list[str]:
+    return [f"otp:{email}", f"otp:attempt:{email}", f"otp:cooldown:{email}"]
+
+
 def save_otp(email: str, otp: str) -> None:
     email = _normalize_email(email)
 
-    otp_key = f"otp:{email}"
-    attempt_key = f"otp:attempt:{email}"
-    cooldown_key = f"otp:cooldown:{email}"
-
     try:
-        cooldown_set = redis_client.set(
-            cooldown_key,
-            1,
-            ex=OTP_COOLDOWN,
-            nx=True
+        saved = redis_client.eval(
+            _SAVE_OTP_SCRIPT,
+            keys=_otp_keys(email),
+            args=[hash_otp(otp), str(OTP_TTL), str(OTP_COOLDOWN)],
         )
-
-        if not cooldown_set:
-            raise OTPCooldownActive()
-
-        hashed_otp = hash_otp(otp)
-
-        redis_client.setex(otp_key, OTP_TTL, hashed_otp)
-        redis_client.setex(attempt_key, OTP_TTL, 0)
-
-    except OTPCooldownActive:
-        raise
-
     except Exception as e:
         raise RedisUploadFailed("Failed to save OTP") from e
 
+    if not saved:
+        raise OTPCooldownActive()
+
 
 def verify_otp(email: str, user_otp: str) -> bool:
     email = _normalize_email(email)
 
-    otp_key = f"otp:{email}"
-    attempt_key = f"otp:attempt:{email}"
-
     try:
-        attempts = redis_client.get(attempt_key)
-        if attempts is not None and int(attempts) >= MAX_ATTEMPTS:
-            return False
-
-        stored_hash = redis_client.get(otp_key)
-        if stored_hash is None:
-            return False
-
-        user_hash = hash_otp(user_otp)
+        # Only the HMAC of the guess leaves the process, never the OTP itself
+        result = redis_client.eval(
+            _VERIFY_OTP_SCRIPT,
+            keys=_otp_keys(email),
+            args=[hash_otp(user_otp), str(MAX_ATTEMPTS)],
+        )
+    except Exception as e:
+        raise RedisFetchFailed("OTP verification failed") from e
 
-        if hmac.compare_digest(stored_hash, user_hash):
-            redis_client.delete(otp_key)
-            redis_client.delete(attempt_key)
-            redis_client.delete(f"otp:cooldown:{email}")  # Clear cooldown on success
-            return True
+    return result == 1
 
-        redis_client.incr(attempt_key)
-        return False
 
-    except Exception as e:
-        raise RedisFetchFailed("OTP verification failed") from e
-    
 def invalidate_otp(email: str) -> None:
     email = _normalize_email(email)
 
-    otp_key = f"otp:{email}"
-    attempt_key = f"otp:attempt:{email}"
-
     try:
-        redis_client.delete(otp_key)
-        redis_client.delete(attempt_key)
+        redis_client.delete(f"otp:{email}", f"otp:attempt:{email}")
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -13,6 +13,8 @@ class CacheManager:
     def invalidate_user_docs(user_id: int):
         """Clear document list for a specific user"""
         cache.delete_pattern(f"user:docs:{user_id}:*")
+        # The user's own private search matches are cached per user
+        cache.delete_pattern(f"search:docs:private:{user_id}:*")
         print(f"🧹 User {user_id} docs cache invalidated")
 
     @staticmethod
@@ -31,6 +33,10 @@ class CacheManager:
         # 4. Current User's Bookmarks (If they interact, status might update)
         if current_user_id:
             cache.delete_pattern(f"user:bookmarks:{current_user_id}:*")
+
+            # 5. Actor's like/bookmark ID sets (used to hydrate shared feed/search caches)
+            from services.cache.user_state import UserStateCache
+            UserStateCache.clear_user_state(current_user_id)
             
         print(f"🧹 Document {document_id} cache invalidated (Owner: {owner_id}, Actor: {current_user_id})")
 
@@ -38,8 +44,15 @@ class CacheManager:
     def invalidate_profile(user_id: int):
         """Clear profile cache"""
         cache.delete(f"user_profile_static:{user_id}")
+        CacheManager.invalidate_principal(user_id)
         print(f"🧹 User {user_id} profile cache invalidated")
 
+    @staticmethod
+    def invalidate_principal(user_id: int):
+        """Drop the cached auth snapshot (call on deactivation / email / verification changes)"""
+        from services.cache.principal_cache import PrincipalCache
+        PrincipalCache.invalidate(user_id)
+
     @staticmethod
     def invalidate_user_bookmarks(user_id: int):
         """Clear bookmarks cache for a specific user"""
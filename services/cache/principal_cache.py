@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from models.user import User
+from services.cache.redis_service import cache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Compact snapshot of the authenticated user.
+
+    Returned by get_current_user instead of an ORM row, so it carries only
+    what auth needs. Routes that need anything else (counters, student
+    profile) must load it themselves.
+    """
+    id: int
+    email: str
+    is_active: bool
+    is_verified: bool
+
+
+class PrincipalCache:
+    """
+    Two-level cache for principal resolution:
+        L1: in-process LRU (very short TTL, bounded size)
+        L2: Redis  -> principal:{user_id}
+
+    L1 cannot be invalidated across workers, so its TTL bounds how long a
+    deactivated user can keep using another worker.
+    """
+
+    LOCAL_TTL = 5
+    LOCAL_MAX_SIZE = 2048
+    SHARED_TTL = 60
+
+    _local: "OrderedDict[int, tuple[float, Principal]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"principal:{user_id}"
+
+    @classmethod
+    def _local_get(cls, user_id: int) -> Optional[Principal]:
+        with cls._lock:
+            entry = cls._local.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                del cls._local[user_id]
+                return None
+            cls._local.move_to_end(user_id)
+            return principal
+
+    @classmethod
+    def _local_set(cls, principal: Principal) -> None:
+        with cls._lock:
+            cls._local[principal.id] = (time.monotonic() + cls.LOCAL_TTL, principal)
+            cls._local.move_to_end(principal.id)
+            while len(cls._local) > cls.LOCAL_MAX_SIZE:
+                cls._local.popitem(last=False)
+
+    @classmethod
+    def get(cls, *, db: Session, user_id: int) -> Optional[Principal]:
+        """Resolve a principal: L1 -> Redis -> users table. None if the user does not exist."""
+        principal = cls._local_get(user_id)
+        if principal is not None:
+            return principal
+
+        cached = cache.get(cls._key(user_id))
+        if cached:
+            try:
+                principal = Principal(**cached)
+            except TypeError:
+                principal = None  # stale shape, fall through to the DB
+            if principal is not None:
+                cls._local_set(principal)
+                return principal
+
+        row = (
+            db.query(User.id, User.email, User.is_active, User.is_verified)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row:
+            return None
+
+        principal = Principal(
+            id=row.id,
+            email=row.email,
+            is_active=bool(row.is_active),
+            is_verified=bool(row.is_verified),
+        )
+        cache.set(cls._key(user_id), asdict(principal), ttl=cls.SHARED_TTL)
+        cls._local_set(principal)
+        return principal
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        with cls._lock:
+            cls._local.pop(user_id, None)
+        cache.delete(cls._key(user_id))
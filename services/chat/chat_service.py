@@ -1,7 +1,18 @@
 """
 Chat microservice integration service.
 Handles communication with the Node.js chat server and student verification.
+
+All calls go through one application-lifetime httpx.AsyncClient
+(ChatClient), opened and closed by the app lifespan: connections are kept
+alive and reused, so a sync no longer pays DNS, TCP and TLS setup.
+Transient failures (connect errors, timeouts, 429/502/503/504) are retried
+with exponential backoff and full jitter; every chat endpoint we call is
+idempotent (sync is an upsert keyed by postgresId).
 """
+import asyncio
+import logging
+import random
+
 import httpx
 from sqlalchemy.orm import Session
 from models.student import Student
@@ -11,6 +22,116 @@ from core.config import service_setting
 
 CHAT_SERVICE_URL = service_setting.CHAT_SERVICE_URL
 
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRY_AFTER = 5.0  # seconds; longer Retry-After hints fail the call instead
+
+logger = logging.getLogger(__name__)
+
+
+class ChatClient:
+    _client: httpx.AsyncClient | None = None
+
+    @staticmethod
+    def _build() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=CHAT_SERVICE_URL,
+            http2=service_setting.CHAT_HTTP2,
+            timeout=httpx.Timeout(
+                service_setting.CHAT_TIMEOUT,
+                connect=service_setting.CHAT_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=service_setting.CHAT_MAX_CONNECTIONS,
+                max_keepalive_connections=service_setting.CHAT_MAX_KEEPALIVE,
+                keepalive_expiry=service_setting.CHAT_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    @classmethod
+    def start(cls) -> None:
+        """Open the shared client (app startup)."""
+        if cls._client is None:
+            cls._client = cls._build()
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close pooled connections (app shutdown)."""
+        client, cls._client = cls._client, None
+        if client is not None:
+            await client.aclose()
+
+    @classmethod
+    def get(cls) -> httpx.AsyncClient:
+        # Lazily opened when used outside the app lifespan (scripts, tests)
+        if cls._client is None:
+            cls.start()
+        return cls._client
+
+    @classmethod
+    async def request(
+        cls,
+        method: str,
+        path: str,
+        *,
+        timeout: float | None = None,
+        retries: int | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request to the chat service, retrying transient failures.
+
+        Args:
+            method: HTTP method
+            path: Path relative to CHAT_SERVICE_URL
+            timeout: Overrides the client timeout for this call
+            retries: Overrides CHAT_RETRIES for this call
+
+        Returns:
+            The successful response
+
+        Raises:
+            httpx.HTTPError: Once retries are exhausted, or on a non-retryable status
+        """
+        client = cls.get()
+        retries = service_setting.CHAT_RETRIES if retries is None else retries
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        for attempt in range(retries + 1):
+            retry_after = None
+            try:
+                response = await client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                reason = type(e).__name__
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    response.raise_for_status()
+                    return response
+                reason = str(response.status_code)
+                retry_after = _retry_after(response)
+                if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                    response.raise_for_status()
+
+            # Full jitter: concurrent callers don't retry in lockstep
+            delay = random.uniform(0, service_setting.CHAT_RETRY_BACKOFF * 2 ** attempt)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            logger.warning(
+                "Chat %s %s failed (%s), retry %d/%d in %.2fs",
+                method, path, reason, attempt + 1, retries, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after", "")
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
 
 async def is_student(db: Session, user_id: int) -> bool:
     """
@@ -73,12 +194,13 @@ async def get_student_data(db: Session, user_id: int) -> Optional[Dict[str, Any]
     }
 
 
-async def sync_user_to_chat(student_data: Dict[str, Any]) -> Dict[str, Any]:
+async def sync_user_to_chat(student_data: Dict[str, Any], *, timeout: float | None = None) -> Dict[str, Any]:
     """
     Sync a student to the chat microservice.
     
     Args:
         student_data: Student data dictionary
+        timeout: Per-call timeout (defaults to CHAT_TIMEOUT)
         
     Returns:
         Response from chat service with token and user data
@@ -86,29 +208,69 @@ async def sync_user_to_chat(student_data: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         httpx.HTTPError: If sync fails
     """
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.post(
-            f"{CHAT_SERVICE_URL}/api/auth/sync",
-            json=student_data
+    response = await ChatClient.request(
+        "POST",
+        "/api/auth/sync",
+        json=student_data,
+        timeout=timeout,
+    )
+    return response.json()
+
+
+def build_sync_payloads(db: Session, user_ids: list[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Current chat profile of each user, read in one query.
+    
+    Args:
+        db: Database session
+        user_ids: Users to sync
+        
+    Returns:
+        Sync payload per user ID (users that no longer exist are left out)
+    """
+    from models.user import User
+    from services.storage.url_cache import StorageURLCache
+
+    rows = (
+        db.query(
+            User.id,
+            User.email,
+            Student.name,
+            Student.course,
+            Student.college,
+            Student.profile_url,
         )
-        response.raise_for_status()
-        return response.json()
+        .outerjoin(Student, Student.user_id == User.id)
+        .filter(User.id.in_(user_ids))
+        .all()
+    )
+    return {
+        row.id: {
+            "postgresId": str(row.id),
+            "email": row.email,
+            "fullName": row.name or row.email.split("@")[0],
+            "profilePic": StorageURLCache.get_avatar_url(row.profile_url),
+            "bio": f"{row.course or ''} - {row.college or ''}".strip(" -") or "",
+        }
+        for row in rows
+    }
 
 
-async def get_chat_users(chat_token: str) -> Dict[str, Any]:
+async def get_chat_users(chat_token: str, *, timeout: float | None = None) -> Dict[str, Any]:
     """
     Get list of users from chat microservice.
     
     Args:
         chat_token: JWT token for chat authentication
+        timeout: Per-call timeout (defaults to CHAT_TIMEOUT)
         
     Returns:
         Response with users list
     """
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(
-            f"{CHAT_SERVICE_URL}/api/messages/users",
-            headers={"Authorization": f"Bearer {chat_token}"}
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await ChatClient.request(
+        "GET",
+        "/api/messages/users",
+        headers={"Authorization": f"Bearer {chat_token}"},
+        timeout=timeout,
+    )
+    return response.json()
@@ -0,0 +1,258 @@
+"""
+Durable, coalescing profile sync to the chat service.
+
+Request handlers don't call the chat service: they mark the user in the
+chat_sync_outbox table inside their own transaction (enqueue) and nudge
+the worker after commit (notify). A row per user, bumped on every change,
+means three quick edits produce one push, and a worker restart loses
+nothing.
+
+The worker is an asyncio task on the app's event loop (it pushes through
+the shared ChatClient). Each round it:
+  1. claims due rows (FOR UPDATE SKIP LOCKED) and leases them for
+     CHAT_SYNC_LEASE, so no lock is held during the HTTP calls,
+  2. builds every payload from the current DB state,
+  3. pushes them, in one bulk call when CHAT_SYNC_BULK_PATH is set,
+  4. deletes the rows it pushed - unless their version moved meanwhile,
+     in which case the newer state goes out in a later round.
+
+Failures are retried with exponential backoff; after
+CHAT_SYNC_MAX_ATTEMPTS a row stays as a dead letter until the user's next
+change revives it.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import service_setting
+from models.chat_sync_outbox import ChatSyncOutbox
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 3600
+IDLE_INTERVAL = 30.0  # seconds between polls with nothing queued
+MIN_INTERVAL = 0.5
+
+
+class ChatSyncQueue:
+    _task: asyncio.Task | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+    _wake: asyncio.Event | None = None
+
+    @staticmethod
+    def enqueue(*, db: Session, user_id: int) -> None:
+        """Mark a user's chat profile as stale, in the caller's transaction (caller commits)."""
+        push_at = func.now() + timedelta(seconds=service_setting.CHAT_SYNC_DELAY)
+        stmt = insert(ChatSyncOutbox).values(user_id=user_id, not_before=push_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChatSyncOutbox.user_id],
+            set_={
+                "version": ChatSyncOutbox.version + 1,
+                "attempts": 0,
+                "last_error": None,
+                "not_before": push_at,
+            },
+        )
+        db.execute(stmt)
+
+    @classmethod
+    def notify(cls) -> None:
+        """Wake the worker after a commit that queued syncs (safe from any thread)."""
+        if cls._loop is not None and cls._wake is not None:
+            cls._loop.call_soon_threadsafe(cls._wake.set)
+
+    # ------------------------------------------------------------------
+    # WORKER
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _due():
+        return (
+            ChatSyncOutbox.attempts < service_setting.CHAT_SYNC_MAX_ATTEMPTS,
+            ChatSyncOutbox.not_before <= func.now(),
+            or_(ChatSyncOutbox.leased_until.is_(None), ChatSyncOutbox.leased_until < func.now()),
+        )
+
+    @classmethod
+    def _claim(cls, batch_size: int) -> tuple[list, dict]:
+        """Lease a batch of due rows and build their payloads."""
+        from db.session import SessionLocal
+        from services.chat.chat_service import build_sync_payloads
+
+        with SessionLocal() as db:
+            rows = (
+                db.query(ChatSyncOutbox.user_id, ChatSyncOutbox.version, ChatSyncOutbox.attempts)
+                .filter(*cls._due())
+                .order_by(ChatSyncOutbox.not_before)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not rows:
+                db.rollback()
+                return [], {}
+
+            user_ids = [row.user_id for row in rows]
+            db.execute(
+                update(ChatSyncOutbox)
+                .where(ChatSyncOutbox.user_id.in_(user_ids))
+                .values(leased_until=func.now() + timedelta(seconds=service_setting.CHAT_SYNC_LEASE))
+            )
+            # Read after the claim: changes committed later bump the version
+            payloads = build_sync_payloads(db, user_ids)
+            db.commit()
+        return rows, payloads
+
+    @staticmethod
+    async def _push(payloads: dict) -> dict[int, str]:
+        """Send the payloads; returns {user_id: error} for the failed ones."""
+        from services.chat.chat_service import ChatClient, sync_user_to_chat
+
+        if not payloads:
+            return {}
+
+        if service_setting.CHAT_SYNC_BULK_PATH:
+            try:
+                await ChatClient.request(
+                    "POST",
+                    service_setting.CHAT_SYNC_BULK_PATH,
+                    json={"users": list(payloads.values())},
+                )
+                return {}
+            except Exception as e:
+                return {user_id: str(e) for user_id in payloads}
+
+        semaphore = asyncio.Semaphore(service_setting.CHAT_SYNC_CONCURRENCY)
+
+        async def push_one(payload):
+            async with semaphore:
+                await sync_user_to_chat(payload)
+
+        results = await asyncio.gather(
+            *(push_one(payload) for payload in payloads.values()),
+            return_exceptions=True,
+        )
+        return {
+            user_id: str(result)
+            for user_id, result in zip(payloads, results)
+            if isinstance(result, Exception)
+        }
+
+    @staticmethod
+    def _record(rows: list, failed: dict[int, str]) -> None:
+        from db.session import SessionLocal
+
+        with SessionLocal() as db:
+            for row in rows:
+                if row.user_id in failed:
+                    backoff = min(30 * 2 ** row.attempts, MAX_BACKOFF)
+                    db.execute(
+                        update(ChatSyncOutbox)
+                        .where(ChatSyncOutbox.user_id == row.user_id)
+                        .values(
+                            attempts=ChatSyncOutbox.attempts + 1,
+                            last_error=failed[row.user_id][:1000],
+                            not_before=func.now() + timedelta(seconds=backoff),
+                            leased_until=None,
+                        )
+                    )
+                    continue
+
+                pushed = db.execute(
+                    delete(ChatSyncOutbox).where(
+                        ChatSyncOutbox.user_id == row.user_id,
+                        ChatSyncOutbox.version == row.version,
+                    )
+                ).rowcount
+                if not pushed:
+                    # Changed while we pushed: the newer state goes out next
+                    db.execute(
+                        update(ChatSyncOutbox)
+                        .where(ChatSyncOutbox.user_id == row.user_id)
+                        .values(leased_until=None)
+                    )
+            db.commit()
+
+    @classmethod
+    async def drain_batch(cls, *, batch_size: int) -> int:
+        """Push one batch of due syncs. Returns the number of rows handled."""
+        rows, payloads = await asyncio.to_thread(cls._claim, batch_size)
+        if not rows:
+            return 0
+
+        failed = await cls._push(payloads)
+        await asyncio.to_thread(cls._record, rows, failed)
+
+        if failed:
+            logger.warning("Chat sync: %d of %d pushes failed, will retry", len(failed), len(rows))
+        print(f"💬 Chat sync batch: {len(rows) - len(failed)} pushed, {len(failed)} failed")
+        return len(rows)
+
+    @classmethod
+    async def drain(cls) -> int:
+        """Push every due sync, batch by batch. Returns rows handled."""
+        total = 0
+        while True:
+            handled = await cls.drain_batch(batch_size=service_setting.CHAT_SYNC_BATCH_SIZE)
+            total += handled
+            if handled < service_setting.CHAT_SYNC_BATCH_SIZE:
+                return total
+
+    @staticmethod
+    def _seconds_until_due() -> float:
+        from db.session import SessionLocal
+
+        with SessionLocal() as db:
+            next_at = (
+                db.query(func.min(func.greatest(
+                    ChatSyncOutbox.not_before,
+                    func.coalesce(ChatSyncOutbox.leased_until, ChatSyncOutbox.not_before),
+                )))
+                .filter(ChatSyncOutbox.attempts < service_setting.CHAT_SYNC_MAX_ATTEMPTS)
+                .scalar()
+            )
+            if next_at is None:
+                return IDLE_INTERVAL
+            return db.query(func.extract("epoch", next_at - func.now())).scalar()
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            cls._wake.clear()
+            delay = IDLE_INTERVAL
+            try:
+                await cls.drain()
+                delay = await asyncio.to_thread(cls._seconds_until_due)
+            except Exception:
+                logger.exception("Chat sync worker failed")
+
+            try:
+                await asyncio.wait_for(
+                    cls._wake.wait(),
+                    timeout=min(max(float(delay), MIN_INTERVAL), IDLE_INTERVAL),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    @classmethod
+    def start(cls) -> None:
+        """Start the worker on the running event loop (app startup)."""
+        if not service_setting.CHAT_SYNC_WORKER_ENABLED or cls._task is not None:
+            return
+        cls._loop = asyncio.get_running_loop()
+        cls._wake = asyncio.Event()
+        cls._task = cls._loop.create_task(cls._run(), name="chat-sync")
+
+    @classmethod
+    async def stop(cls) -> None:
+        task, cls._task = cls._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        cls._loop = cls._wake = None
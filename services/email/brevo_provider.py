@@ -2,7 +2,7 @@ from services.email.email_service import EmailService
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
 from core.config import mail_setting
-from core.exceptions import EmailSendFailed
+from core.exceptions import EmailSendFailed, EmailRejected
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,11 +12,16 @@ class BrevoProvider(EmailService):
     """
     Brevo (formerly Sendinblue) email provider implementation.
     Uses Brevo API v3 for sending transactional emails.
+
+    One instance is shared by all dispatcher workers: the SDK's urllib3
+    pool keeps HTTPS connections alive between sends.
     """
 
     def __init__(self):
         configuration = sib_api_v3_sdk.Configuration()
         configuration.api_key["api-key"] = mail_setting.BREVO_API_KEY
+        # One pooled connection per dispatcher worker
+        configuration.connection_pool_maxsize = max(mail_setting.EMAIL_WORKERS, 1)
 
         self.api_instance = sib_api_v3_sdk.TransactionalEmailsApi(
             sib_api_v3_sdk.ApiClient(configuration)
@@ -71,6 +76,8 @@ class BrevoProvider(EmailService):
                 f"Brevo API error while sending email to {to_email}: {e}",
                 exc_info=True,
             )
+            if e.status and 400 <= e.status < 500 and e.status != 429:
+                raise EmailRejected("Brevo rejected the email") from e
             raise EmailSendFailed("Brevo API error while sending email") from e
 
         except Exception as e:
@@ -0,0 +1,447 @@
+"""
+Background email dispatch.
+
+Request handlers call EmailDispatcher.send(), which only enqueues: a pool
+of EMAIL_WORKERS threads delivers through one long-lived provider
+(EmailProviderFactory), so the Brevo API client and SMTP connections are
+reused across messages instead of rebuilt per send.
+
+Queues (EMAIL_QUEUE_BACKEND):
+  - memory: bounded in-process queue; fastest, lost on restart.
+  - db:     email_outbox table; survives restarts and is shared by all
+            app processes (rows claimed with FOR UPDATE SKIP LOCKED).
+
+Failed sends are retried with exponential backoff and jitter. Messages
+are dead-lettered after EMAIL_MAX_ATTEMPTS, on a permanent rejection
+(EmailRejected), or once past their TTL: an OTP nobody can use any more
+is not worth delivering. Counters and send timings are exposed on
+/metrics/email.
+"""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from core.config import mail_setting
+from core.exceptions import EmailRejected, EmailSendFailed
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 5.0  # db backend: seconds between polls when not woken
+DEPTH_CACHE_SECONDS = 10.0  # db backend: reuse the outbox COUNT for metrics
+RATE_WINDOW = 60.0
+
+
+@dataclass
+class EmailJob:
+    to_email: str
+    subject: str
+    body: str
+    html: bool = False
+    expires_at: float | None = None  # epoch seconds
+    attempts: int = 0
+    id: int | None = None  # email_outbox row (db backend)
+    enqueued_at: float = field(default_factory=time.time)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() > self.expires_at
+
+
+class EmailMetrics:
+    """Process-wide dispatch counters (exposed on /metrics/email)"""
+
+    _lock = threading.Lock()
+    _counters = {
+        "enqueued": 0,
+        "sent": 0,
+        "retried": 0,
+        "dead_lettered": 0,
+        "expired": 0,
+        "rejected_full": 0,
+    }
+    _send_total_ms = 0.0
+    _send_max_ms = 0.0
+    _queue_wait_total_ms = 0.0
+    _sent_at: deque = deque()
+
+    @classmethod
+    def incr(cls, name: str) -> None:
+        with cls._lock:
+            cls._counters[name] += 1
+
+    @classmethod
+    def record_sent(cls, *, duration: float, queue_wait: float) -> None:
+        now = time.monotonic()
+        with cls._lock:
+            cls._counters["sent"] += 1
+            cls._send_total_ms += duration * 1000
+            cls._send_max_ms = max(cls._send_max_ms, duration * 1000)
+            cls._queue_wait_total_ms += queue_wait * 1000
+            cls._sent_at.append(now)
+            while cls._sent_at and cls._sent_at[0] < now - RATE_WINDOW:
+                cls._sent_at.popleft()
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        now = time.monotonic()
+        with cls._lock:
+            sent = cls._counters["sent"]
+            recent = sum(1 for at in cls._sent_at if at >= now - RATE_WINDOW)
+            return {
+                **cls._counters,
+                "sent_per_minute": recent,
+                "avg_send_ms": round(cls._send_total_ms / sent, 3) if sent else 0.0,
+                "max_send_ms": round(cls._send_max_ms, 3),
+                "avg_queue_wait_ms": round(cls._queue_wait_total_ms / sent, 3) if sent else 0.0,
+            }
+
+
+# ------------------------------------------------------------------
+# QUEUES
+# ------------------------------------------------------------------
+class MemoryEmailQueue:
+    """Bounded in-process queue; retries wait in a heap until due."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._ready: deque[EmailJob] = deque()
+        self._delayed: list = []  # (due, seq, job)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, job: EmailJob) -> None:
+        with self._cond:
+            if len(self._ready) + len(self._delayed) >= self.max_size:
+                EmailMetrics.incr("rejected_full")
+                raise EmailSendFailed("Email queue is full, please retry")
+            self._ready.append(job)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> EmailJob | None:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._delayed)[2])
+                if self._ready:
+                    return self._ready.popleft()
+
+                wait = deadline - now
+                if self._delayed:
+                    wait = min(wait, self._delayed[0][0] - now)
+                if wait <= 0:
+                    return None
+                self._cond.wait(wait)
+
+    def ack(self, job: EmailJob) -> None:
+        pass
+
+    def retry(self, job: EmailJob, *, error: str, delay: float) -> None:
+        with self._cond:
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), job))
+            self._cond.notify()
+
+    def dead(self, job: EmailJob, *, error: str) -> None:
+        # Nothing durable to keep: the log line is the dead letter
+        logger.error("Email to %s dead-lettered after %d attempts: %s", job.to_email, job.attempts, error)
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._ready) + len(self._delayed)
+
+    def wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+
+class DatabaseEmailQueue:
+    """email_outbox table; claimed batches are buffered locally and leased."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._buffer: deque[EmailJob] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._next_poll = 0.0
+        self._depth: tuple[float, int] | None = None  # (counted at, rows)
+
+    @staticmethod
+    def _at(epoch: float | None) -> datetime | None:
+        return datetime.fromtimestamp(epoch, timezone.utc) if epoch is not None else None
+
+    def put(self, job: EmailJob) -> None:
+        from db.session import SessionLocal
+        from models.email_outbox import EmailOutbox
+
+        with SessionLocal() as db:
+            db.add(EmailOutbox(
+                to_email=job.to_email,
+                subject=job.subject,
+                body=job.body,
+                html=job.html,
+                expires_at=self._at(job.expires_at),
+            ))
+            db.commit()
+        self._wake.set()
+
+    def _claim(self) -> list[EmailJob]:
+        from sqlalchemy import func, update
+        from db.session import SessionLocal
+        from models.email_outbox import EmailOutbox
+
+        with SessionLocal() as db:
+            rows = (
+                db.query(EmailOutbox)
+                .filter(EmailOutbox.failed_at.is_(None), EmailOutbox.not_before <= func.now())
+                .order_by(EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not rows:
+                db.rollback()
+                return []
+
+            db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_([row.id for row in rows]))
+                .values(not_before=func.now() + timedelta(seconds=mail_setting.EMAIL_LEASE))
+            )
+            jobs = [
+                EmailJob(
+                    to_email=row.to_email,
+                    subject=row.subject,
+                    body=row.body,
+                    html=row.html,
+                    expires_at=row.expires_at.timestamp() if row.expires_at else None,
+                    attempts=row.attempts,
+                    id=row.id,
+                    enqueued_at=row.created_at.timestamp(),
+                )
+                for row in rows
+            ]
+            db.commit()
+        return jobs
+
+    def get(self, timeout: float) -> EmailJob | None:
+        with self._lock:
+            if not self._buffer and (self._wake.is_set() or time.monotonic() >= self._next_poll):
+                self._wake.clear()
+                self._buffer.extend(self._claim())
+                if not self._buffer:
+                    self._next_poll = time.monotonic() + POLL_INTERVAL
+            if self._buffer:
+                return self._buffer.popleft()
+        self._wake.wait(timeout)
+        return None
+
+    def _update(self, job: EmailJob, **values) -> None:
+        from sqlalchemy import update
+        from db.session import SessionLocal
+        from models.email_outbox import EmailOutbox
+
+        with SessionLocal() as db:
+            db.execute(update(EmailOutbox).where(EmailOutbox.id == job.id).values(**values))
+            db.commit()
+
+    def ack(self, job: EmailJob) -> None:
+        from sqlalchemy import delete
+        from db.session import SessionLocal
+        from models.email_outbox import EmailOutbox
+
+        with SessionLocal() as db:
+            db.execute(delete(EmailOutbox).where(EmailOutbox.id == job.id))
+            db.commit()
+
+    def retry(self, job: EmailJob, *, error: str, delay: float) -> None:
+        from sqlalchemy import func
+
+        self._update(
+            job,
+            attempts=job.attempts,
+            last_error=error[:1000],
+            not_before=func.now() + timedelta(seconds=delay),
+        )
+        with self._lock:
+            self._next_poll = min(self._next_poll, time.monotonic() + delay)
+
+    def dead(self, job: EmailJob, *, error: str) -> None:
+        from sqlalchemy import func
+
+        self._update(job, attempts=job.attempts, last_error=error[:1000], failed_at=func.now())
+        logger.error("Email %s to %s dead-lettered after %d attempts: %s", job.id, job.to_email, job.attempts, error)
+
+    def depth(self) -> int:
+        from db.session import SessionLocal
+        from models.email_outbox import EmailOutbox
+
+        cached = self._depth
+        if cached is not None and time.monotonic() - cached[0] < DEPTH_CACHE_SECONDS:
+            return cached[1]
+
+        with SessionLocal() as db:
+            rows = db.query(EmailOutbox).filter(EmailOutbox.failed_at.is_(None)).count()
+        self._depth = (time.monotonic(), rows)
+        return rows
+
+    def wake(self) -> None:
+        self._wake.set()
+
+
+# ------------------------------------------------------------------
+# DISPATCHER
+# ------------------------------------------------------------------
+class EmailDispatcher:
+    _queue: MemoryEmailQueue | DatabaseEmailQueue | None = None
+    _threads: list[threading.Thread] = []
+    _stop = threading.Event()
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_queue(cls):
+        if cls._queue is None:
+            with cls._lock:
+                if cls._queue is None:
+                    if mail_setting.EMAIL_QUEUE_BACKEND.lower() == "db":
+                        cls._queue = DatabaseEmailQueue(mail_setting.EMAIL_BATCH_SIZE)
+                    else:
+                        cls._queue = MemoryEmailQueue(mail_setting.EMAIL_QUEUE_MAX_SIZE)
+        return cls._queue
+
+    @classmethod
+    def send(
+        cls,
+        *,
+        to_email: str,
+        subject: str,
+        body: str,
+        html: bool = False,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Queue an email for background delivery.
+
+        `ttl`: seconds after which delivery is pointless (dead-lettered
+        instead). Raises EmailSendFailed if the in-memory queue is full.
+        """
+        cls.start()
+        cls._get_queue().put(EmailJob(
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            html=html,
+            expires_at=time.time() + ttl if ttl is not None else None,
+        ))
+        EmailMetrics.incr("enqueued")
+
+    @classmethod
+    def _deliver(cls, queue, provider, job: EmailJob) -> None:
+        if job.expired:
+            EmailMetrics.incr("expired")
+            queue.dead(job, error="expired before delivery")
+            return
+
+        queue_wait = time.time() - job.enqueued_at if job.attempts == 0 else 0.0
+        started = time.perf_counter()
+        try:
+            provider.send_email(job.to_email, job.subject, job.body, job.html)
+        except EmailRejected as e:
+            job.attempts += 1
+            EmailMetrics.incr("dead_lettered")
+            queue.dead(job, error=str(e))
+        except Exception as e:
+            job.attempts += 1
+            delay = mail_setting.EMAIL_RETRY_BACKOFF * 2 ** (job.attempts - 1) * random.uniform(0.5, 1.0)
+            out_of_time = job.expires_at is not None and time.time() + delay > job.expires_at
+            if job.attempts >= mail_setting.EMAIL_MAX_ATTEMPTS or out_of_time:
+                EmailMetrics.incr("dead_lettered")
+                queue.dead(job, error=str(e))
+            else:
+                EmailMetrics.incr("retried")
+                logger.warning(
+                    "Email to %s failed (%s), retry %d in %.1fs",
+                    job.to_email, e, job.attempts, delay,
+                )
+                queue.retry(job, error=str(e), delay=delay)
+        else:
+            queue.ack(job)
+            EmailMetrics.record_sent(
+                duration=time.perf_counter() - started,
+                queue_wait=queue_wait,
+            )
+
+    @classmethod
+    def _work(cls) -> None:
+        from services.email.factory import EmailProviderFactory
+
+        queue = cls._get_queue()
+        provider = EmailProviderFactory.get_provider()
+        while True:
+            try:
+                job = queue.get(timeout=0.5)
+            except Exception:
+                logger.exception("Email queue poll failed")
+                cls._stop.wait(POLL_INTERVAL)
+                continue
+
+            if job is None:
+                if cls._stop.is_set():
+                    return
+                continue
+
+            try:
+                cls._deliver(queue, provider, job)
+            except Exception:
+                # Queue bookkeeping failed; a db row comes back after its lease
+                logger.exception("Email dispatch failed for %s", job.to_email)
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._threads:
+            return
+        with cls._lock:
+            if cls._threads:
+                return
+            cls._stop.clear()
+            cls._threads = [
+                threading.Thread(target=cls._work, name=f"email-{i}", daemon=True)
+                for i in range(mail_setting.EMAIL_WORKERS)
+            ]
+            for thread in cls._threads:
+                thread.start()
+
+    @classmethod
+    def stop(cls, timeout: float = 5.0) -> None:
+        """Deliver what is ready (up to `timeout`), then close provider connections."""
+        from services.email.factory import EmailProviderFactory
+
+        with cls._lock:
+            threads, cls._threads = cls._threads, []
+        cls._stop.set()
+        if cls._queue is not None:
+            cls._queue.wake()
+
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+        if isinstance(cls._queue, MemoryEmailQueue) and cls._queue.depth():
+            logger.warning("Email dispatcher stopped with %d messages undelivered", cls._queue.depth())
+        EmailProviderFactory.close()
+
+    @classmethod
+    def metrics(cls) -> dict:
+        queue = cls._get_queue()
+        return {
+            "backend": mail_setting.EMAIL_QUEUE_BACKEND.lower(),
+            "workers": len(cls._threads),
+            "depth": queue.depth(),
+            **EmailMetrics.snapshot(),
+        }
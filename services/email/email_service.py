@@ -7,4 +7,8 @@ class EmailService(ABC):
             body: str,
             html: bool = False 
         ): 
-        pass
\ No newline at end of file
+        pass
+
+    def close(self) -> None:
+        """Release long-lived connections (dispatcher shutdown)."""
+        pass
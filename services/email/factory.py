@@ -0,0 +1,41 @@
+import threading
+
+from services.email.email_service import EmailService
+from core.config import mail_setting
+
+
+class EmailProviderFactory:
+    # One provider per process: its API client / SMTP connections are reused
+    _instance: EmailService | None = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_provider() -> EmailService:
+        if EmailProviderFactory._instance is not None:
+            return EmailProviderFactory._instance
+
+        with EmailProviderFactory._lock:
+            if EmailProviderFactory._instance is None:
+                EmailProviderFactory._instance = EmailProviderFactory._create()
+        return EmailProviderFactory._instance
+
+    @staticmethod
+    def _create() -> EmailService:
+        provider = mail_setting.EMAIL_PROVIDER.lower()
+
+        if provider == "brevo":
+            from services.email.brevo_provider import BrevoProvider
+            return BrevoProvider()
+
+        if provider == "smtp":
+            from services.email.smtpprovider import SmtpProvider
+            return SmtpProvider()
+
+        raise RuntimeError(f"Unsupported email provider: {provider}. Use 'brevo' or 'smtp'.")
+
+    @staticmethod
+    def close() -> None:
+        with EmailProviderFactory._lock:
+            instance, EmailProviderFactory._instance = EmailProviderFactory._instance, None
+        if instance is not None:
+            instance.close()
@@ -1,14 +1,83 @@
 from services.email.email_service import EmailService
 import smtplib
+import threading
+import time
 from email.message import EmailMessage
 from core.config import mail_setting
-from core.exceptions import EmailSendFailed
+from core.exceptions import EmailSendFailed, EmailRejected
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class SmtpProvider(EmailService):
+    """
+    SMTP provider with connection reuse.
+
+    Each dispatcher worker thread keeps its own authenticated connection
+    (smtplib objects are not thread-safe) and sends every message over it.
+    A connection idle for SMTP_IDLE_TIMEOUT is replaced rather than reused,
+    and one dropped by the server is reopened once per message.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._connections: set[smtplib.SMTP] = set()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        if mail_setting.SMTP_SSL:
+            server = smtplib.SMTP_SSL(
+                host=mail_setting.SMTP_HOST,
+                port=mail_setting.SMTP_PORT,
+                timeout=mail_setting.SMTP_TIMEOUT,
+            )
+        else:
+            server = smtplib.SMTP(
+                host=mail_setting.SMTP_HOST,
+                port=mail_setting.SMTP_PORT,
+                timeout=mail_setting.SMTP_TIMEOUT,
+            )
+            if mail_setting.SMTP_STARTTLS:
+                server.starttls()
+
+        # Local sinks take mail without authentication
+        if mail_setting.SMTP_USER and mail_setting.SMTP_PASS:
+            server.login(
+                mail_setting.SMTP_USER,
+                mail_setting.SMTP_PASS
+            )
+
+        with self._lock:
+            self._connections.add(server)
+        return server
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            self._connections.discard(server)
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _connection(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        last_used = getattr(self._local, "last_used", 0.0)
+
+        if server is not None and time.monotonic() - last_used > mail_setting.SMTP_IDLE_TIMEOUT:
+            self._discard(server)
+            server = None
+
+        if server is None:
+            server = self._connect()
+            self._local.server = server
+        return server
+
+    def _reset(self) -> None:
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            self._discard(server)
 
     def send_email(
         self,
@@ -19,7 +88,7 @@ class SmtpProvider(EmailService):
     ):
         msg = EmailMessage()
         msg["Subject"] = subject
-        msg["From"] = mail_setting.SMTP_USER
+        msg["From"] = mail_setting.SMTP_USER or mail_setting.EMAIL_FROM
         msg["To"] = to_email
 
         if html:
@@ -28,27 +97,43 @@ class SmtpProvider(EmailService):
             msg.set_content(body)
 
         try:
-            with smtplib.SMTP_SSL(
-                host="smtp.gmail.com",
-                port=465,
-                timeout=10
-            ) as server:
+            try:
+                self._connection().send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Server dropped the pooled connection: reconnect once
+                self._reset()
+                self._connection().send_message(msg)
+            self._local.last_used = time.monotonic()
 
-                server.login(
-                    mail_setting.SMTP_USER,
-                    mail_setting.SMTP_PASS
-                )
-
-                server.send_message(msg)
+        except smtplib.SMTPRecipientsRefused as e:
+            logger.error("SMTP recipient refused", exc_info=True)
+            raise EmailRejected("SMTP recipient refused") from e
 
         except smtplib.SMTPException as e:
+            self._reset()
             logger.error("SMTP error while sending email", exc_info=True)
             raise EmailSendFailed("SMTP error occurred") from e
 
         except TimeoutError as e:
+            self._reset()
             logger.error("SMTP connection timed out", exc_info=True)
             raise EmailSendFailed("Email sending timed out") from e
 
+        except OSError as e:
+            self._reset()
+            logger.error("SMTP server unreachable", exc_info=True)
+            raise EmailSendFailed("Email server unreachable") from e
+
         except Exception as e:
+            self._reset()
             logger.error("Unexpected error while sending email", exc_info=True)
             raise EmailSendFailed("Unexpected email error") from e
+
+    def close(self) -> None:
+        with self._lock:
+            servers, self._connections = self._connections, set()
+        for server in servers:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
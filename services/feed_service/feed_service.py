@@ -8,6 +8,7 @@ from models.student import Student
 from models.bookmark import Bookmark
 from services.storage.factory import StorageFactory
 from services.cache.redis_service import cache
+from db.session import release_connection
 
 class FeedService:
     @staticmethod
@@ -62,6 +63,9 @@ class FeedService:
             .all()
         )
 
+        # Rows are loaded - free the pool slot before signing URLs / writing Redis
+        release_connection(db)
+
         from services.storage.url_cache import StorageURLCache
         
         response_data = []
@@ -77,6 +81,7 @@ class FeedService:
                 "owner_id": doc.user_id,
                 "content": doc.content,
                 "content_type": doc.content_type,
+                "thumbnail_url": StorageURLCache.get_file_url(doc.thumbnail_key),
                 "like_count": l_cnt or 0,
                 "comment_count": c_cnt or 0,
                 "is_liked": False,  # Default, will be hydrated
@@ -9,6 +9,7 @@ from models.student import Student
 from models.bookmark import Bookmark
 from services.storage.factory import StorageFactory
 from services.cache.redis_service import cache
+from db.session import release_connection
 
 class FeedService:
     @staticmethod
@@ -65,6 +66,9 @@ class FeedService:
             .all()
         )
 
+        # Rows are loaded - free the pool slot before signing URLs / writing Redis
+        release_connection(db)
+
         # ------------------------------------------------------------------
         # RESULT FORMATTING
         # ------------------------------------------------------------------
@@ -88,6 +92,7 @@ class FeedService:
                 "comment_count": c_cnt or 0,
                 "content": doc.content,  
                 "content_type": doc.content_type,
+                "thumbnail_url": StorageURLCache.get_file_url(doc.thumbnail_key),
                 "like_count": l_cnt or 0,
                 "is_liked": bool(liked),
                 "is_bookmarked": bool(bookmarked),
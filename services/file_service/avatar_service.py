@@ -4,6 +4,8 @@ from models.user import User
 from models.student import Student
 from services.storage.factory import StorageFactory
 from services.storage.keys import profile_avatar_key
+from services.storage.deletion_queue import DeletionQueue
+from services.chat.sync_outbox import ChatSyncQueue
 from dependencies.helper import _validate_avatar_key
 from dependencies.content_type import _extension_from_content_type
 from core.exceptions import (
@@ -88,14 +90,18 @@ class AvatarService:
             old_avatar_key = student.profile_url
             student.profile_url = object_key
 
+        # Old avatar goes to the deletion outbox, committed with the swap
+        replaced = old_avatar_key and old_avatar_key != object_key
+        if replaced:
+            DeletionQueue.enqueue(db=db, object_keys=[old_avatar_key])
+        ChatSyncQueue.enqueue(db=db, user_id=current_user.id)
+
         db.commit()
         db.refresh(student)
 
-        if old_avatar_key and old_avatar_key != object_key:
-            try:
-                storage.delete_object(object_key=old_avatar_key)
-            except Exception:
-                pass
+        if replaced:
+            DeletionQueue.notify()
+        ChatSyncQueue.notify()
 
         return {
             "profile_url": student.profile_url,
@@ -112,15 +118,12 @@ class AvatarService:
         if not student or not student.profile_url:
             raise AvatarNotFound()
 
-        storage = StorageFactory.get_storage()
-
-        try:
-            storage.delete_object(object_key=student.profile_url)
-        except Exception:
-            pass
-
+        DeletionQueue.enqueue(db=db, object_keys=[student.profile_url])
+        ChatSyncQueue.enqueue(db=db, user_id=current_user.id)
         student.profile_url = None
         db.commit()
+        DeletionQueue.notify()
+        ChatSyncQueue.notify()
 
         return {
             "deleted": True,
@@ -0,0 +1,92 @@
+"""
+Content-addressed deduplication for document uploads.
+
+document_blobs maps the SHA-256 of a file to the object that stores it,
+with a count of the live documents referencing it. An upload whose hash is
+already indexed just takes another reference: nothing is sent to storage.
+The object is deleted only when its last document goes away.
+
+All counter changes run in the caller's transaction, so a failed request
+never leaves a reference behind. The caller commits, then does any storage
+work (upload cleanup, deletion).
+"""
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.document_blob import DocumentBlob
+
+
+class ContentIndex:
+    @staticmethod
+    def acquire(*, db: Session, sha256: str, size: int) -> str | None:
+        """
+        Take a reference on already stored content.
+
+        Returns the object key to reuse, or None if these bytes are not
+        stored yet. The row lock taken here makes a concurrent release wait,
+        so the object cannot be deleted underneath the new reference.
+        """
+        return db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256, DocumentBlob.size == size)
+            .values(ref_count=DocumentBlob.ref_count + 1)
+            .returning(DocumentBlob.object_key)
+        ).scalar()
+
+    @staticmethod
+    def register(
+        *,
+        db: Session,
+        sha256: str,
+        object_key: str,
+        size: int,
+        content_type: str,
+    ) -> str:
+        """
+        Index a freshly uploaded object with one reference.
+
+        If an identical upload registered first, a reference is taken on
+        that one instead and its key is returned: the caller should then
+        delete the object it just uploaded.
+        """
+        stmt = insert(DocumentBlob).values(
+            sha256=sha256,
+            object_key=object_key,
+            size=size,
+            content_type=content_type,
+            ref_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DocumentBlob.sha256],
+            set_={"ref_count": DocumentBlob.ref_count + 1},
+        ).returning(DocumentBlob.object_key)
+        return db.execute(stmt).scalar_one()
+
+    @staticmethod
+    def release(*, db: Session, sha256: str) -> str | None:
+        """
+        Drop one reference.
+
+        Returns the object key once nothing references it anymore (the
+        index row is removed and the caller deletes the object after
+        commit), otherwise None.
+        """
+        row = db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256)
+            .values(ref_count=DocumentBlob.ref_count - 1)
+            .returning(DocumentBlob.ref_count, DocumentBlob.object_key)
+        ).first()
+
+        if row is None or row.ref_count > 0:
+            return None
+
+        db.execute(delete(DocumentBlob).where(DocumentBlob.sha256 == sha256))
+        return row.object_key
+
+    @staticmethod
+    def is_indexed(*, db: Session, object_key: str) -> bool:
+        return db.query(DocumentBlob.sha256).filter(
+            DocumentBlob.object_key == object_key
+        ).first() is not None
@@ -1,3 +1,6 @@
+import base64
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 from services.storage.factory import StorageFactory
 
@@ -7,6 +10,7 @@ from core.exceptions import (
     DocumentNotFound,
     DocumentAccessDenied,
     DownloadUrlGenerationFailed,
+    InvalidCursor,
 )
 
 
@@ -68,6 +72,7 @@ class DocumentService:
                 "owner_avatar": owner_avatar,
                 "content": doc.content,
                 "object_key": doc.object_key,
+                "preview_key": doc.preview_key,
                 "like_count": like_cnt or 0,
                 "comment_count": comm_cnt or 0,
             }
@@ -103,8 +108,13 @@ class DocumentService:
                     expires_in=3600, # 1 hour for detailed view
                 )
                 
-                # Preview URL (first page for PDFs)
-                if doc_static["doc_type"] == "pdf":
+                # Preview URL: rendered variant when ready, else first page for PDFs
+                if doc_static.get("preview_key"):
+                    preview_url = storage.generate_download_url(
+                        object_key=doc_static["preview_key"],
+                        expires_in=3600,
+                    )
+                elif doc_static["doc_type"] == "pdf":
                     preview_url = storage.generate_download_url(
                         object_key=doc_static["object_key"],
                         expires_in=3600,
@@ -127,3 +137,120 @@ class DocumentService:
             "is_bookmarked": is_bookmarked,
             "is_owner": bool(current_user and current_user.id == doc_static["owner_id"]),
         }
+
+    @staticmethod
+    def _encode_cursor(created_at, document_id: int) -> str:
+        raw = f"{created_at.isoformat()}|{document_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, document_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(document_id)
+        except Exception:
+            raise InvalidCursor()
+
+    @staticmethod
+    def list_my_documents(
+        *,
+        db: Session,
+        current_user: User,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> dict:
+        """
+        Keyset-paginated listing of the current user's documents.
+
+        Every page costs exactly one SELECT: like counts and is_liked are
+        computed in SQL, the owner's Student row is joined once and the
+        avatar is resolved a single time per page (the owner is constant).
+        """
+        from sqlalchemy import func, case, tuple_
+        from models.student import Student
+        from models.likes import Like
+
+        limit = min(limit, 50)
+
+        like_sq = (
+            db.query(func.count(Like.id))
+            .filter(Like.document_id == Document.id)
+            .correlate(Document)
+            .scalar_subquery()
+        )
+        liked_exists = (
+            db.query(Like.id)
+            .filter(Like.document_id == Document.id, Like.user_id == current_user.id)
+            .correlate(Document)
+            .exists()
+        )
+        is_liked = case((liked_exists, True), else_=False).label("is_liked")
+
+        query = (
+            db.query(Document, Student, like_sq, is_liked)
+            .outerjoin(Student, Student.user_id == Document.user_id)
+            .filter(
+                Document.user_id == current_user.id,
+                Document.is_deleted.is_(False),
+            )
+        )
+
+        if cursor:
+            cursor_created_at, cursor_id = DocumentService._decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Document.created_at, Document.id) < tuple_(cursor_created_at, cursor_id)
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows = (
+            query
+            .order_by(Document.created_at.desc(), Document.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Owner avatar: same student on every row -> resolve once
+        student = rows[0][1] if rows else None
+        owner_avatar = None
+        if student and student.profile_url:
+            try:
+                storage = StorageFactory.get_storage()
+                owner_avatar = storage.generate_download_url(
+                    object_key=student.profile_url,
+                    expires_in=31536000,
+                )
+            except Exception:
+                pass
+
+        items = []
+        for d, _, like_count, liked in rows:
+            items.append({
+                "id": d.id,
+                "title": d.title,
+                "doc_type": d.doc_type,
+                "visibility": d.visibility,
+                "file_size": d.file_size,
+                "content": d.content,
+                "created_at": d.created_at,
+                "owner_id": d.user_id,
+                "owner_name": student.name if student else None,
+                "owner_email": current_user.email,
+                "owner_avatar": owner_avatar,
+                "like_count": like_count or 0,
+                "is_liked": bool(liked),
+                "is_owner": True,  # Always true for this endpoint
+            })
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1][0]
+            next_cursor = DocumentService._encode_cursor(last.created_at, last.id)
+
+        return {
+            "items": items,
+            "next_cursor": next_cursor,
+        }
@@ -0,0 +1,75 @@
+"""
+CPU-bound rendering for document thumbnails.
+
+Runs inside the thumbnail process pool, so this module must stay free of
+app imports (settings, DB, Redis): worker processes import only this file.
+"""
+import io
+
+# variant name -> target width in pixels
+VARIANTS = {
+    "thumb": 320,
+    "preview": 1024,
+}
+
+WEBP_QUALITY = 80
+MAX_ASPECT = 3  # taller pages/images are cropped to width * 3
+
+
+def _encode(image, width: int) -> bytes:
+    from PIL import Image
+
+    if image.width > width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    if image.height > image.width * MAX_ASPECT:
+        image = image.crop((0, 0, image.width, image.width * MAX_ASPECT))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def _open_pdf_first_page(path: str, width: int):
+    import fitz  # PyMuPDF
+    from PIL import Image
+
+    with fitz.open(path) as pdf:
+        if pdf.page_count == 0:
+            raise ValueError("PDF has no pages")
+        page = pdf[0]
+        zoom = width / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+
+def _open_image(path: str):
+    from PIL import Image, ImageOps
+
+    image = Image.open(path)
+    image.draft("RGB", (max(VARIANTS.values()), max(VARIANTS.values())))  # JPEG: decode downscaled
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+
+def render_variants(path: str, content_type: str) -> dict[str, bytes]:
+    """
+    Render every variant of the file at `path` as WebP.
+
+    PDFs: first page rasterized once at the largest width, then scaled down.
+    Images: decoded once, EXIF orientation applied, then scaled down.
+    """
+    if content_type == "application/pdf":
+        source = _open_pdf_first_page(path, max(VARIANTS.values()))
+    elif content_type.startswith("image/"):
+        source = _open_image(path)
+    else:
+        raise ValueError(f"No renderer for {content_type}")
+
+    return {name: _encode(source, width) for name, width in VARIANTS.items()}
+
+
+def can_render(content_type: str | None) -> bool:
+    return bool(content_type) and (
+        content_type == "application/pdf" or content_type.startswith("image/")
+    )
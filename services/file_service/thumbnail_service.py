@@ -0,0 +1,160 @@
+"""
+Background thumbnail pipeline.
+
+After a document is committed, ThumbnailService.schedule() queues it:
+  1. the source object is fetched from storage into a temp file,
+  2. variants are rendered in a process pool (CPU-bound, off the GIL),
+  3. the WebP results are uploaded through the Storage abstraction and
+     their keys recorded on the document (thumbnail_key, preview_key).
+
+Orchestration (I/O) runs on a small thread pool; rendering on
+THUMBNAIL_WORKERS processes. Nothing here blocks a request: failures are
+logged and the document simply has no thumbnail.
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from core.config import storage_setting
+from services.file_service.thumbnail_render import can_render, render_variants
+
+logger = logging.getLogger(__name__)
+
+RENDER_TIMEOUT = 60  # seconds per document
+
+
+class ThumbnailService:
+    _lock = threading.Lock()
+    _threads: ThreadPoolExecutor | None = None
+    _processes: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def _executors(cls) -> tuple[ThreadPoolExecutor, ProcessPoolExecutor]:
+        if cls._threads is None:
+            with cls._lock:
+                if cls._threads is None:
+                    # spawn: forking a threaded server process is unsafe
+                    cls._processes = ProcessPoolExecutor(
+                        max_workers=storage_setting.THUMBNAIL_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    cls._threads = ThreadPoolExecutor(
+                        max_workers=storage_setting.THUMBNAIL_WORKERS,
+                        thread_name_prefix="thumbnails",
+                    )
+        return cls._threads, cls._processes
+
+    @classmethod
+    def schedule(cls, *, document_id: int, content_type: str | None) -> None:
+        """Queue thumbnail generation for a committed document (non-blocking)."""
+        if not storage_setting.THUMBNAILS_ENABLED or not can_render(content_type):
+            return
+        threads, _ = cls._executors()
+        threads.submit(cls._run, document_id)
+
+    @classmethod
+    def _run(cls, document_id: int) -> None:
+        try:
+            cls.generate(document_id=document_id)
+        except Exception:
+            logger.exception("Thumbnail generation failed for document %s", document_id)
+
+    @classmethod
+    def generate(cls, *, document_id: int) -> dict | None:
+        """Render, store and record the variants of one document. Returns their keys."""
+        from db.session import SessionLocal, release_connection
+        from models.document import Document
+        from services.storage.deletion_queue import DeletionQueue
+        from services.storage.factory import StorageFactory
+        from services.storage.keys import document_variant_key
+
+        with SessionLocal() as db:
+            doc = (
+                db.query(Document.object_key, Document.content_type, Document.thumbnail_key)
+                .filter(Document.id == document_id, Document.is_deleted.is_(False))
+                .first()
+            )
+            if not doc or not doc.object_key or doc.thumbnail_key or not can_render(doc.content_type):
+                return None
+
+            # Deduplicated content: variants already rendered for the same object
+            rendered = (
+                db.query(Document.thumbnail_key, Document.preview_key)
+                .filter(
+                    Document.object_key == doc.object_key,
+                    Document.thumbnail_key.isnot(None),
+                )
+                .first()
+            )
+            release_connection(db)
+
+            if rendered:
+                keys = {"thumb": rendered.thumbnail_key, "preview": rendered.preview_key}
+            else:
+                keys = cls._render_and_store(
+                    storage=StorageFactory.get_storage(),
+                    object_key=doc.object_key,
+                    content_type=doc.content_type,
+                    key_for=document_variant_key,
+                )
+
+            recorded = (
+                db.query(Document)
+                .filter(Document.id == document_id, Document.is_deleted.is_(False))
+                .update(
+                    {"thumbnail_key": keys["thumb"], "preview_key": keys["preview"]},
+                    synchronize_session=False,
+                )
+            )
+            if not recorded:
+                # Deleted while rendering. Variants go with their source object:
+                # the ones just uploaded are orphaned unless a live document still
+                # shares the object (reused keys belong to another document)
+                orphaned = not rendered and not (
+                    db.query(Document.id)
+                    .filter(Document.object_key == doc.object_key, Document.is_deleted.is_(False))
+                    .first()
+                )
+                if orphaned:
+                    DeletionQueue.enqueue(db=db, object_keys=keys.values())
+                db.commit()
+                if orphaned:
+                    DeletionQueue.notify()
+                return None
+            db.commit()
+
+        from services.cache.cache_manager import CacheManager
+        CacheManager.invalidate_document(document_id)
+        print(f"🖼️ Thumbnails ready for document {document_id}")
+        return keys
+
+    @classmethod
+    def _render_and_store(cls, *, storage, object_key: str, content_type: str, key_for) -> dict:
+        _, processes = cls._executors()
+        suffix = os.path.splitext(object_key)[1]
+
+        with tempfile.NamedTemporaryFile(suffix=suffix) as source:
+            storage.download_file(object_key=object_key, destination=source)
+            source.flush()
+            variants = processes.submit(render_variants, source.name, content_type).result(
+                timeout=RENDER_TIMEOUT
+            )
+
+        keys = {}
+        for name, data in variants.items():
+            keys[name] = key_for(object_key=object_key, variant=name)
+            storage.upload_file(object_key=keys[name], file_content=data, content_type="image/webp")
+        return keys
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            threads, processes = cls._threads, cls._processes
+            cls._threads = cls._processes = None
+        if threads is not None:
+            threads.shutdown(wait=False, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,143 @@
+"""
+Chunked reading of uploads.
+
+Starlette spools each UploadFile to a SpooledTemporaryFile (memory up to
+1 MB, disk beyond). Reading it back with `await file.read()` copies the
+whole document into memory; here it is consumed in fixed-size chunks
+instead - size limit, SHA-256 and type sniffing happen on the fly - and
+the spooled file itself is handed to the storage backend, so memory per
+upload stays bounded by the chunk size.
+
+Resumable uploads use the same building blocks: each chunk's request body
+is spooled the same way (spool_request_body), and the stored chunks are
+re-assembled into a temp file through a HashingWriter.
+"""
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from fastapi import Request, UploadFile
+
+from core.exceptions import DocumentTooLarge, InvalidUploadChunk, UnsupportedDocumentType
+
+
+CHUNK_SIZE = 256 * 1024
+SPOOL_MAX_MEMORY = 1024 * 1024  # same as Starlette's UploadFile
+
+# (magic prefix, offset, content type)
+_SIGNATURES = (
+    (b"%PDF-", 0, "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png"),
+    (b"\xff\xd8\xff", 0, "image/jpeg"),
+    (b"WEBP", 8, "image/webp"),
+)
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """Detect the document type from its first bytes (None if unknown)."""
+    for magic, offset, content_type in _SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            if content_type == "image/webp" and not head.startswith(b"RIFF"):
+                continue
+            return content_type
+
+    if head and b"\x00" not in head:
+        try:
+            # A multi-byte character may be cut at the chunk boundary
+            head.decode("utf-8")
+            return "text/plain"
+        except UnicodeDecodeError as e:
+            if e.start >= len(head) - 3:
+                return "text/plain"
+    return None
+
+
+@dataclass
+class StreamedUpload:
+    file: BinaryIO          # rewound, ready to be streamed to storage
+    size: int
+    sha256: str
+    content_type: str       # sniffed, not client-declared
+    filename: str | None
+
+
+async def read_upload(upload: UploadFile, *, max_size: int, chunk_size: int = CHUNK_SIZE) -> StreamedUpload:
+    """
+    Consume an UploadFile chunk by chunk.
+
+    Raises DocumentTooLarge as soon as more than `max_size` bytes were
+    read, and UnsupportedDocumentType when the content matches no
+    supported type.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+
+        if content_type is None:
+            content_type = sniff_content_type(chunk)
+            if content_type is None:
+                raise UnsupportedDocumentType()
+
+        size += len(chunk)
+        if size > max_size:
+            raise DocumentTooLarge()
+        digest.update(chunk)
+
+    if size == 0:
+        raise UnsupportedDocumentType("Empty file")
+
+    await upload.seek(0)
+    return StreamedUpload(
+        file=upload.file,
+        size=size,
+        sha256=digest.hexdigest(),
+        content_type=content_type,
+        filename=upload.filename,
+    )
+
+
+async def spool_request_body(request: Request, *, max_size: int):
+    """
+    Spool a raw request body (memory up to 1 MB, disk beyond).
+
+    Returns (rewound file, size). Raises InvalidUploadChunk as soon as more
+    than `max_size` bytes arrive; the caller closes the file.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    size = 0
+    try:
+        async for piece in request.stream():
+            size += len(piece)
+            if size > max_size:
+                raise InvalidUploadChunk(f"Chunk larger than {max_size} bytes")
+            spool.write(piece)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, size
+
+
+class HashingWriter:
+    """Write-through file wrapper counting bytes and computing SHA-256"""
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.size = 0
+        self._digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        self._digest.update(data)
+        return self.file.write(data)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
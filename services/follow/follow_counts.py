@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, or_, select
+
+from models.follow import Follow
+from models.user import User
+
+
+class FollowCounters:
+    """
+    Maintains the denormalized users.followers_count / users.following_count
+    columns. Callers run these inside the same transaction as the follows
+    row change, so counters and rows commit (or roll back) together.
+    """
+
+    @staticmethod
+    def apply(
+        *,
+        db: Session,
+        follower_id: int,
+        following_id: int,
+        delta: int,
+    ) -> None:
+        """Shift both counters by delta in a single UPDATE (one round trip)."""
+        db.query(User).filter(
+            User.id.in_([follower_id, following_id])
+        ).update(
+            {
+                User.followers_count: func.greatest(
+                    User.followers_count
+                    + case((User.id == following_id, delta), else_=0),
+                    0,
+                ),
+                User.following_count: func.greatest(
+                    User.following_count
+                    + case((User.id == follower_id, delta), else_=0),
+                    0,
+                ),
+            },
+            synchronize_session=False,
+        )
+
+    @staticmethod
+    def get_counts(*, db: Session, user_id: int) -> tuple[int, int]:
+        """Return (followers_count, following_count) in O(1)."""
+        row = (
+            db.query(User.followers_count, User.following_count)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not row:
+            return 0, 0
+        return row.followers_count or 0, row.following_count or 0
+
+    @staticmethod
+    def reconcile(*, db: Session) -> int:
+        """
+        Recompute every counter from the follows table and fix drifted rows
+        (e.g. after users were deleted and their follows cascaded away).
+
+        Returns the number of users that were corrected.
+        """
+        followers_sq = (
+            select(func.count(Follow.id))
+            .where(Follow.following_id == User.id)
+            .correlate(User)
+            .scalar_subquery()
+        )
+        following_sq = (
+            select(func.count(Follow.id))
+            .where(Follow.follower_id == User.id)
+            .correlate(User)
+            .scalar_subquery()
+        )
+
+        fixed = (
+            db.query(User)
+            .filter(
+                or_(
+                    User.followers_count != followers_sq,
+                    User.following_count != following_sq,
+                )
+            )
+            .update(
+                {
+                    User.followers_count: followers_sq,
+                    User.following_count: following_sq,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return fixed
@@ -5,6 +5,7 @@ from models.follow import Follow
 from models.user import User
 from core.exceptions import CannotFollowYourself, UserNotFound
 from services.cache.redis_service import cache
+from services.follow.follow_counts import FollowCounters
 
 
 class FollowService:
@@ -30,6 +31,15 @@ class FollowService:
                 following_id=target_user_id,
             )
             db.add(follow)
+            db.flush()  # Raises IntegrityError before counters move
+
+            # Counters commit atomically with the follows row
+            FollowCounters.apply(
+                db=db,
+                follower_id=current_user.id,
+                following_id=target_user_id,
+                delta=1,
+            )
             db.commit()
 
             # Invalidate cache
@@ -37,6 +47,7 @@ class FollowService:
             cache.delete(f"user_profile_static:{current_user.id}")
             cache.delete_pattern(f"user:followers:{target_user_id}:*")
             cache.delete_pattern(f"user:following:{current_user.id}:*")
+            cache.delete(f"follow_status:{target_user_id}:{current_user.id}")
             
             # Clear user state cache
             from services.cache.user_state import UserStateCache
@@ -4,6 +4,7 @@ from models.follow import Follow
 from models.user import User
 from core.exceptions import CannotFollowYourself, UserNotFound, NotFollowing
 from services.cache.redis_service import cache
+from services.follow.follow_counts import FollowCounters
 
 
 class UnFollowService:
@@ -22,23 +23,31 @@ class UnFollowService:
         if not target_user:
             raise UserNotFound()
 
-        follow = (
+        # Atomic unfollow: the DELETE rowcount decides, so two concurrent
+        # unfollows can never decrement the counters twice
+        deleted = (
             db.query(Follow)
             .filter(
                 Follow.follower_id == current_user.id,
                 Follow.following_id == target_user_id,
             )
-            .first()
+            .delete(synchronize_session=False)
         )
 
-        if not follow:
+        if not deleted:
             return {
                 "unfollowed": False,
                 "already_unfollowed": True,
-                "followers_count": db.query(Follow).filter(Follow.following_id == target_user_id).count(),
+                "followers_count": target_user.followers_count,
             }
 
-        db.delete(follow)
+        # Counters commit atomically with the follows row
+        FollowCounters.apply(
+            db=db,
+            follower_id=current_user.id,
+            following_id=target_user_id,
+            delta=-1,
+        )
         db.commit()
 
         # Invalidate cache
@@ -46,6 +55,7 @@ class UnFollowService:
         cache.delete(f"user_profile_static:{current_user.id}")
         cache.delete_pattern(f"user:followers:{target_user_id}:*")
         cache.delete_pattern(f"user:following:{current_user.id}:*")
+        cache.delete(f"follow_status:{target_user_id}:{current_user.id}")
         
         # Clear user state cache
         from services.cache.user_state import UserStateCache
@@ -54,5 +64,5 @@ class UnFollowService:
         return {
             "unfollowed": True,
             "already_unfollowed": False,
-            "followers_count": db.query(Follow).filter(Follow.following_id == target_user_id).count(),
+            "followers_count": FollowCounters.get_counts(db=db, user_id=target_user_id)[0],
         }
@@ -0,0 +1,218 @@
+"""
+Sliding-window rate limiter.
+
+Each (policy, identity) pair keeps one counter per fixed window; the
+sliding estimate is `previous * overlap + current`, where `overlap` is the
+fraction of the previous window still inside the sliding window. This is
+the Cloudflare-style approximation: two integers per key, no timestamps.
+
+Accounting lives in Redis (one EVAL per request, shared by all workers).
+Two in-process shortcuts keep hot keys off the network:
+  - a key that was just denied stays blocked locally for up to
+    LOCAL_BLOCK_SECONDS, so a client hammering a limited route costs no
+    Redis round trips;
+  - without Redis the same algorithm runs on in-process counters, so
+    limits still apply per worker.
+"""
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from core.config import rate_limit_setting
+from services.cache.redis_service import cache
+
+
+LOCAL_BLOCK_SECONDS = 1.0
+LOCAL_MAX_KEYS = 10000
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    limit: int
+    window: int  # seconds
+
+    @property
+    def header(self) -> str:
+        return f"{self.limit};w={self.window}"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the current window ends
+    policy: RateLimitPolicy
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": self.policy.header,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.reset)
+        return headers
+
+
+POLICIES = {
+    # Applied by RateLimitMiddleware to every request
+    "default": RateLimitPolicy("default", rate_limit_setting.RATE_LIMIT_DEFAULT_PER_MINUTE, 60),
+    # Route policies (see dependencies.rate_limit)
+    "otp_request": RateLimitPolicy("otp_request", 5, 600),
+    "otp_verify": RateLimitPolicy("otp_verify", 10, 300),
+    "search": RateLimitPolicy("search", 30, 60),
+    "like_toggle": RateLimitPolicy("like_toggle", 60, 60),
+    "bookmark_toggle": RateLimitPolicy("bookmark_toggle", 60, 60),
+}
+
+
+# KEYS: current window, previous window | ARGV: limit, ttl, overlap
+# Returns {allowed, current, previous}; a denied request is not counted.
+_SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[3]) + current + 1 > tonumber(ARGV[1]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return {1, current, previous}
+"""
+
+
+class RateLimiter:
+    _lock = threading.Lock()
+    # window key -> (count, time after which it is no longer the previous window)
+    _local_counts: dict[str, tuple[int, float]] = {}
+    _blocked_until: dict[str, float] = {}
+
+    @staticmethod
+    def _result(policy: RateLimitPolicy, allowed: bool, current: int, previous: int, overlap: float, reset: int) -> RateLimitResult:
+        used = math.floor(previous * overlap) + current
+        return RateLimitResult(
+            allowed=allowed,
+            limit=policy.limit,
+            remaining=max(policy.limit - used, 0) if allowed else 0,
+            reset=max(reset, 1),
+            policy=policy,
+        )
+
+    @classmethod
+    def _evict_local(cls, now: float) -> None:
+        """Make room in _local_counts (caller holds the lock)."""
+        # Windows older than the previous one no longer count towards anything
+        for key in [key for key, (_, expires) in cls._local_counts.items() if expires <= now]:
+            del cls._local_counts[key]
+        # Still full of live windows: drop the oldest tenth (dicts keep insertion order)
+        overflow = len(cls._local_counts) - LOCAL_MAX_KEYS
+        if overflow > 0:
+            stale = list(itertools.islice(cls._local_counts, overflow + LOCAL_MAX_KEYS // 10))
+            for key in stale:
+                del cls._local_counts[key]
+
+    @classmethod
+    def _hit_local(cls, current_key: str, previous_key: str, policy: RateLimitPolicy, overlap: float, expires: float) -> tuple[bool, int, int]:
+        with cls._lock:
+            if len(cls._local_counts) > LOCAL_MAX_KEYS:
+                cls._evict_local(time.time())
+            current = cls._local_counts.get(current_key, (0, expires))[0]
+            previous = cls._local_counts.get(previous_key, (0, 0.0))[0]
+            if previous * overlap + current + 1 > policy.limit:
+                return False, current, previous
+            cls._local_counts[current_key] = (current + 1, expires)
+            return True, current + 1, previous
+
+    @classmethod
+    def hit(cls, policy: RateLimitPolicy, identity: str) -> RateLimitResult:
+        """Count one request for `identity` under `policy`."""
+        now = time.time()
+        window_index = int(now // policy.window)
+        elapsed = now - window_index * policy.window
+        overlap = 1 - elapsed / policy.window
+        reset = math.ceil(policy.window - elapsed)
+
+        base = f"rl:{policy.name}:{identity}"
+        current_key = f"{base}:{window_index}"
+        previous_key = f"{base}:{window_index - 1}"
+
+        # Fast path: recently denied -> deny without a round trip
+        blocked_until = cls._blocked_until.get(base)
+        if blocked_until and blocked_until > now:
+            return cls._result(policy, False, policy.limit, 0, overlap, reset)
+
+        result = None
+        if cache._client:
+            try:
+                allowed, current, previous = cache._client.eval(
+                    _SLIDING_WINDOW_SCRIPT,
+                    keys=[current_key, previous_key],
+                    args=[str(policy.limit), str(policy.window * 2), f"{overlap:.4f}"],
+                )
+                result = (bool(allowed), int(current), int(previous))
+            except Exception as e:
+                print(f"Rate limit Redis error (falling back to local): {e}")
+
+        if result is None:
+            # The current window still counts as the previous one until two windows from its start
+            expires = (window_index + 2) * policy.window
+            result = cls._hit_local(current_key, previous_key, policy, overlap, expires)
+
+        allowed, current, previous = result
+        if not allowed:
+            with cls._lock:
+                if len(cls._blocked_until) > LOCAL_MAX_KEYS:
+                    for key in [key for key, until in cls._blocked_until.items() if until <= now]:
+                        del cls._blocked_until[key]
+                cls._blocked_until[base] = now + min(LOCAL_BLOCK_SECONDS, reset)
+
+        return cls._result(policy, allowed, current, previous, overlap, reset)
+
+
+def client_ip(request) -> str:
+    """
+    The client address as seen by the first trusted proxy.
+
+    X-Forwarded-For entries left of the ones our TRUSTED_PROXY_HOPS proxies
+    appended are whatever the client sent, so only the entry written by the
+    outermost trusted proxy is used; without trusted proxies (or when the
+    chain is shorter than expected) the socket peer is.
+    """
+    peer = request.client.host if request.client else "unknown"
+    hops = rate_limit_setting.TRUSTED_PROXY_HOPS
+    if hops <= 0:
+        return peer
+
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if len(forwarded) < hops:
+        return peer
+    return forwarded[-hops]
+
+
+def request_identity(request) -> str:
+    """
+    Who a request is accounted to: the user id of a valid access token,
+    otherwise the client IP (see client_ip).
+    """
+    authorization = request.headers.get("authorization")
+    if authorization and authorization.startswith("Bearer "):
+        token = authorization.split(" ")[1]
+    else:
+        token = request.cookies.get("access_token")
+
+    if token:
+        from services.auth.jwt import decode_token
+        try:
+            payload = decode_token(token)
+            if payload.get("typ") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except Exception:
+            pass
+
+    return f"ip:{client_ip(request)}"
@@ -0,0 +1,62 @@
+import anyio
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from core.exceptions import RateLimitExceeded
+from services.rate_limit.limiter import RateLimiter, RateLimitPolicy, request_identity
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying one global policy per identity.
+
+    Route-specific limits are declared with the `rate_limit` dependency;
+    when a route sets its own RateLimit-* headers they take precedence.
+    """
+
+    EXEMPT_PATHS = {"/", "/health", "/docs", "/redoc", "/openapi.json"}
+    # Operational endpoints, guarded by require_metrics_access instead
+    EXEMPT_PREFIXES = ("/metrics/",)
+
+    def __init__(self, app, policy: RateLimitPolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in self.EXEMPT_PATHS
+            or scope["path"].startswith(self.EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        identity = request_identity(Request(scope))
+        # Redis client is synchronous - keep the round trip off the event loop
+        result = await anyio.to_thread.run_sync(RateLimiter.hit, self.policy, identity)
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                headers=result.headers(),
+                content={
+                    "detail": RateLimitExceeded.default_message,
+                    "error_code": "rate_limit_exceeded",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        limit_headers = result.headers()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "ratelimit-limit" not in headers:
+                    for name, value in limit_headers.items():
+                        headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
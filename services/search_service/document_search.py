@@ -1,49 +1,47 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func, literal, case
+from sqlalchemy import or_, func
 from models.document import Document
 from models.user import User
 from models.student import Student
 from models.comments import Comment
 from models.likes import Like
-from models.bookmark import Bookmark
 from services.storage.factory import StorageFactory
 from services.cache.redis_service import cache
-import json
 
-class DocumentSearchService:
 
-    @staticmethod
-    def search_documents(
-        *,
-        db: Session,
-        query: str,
-        current_user: User | None,
-        limit: int = 20,
-        offset: int = 0,
-    ):
+SEARCH_CACHE_TTL = 60
 
-        if not query or len(query.strip()) < 2:
-            return []
 
-        limit = min(limit, 50)
-        query_str = query.strip().lower()
+class DocumentSearchService:
 
-        # ------------------------------------------------------------------
-        # REDIS CACHE (Public Only)
-        # ------------------------------------------------------------------
-        cache_key = f"search:docs:{query_str}:{offset}:{limit}"
-        use_cache = current_user is None
-        
-        if use_cache:
-            cached_results = cache.get(cache_key)
-            if cached_results:
-                return cached_results
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """
+        Normalize the query once and use it for BOTH the cache key and the
+        ILIKE filter. ILIKE is case-insensitive, so lowercasing never changes
+        the matched rows, while stripping keeps " ml" and "ml" on one key
+        AND one result set.
+        """
+        return query.strip().lower()
 
-        # ------------------------------------------------------------------
-        # OPTIMIZATION: Subqueries for Counts and Status
-        # ------------------------------------------------------------------
-        
-        # 1. Comment Count
+    @staticmethod
+    def _fetch_documents(
+        *,
+        db: Session,
+        query_str: str,
+        limit: int,
+        offset: int,
+        owner_id: int | None = None,
+    ) -> list[dict]:
+        """
+        Run the user-independent part of the search.
+
+        owner_id=None  -> public documents (shared by every caller)
+        owner_id=<id>  -> that user's own private documents
+
+        is_liked / is_bookmarked are always False here; they are hydrated
+        per request so the result set can be cached and shared.
+        """
         comment_count_sq = (
             db.query(func.count(Comment.id))
             .filter(Comment.document_id == Document.id)
@@ -52,7 +50,6 @@ class DocumentSearchService:
             .label("comment_count")
         )
 
-        # 2. Like Count
         like_count_sq = (
             db.query(func.count(Like.id))
             .filter(Like.document_id == Document.id)
@@ -61,73 +58,29 @@ class DocumentSearchService:
             .label("like_count")
         )
 
-        # 3. Is Liked & Is Bookmarked (If User Logged In)
-        is_liked_col = literal(False).label("is_liked")
-        is_bookmarked_col = literal(False).label("is_bookmarked")
-
-        if current_user:
-            is_liked_sq = (
-                db.query(Like.id)
-                .filter(
-                    Like.user_id == current_user.id,
-                    Like.document_id == Document.id
-                )
-                .correlate(Document)
-                .exists()
-            )
-            is_liked_col = case((is_liked_sq, True), else_=False).label("is_liked")
-
-            is_bookmarked_sq = (
-                db.query(Bookmark.id)
-                .filter(
-                    Bookmark.user_id == current_user.id,
-                    Bookmark.document_id == Document.id
-                )
-                .correlate(Document)
-                .exists()
-            )
-            is_bookmarked_col = case((is_bookmarked_sq, True), else_=False).label("is_bookmarked")
-
-        # Base Query
         base_query = (
-            db.query(
-                Document, 
-                Student, 
-                comment_count_sq,
-                like_count_sq,
-                is_liked_col,
-                is_bookmarked_col
-            )
+            db.query(Document, Student, comment_count_sq, like_count_sq)
             .outerjoin(Student, Student.user_id == Document.user_id)
             .filter(
                 Document.is_deleted.is_(False),
                 or_(
-                    Document.title.ilike(f"%{query}%"),
-                    Document.doc_type.ilike(f"%{query}%"),
+                    Document.title.ilike(f"%{query_str}%"),
+                    Document.doc_type.ilike(f"%{query_str}%"),
                 ),
             )
         )
 
-        # Visibility Filter
-        if current_user:
-            base_query = base_query.filter(
-                or_(
-                    Document.visibility == "public",
-                    and_(
-                        Document.visibility == "private",
-                        Document.user_id == current_user.id,
-                    ),
-                )
-            )
+        if owner_id is None:
+            base_query = base_query.filter(Document.visibility == "public")
         else:
             base_query = base_query.filter(
-                Document.visibility == "public"
+                Document.visibility == "private",
+                Document.user_id == owner_id,
             )
 
-        # Execution
         documents = (
             base_query
-            .order_by(Document.created_at.desc())
+            .order_by(Document.created_at.desc(), Document.id.desc())
             .offset(offset)
             .limit(limit)
             .all()
@@ -136,7 +89,7 @@ class DocumentSearchService:
         storage = StorageFactory.get_storage()
         results = []
 
-        for doc, student, comment_count, like_count, is_liked, is_bookmarked in documents:
+        for doc, student, comment_count, like_count in documents:
             # Handle owner avatar
             owner_avatar = None
             if student and student.profile_url:
@@ -160,12 +113,100 @@ class DocumentSearchService:
                 "owner_avatar": owner_avatar,
                 "comment_count": comment_count or 0,
                 "like_count": like_count or 0,
-                "is_liked": bool(is_liked),
-                "is_bookmarked": bool(is_bookmarked),
+                "is_liked": False,  # Default, will be hydrated
+                "is_bookmarked": False,  # Default, will be hydrated
             })
 
-        # Set Cache
-        if use_cache:
-            cache.set(cache_key, results, ttl=60)
+        return results
+
+    @staticmethod
+    def _cached_fetch(*, db: Session, cache_key: str, **kwargs) -> list[dict]:
+        cached_results = cache.get(cache_key)
+        # Empty result sets are cached too (most users have no private matches)
+        if cached_results is not None:
+            return cached_results
+
+        results = DocumentSearchService._fetch_documents(db=db, **kwargs)
+        cache.set(cache_key, results, ttl=SEARCH_CACHE_TTL)
+        return results
+
+    @staticmethod
+    def search_documents(
+        *,
+        db: Session,
+        query: str,
+        current_user: User | None,
+        limit: int = 20,
+        offset: int = 0,
+    ):
+
+        if not query or len(query.strip()) < 2:
+            return []
+
+        limit = min(limit, 50)
+        query_str = DocumentSearchService._normalize_query(query)
+
+        # ------------------------------------------------------------------
+        # 1. SHARED BASE CACHE (public documents, no user-specific data)
+        # ------------------------------------------------------------------
+        if current_user is None:
+            return DocumentSearchService._cached_fetch(
+                db=db,
+                cache_key=f"search:docs:public:{query_str}:{offset}:{limit}",
+                query_str=query_str,
+                limit=limit,
+                offset=offset,
+            )
+
+        # ------------------------------------------------------------------
+        # 2. USER'S OWN PRIVATE MATCHES (per-user cache)
+        # ------------------------------------------------------------------
+        # Both streams are ordered by created_at DESC, so the first
+        # (offset + limit) rows of each are enough to build the merged page.
+        window = offset + limit
+
+        private_results = DocumentSearchService._cached_fetch(
+            db=db,
+            cache_key=f"search:docs:private:{current_user.id}:{query_str}:{window}",
+            query_str=query_str,
+            limit=window,
+            offset=0,
+            owner_id=current_user.id,
+        )
+
+        if private_results:
+            public_results = DocumentSearchService._cached_fetch(
+                db=db,
+                cache_key=f"search:docs:public:{query_str}:0:{window}",
+                query_str=query_str,
+                limit=window,
+                offset=0,
+            )
+            # Cached rows carry created_at as a string (json default=str),
+            # fresh rows as datetime - compare on the same representation.
+            results = sorted(
+                public_results + private_results,
+                key=lambda item: (str(item["created_at"]), item["id"]),
+                reverse=True,
+            )[offset:offset + limit]
+        else:
+            results = DocumentSearchService._cached_fetch(
+                db=db,
+                cache_key=f"search:docs:public:{query_str}:{offset}:{limit}",
+                query_str=query_str,
+                limit=limit,
+                offset=offset,
+            )
+
+        # ------------------------------------------------------------------
+        # 3. HYDRATE user-specific fields
+        # ------------------------------------------------------------------
+        from services.cache.user_state import UserStateCache
+        liked_ids = UserStateCache.get_liked_ids(db, current_user.id)
+        bookmarked_ids = UserStateCache.get_bookmarked_ids(db, current_user.id)
+
+        for item in results:
+            item["is_liked"] = item["id"] in liked_ids
+            item["is_bookmarked"] = item["id"] in bookmarked_ids
 
         return results
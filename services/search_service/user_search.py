@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, case, exists, literal
+from sqlalchemy import or_, case, exists, literal
 from models.user import User
 from models.student import Student
 from models.follow import Follow
@@ -26,25 +26,7 @@ class UserSearchService:
         # OPTIMIZED SUBQUERIES
         # ------------------------------------------------------------------
         
-        # 1. Followers Count
-        followers_sq = (
-            db.query(func.count(Follow.id))
-            .filter(Follow.following_id == User.id)
-            .correlate(User)
-            .scalar_subquery()
-            .label("followers_count")
-        )
-
-        # 2. Following Count
-        following_sq = (
-            db.query(func.count(Follow.id))
-            .filter(Follow.follower_id == User.id)
-            .correlate(User)
-            .scalar_subquery()
-            .label("following_count")
-        )
-
-        # 3. Is Following (Current User -> Target User)
+        # Is Following (Current User -> Target User)
         if current_user:
             is_following_sq = (
                 db.query(Follow.id)
@@ -65,7 +47,7 @@ class UserSearchService:
         # ------------------------------------------------------------------
         
         base_query = (
-            db.query(User, Student, followers_sq, following_sq, is_following_col)
+            db.query(User, Student, is_following_col)
             .join(Student, Student.user_id == User.id)
             .filter(
                 User.is_active.is_(True),
@@ -92,7 +74,7 @@ class UserSearchService:
         storage = StorageFactory.get_storage()
         response_model = []
 
-        for user, student, followers_count, following_count, is_following in results:
+        for user, student, is_following in results:
             
             # Generate profile URL
             profile_url = None
@@ -111,9 +93,9 @@ class UserSearchService:
                 "college": student.college,
                 "course": student.course,
                 "profile_url": profile_url,
-                # Use subquery results
-                "followers_count": followers_count or 0,
-                "following_count": following_count or 0,
+                # Denormalized counters (no per-row COUNT over follows)
+                "followers_count": user.followers_count or 0,
+                "following_count": user.following_count or 0,
                 "is_following": bool(is_following),
             })
 
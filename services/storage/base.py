@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import BinaryIO, Iterator
 
 
 class Storage(ABC):
@@ -31,7 +33,45 @@ class Storage(ABC):
         self,
         *,
         object_key: str,
-        file_content: bytes,
+        file_content: bytes | BinaryIO,
         content_type: str,
     ) -> str:
+        """Upload bytes, or stream a file-like object (read in chunks, not loaded whole)."""
         pass
+
+    @abstractmethod
+    def download_file(
+        self,
+        *,
+        object_key: str,
+        destination: BinaryIO,
+    ) -> None:
+        """Stream an object into a writable file-like object (in chunks)."""
+        pass
+
+    @abstractmethod
+    def list_objects(self, *, prefix: str) -> Iterator[tuple[str, datetime]]:
+        """Yield (object_key, created_at) for every stored object under `prefix`."""
+        pass
+
+    def delete_objects(self, *, object_keys: list[str]) -> list[str]:
+        """
+        Delete many objects; returns the keys that could not be deleted.
+
+        Deleting a missing object counts as success. Providers with a bulk
+        API override this.
+        """
+        failed = []
+        for object_key in object_keys:
+            try:
+                self.delete_object(object_key=object_key)
+            except Exception:
+                failed.append(object_key)
+        return failed
+
+    def object_id(self, object_key: str) -> str:
+        """
+        Provider identity of a key: two keys with the same id are the same
+        stored object (used to match listed objects against references).
+        """
+        return object_key
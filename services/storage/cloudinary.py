@@ -2,15 +2,70 @@
 Cloudinary Storage Implementation
 Handles file uploads and URL generation using Cloudinary
 """
-import time
+import os
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import BinaryIO, Iterator
+
+import httpx
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
+from cloudinary.utils import cloudinary_url
 from services.storage.base import Storage
 from core.config import storage_setting
 from core.exceptions import StorageOperationFailed
 
 
+# upload_large sends the stream in parts of this size (Cloudinary minimum: 5 MB)
+UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Admin API limits
+DELETE_BATCH_SIZE = 100
+LIST_PAGE_SIZE = 500
+
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.ico', '.pdf'})
+
+
+@lru_cache(maxsize=16384)
+def _resolve(object_key: str) -> tuple[str, str, str]:
+    """
+    Map an object key to (public_id, resource_type, extension).
+
+    Cloudinary public IDs carry the 'edustore/' prefix. For 'image'
+    resources (incl. PDFs) the public_id must NOT include the extension.
+    """
+    public_id = f"edustore/{object_key}"
+    _, ext = os.path.splitext(object_key)
+    ext = ext.lower()
+    resource_type = 'image' if ext in IMAGE_EXTENSIONS else 'raw'
+    if resource_type == 'image':
+        public_id = public_id.rsplit('.', 1)[0]
+    return public_id, resource_type, ext
+
+
+@lru_cache(maxsize=16384)
+def _download_url(object_key: str, page: int | None) -> str:
+    """
+    Delivery URLs are unsigned and derived only from the key, so they are
+    computed once per process and reused.
+    """
+    public_id, resource_type, ext = _resolve(object_key)
+
+    # For PDFs specifically, we use the format='pdf' parameter
+    # which correctly appends the extension to the base public_id.
+    url_params = {"secure": True, "resource_type": resource_type}
+    if ext == '.pdf':
+        url_params["format"] = "pdf"
+        if page is not None:
+            url_params["page"] = page
+
+    url, _ = cloudinary_url(public_id, **url_params)
+    return url
+
+
 class CloudinaryStorage(Storage):
     """Cloudinary storage provider implementation"""
     
@@ -56,41 +111,11 @@ class CloudinaryStorage(Storage):
         expires_in: int = 300,
         page: int = None,
     ) -> str:
-        """Generate Cloudinary download URL - Fixed Pathing"""
+        """Generate Cloudinary download URL (local, memoized)"""
         self._validate_object_key(object_key)
         
         try:
-            import os
-            # Use the exact same public_id logic as upload
-            # Cloudinary public ID for matching MUST include the edustore prefix
-            public_id = f"edustore/{object_key}"
-            
-            # Determine resource_type
-            _, ext = os.path.splitext(object_key)
-            ext = ext.lower()
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.ico', '.pdf'}
-            resource_type = 'image' if ext in image_extensions else 'raw'
-            
-            #  NORMALIZATION: For 'image' resource_type (incl. PDFs), 
-            # public_id should NOT include the file extension.
-            if resource_type == 'image':
-                public_id = public_id.rsplit('.', 1)[0]
-            
-            from cloudinary.utils import cloudinary_url
-            
-            # For PDFs specifically, we use the format='pdf' parameter
-            # which correctly appends the extension to the base public_id.
-            url_params = {"secure": True, "resource_type": resource_type}
-            if ext == '.pdf':
-                url_params["format"] = "pdf"
-                if page is not None:
-                    url_params["page"] = page
-                
-            url, _ = cloudinary_url(public_id, **url_params)
-            
-            print(f"🔗 Generated URL: {url}")
-            return url
-            
+            return _download_url(object_key, page)
         except Exception as e:
             raise StorageOperationFailed(f"Failed to generate download URL: {str(e)}") from e
     
@@ -99,16 +124,7 @@ class CloudinaryStorage(Storage):
         self._validate_object_key(object_key)
         
         try:
-            import os
-            public_id = f"edustore/{object_key}"
-            _, ext = os.path.splitext(object_key)
-            ext = ext.lower()
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.ico', '.pdf'}
-            resource_type = 'image' if ext in image_extensions else 'raw'
-            
-            # NORMALIZATION: Match the upload public_id logic
-            if resource_type == 'image':
-                public_id = public_id.rsplit('.', 1)[0]
+            public_id, resource_type, _ = _resolve(object_key)
             
             cloudinary.uploader.destroy(
                 public_id,
@@ -122,36 +138,34 @@ class CloudinaryStorage(Storage):
         self,
         *,
         object_key: str,
-        file_content: bytes,
+        file_content: bytes | BinaryIO,
         content_type: str,
     ) -> str:
         """Upload file directly to Cloudinary and return secure URL - Simplified Pathing"""
         self._validate_object_key(object_key)
         
         try:
-            import os
-            # Standardize: public_id includes the 'edustore/' prefix
-            # This allows generate_download_url to be perfectly consistent.
-            public_id = f"edustore/{object_key}"
-            
-            _, ext = os.path.splitext(object_key)
-            ext = ext.lower()
-            image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.ico', '.pdf'}
-            resource_type = 'image' if ext in image_extensions else 'raw'
-            
-            # NORMALIZATION: For 'image' resource_type (incl. PDFs),
-            # the public_id should NEVER include the extension.
-            if resource_type == 'image':
-                public_id = public_id.rsplit('.', 1)[0]
+            # Same public_id as generate_download_url
+            public_id, resource_type, _ = _resolve(object_key)
                 
             print(f"📤 Uploading: {public_id} (Type: {resource_type})")
             
-            result = cloudinary.uploader.upload(
-                file_content,
-                public_id=public_id,
-                resource_type=resource_type,
-                overwrite=True
-            )
+            if isinstance(file_content, (bytes, bytearray)):
+                result = cloudinary.uploader.upload(
+                    file_content,
+                    public_id=public_id,
+                    resource_type=resource_type,
+                    overwrite=True
+                )
+            else:
+                # Streams: chunked upload, memory bounded by UPLOAD_CHUNK_SIZE
+                result = cloudinary.uploader.upload_large(
+                    file_content,
+                    public_id=public_id,
+                    resource_type=resource_type,
+                    overwrite=True,
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                )
             
             secure_url = result.get('secure_url')
             print(f"Upload successful! URL: {secure_url}")
@@ -160,3 +174,92 @@ class CloudinaryStorage(Storage):
         except Exception as e:
             print(f" Upload failed: {str(e)}")
             raise StorageOperationFailed(f"Failed to upload file: {str(e)}") from e
+
+    def download_file(
+        self,
+        *,
+        object_key: str,
+        destination: BinaryIO,
+    ) -> None:
+        """Stream the delivered file from Cloudinary into `destination`"""
+        self._validate_object_key(object_key)
+        
+        try:
+            with httpx.stream("GET", _download_url(object_key, None), timeout=30.0) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    destination.write(chunk)
+        except Exception as e:
+            raise StorageOperationFailed(f"Failed to download file: {str(e)}") from e
+
+    def delete_objects(self, *, object_keys: list[str]) -> list[str]:
+        """Bulk delete through the Admin API (100 public IDs per call, per resource type)"""
+        by_type = defaultdict(dict)  # resource_type -> {public_id: object_key}
+        failed = []
+        for object_key in object_keys:
+            try:
+                self._validate_object_key(object_key)
+            except ValueError:
+                failed.append(object_key)
+                continue
+            public_id, resource_type, _ = _resolve(object_key)
+            by_type[resource_type][public_id] = object_key
+
+        for resource_type, keys in by_type.items():
+            public_ids = list(keys)
+            for i in range(0, len(public_ids), DELETE_BATCH_SIZE):
+                batch = public_ids[i:i + DELETE_BATCH_SIZE]
+                try:
+                    result = cloudinary.api.delete_resources(
+                        batch,
+                        resource_type=resource_type,
+                        type="upload",
+                        invalidate=True,
+                    )
+                except Exception as e:
+                    print(f"Cloudinary bulk delete failed ({len(batch)} objects): {e}")
+                    failed.extend(keys[p] for p in batch)
+                    continue
+
+                deleted = result.get("deleted", {})
+                failed.extend(
+                    keys[p] for p in batch
+                    if deleted.get(p) not in ("deleted", "not_found")
+                )
+        return failed
+
+    def list_objects(self, *, prefix: str) -> Iterator[tuple[str, datetime]]:
+        """
+        Page through uploaded resources under `prefix`.
+
+        Image public IDs carry no extension, so listed image keys get the
+        delivered format appended; compare keys through object_id().
+        """
+        for resource_type in ("image", "raw"):
+            cursor = None
+            while True:
+                params = {
+                    "type": "upload",
+                    "resource_type": resource_type,
+                    "prefix": f"edustore/{prefix}",
+                    "max_results": LIST_PAGE_SIZE,
+                }
+                if cursor:
+                    params["next_cursor"] = cursor
+                page = cloudinary.api.resources(**params)
+
+                for resource in page.get("resources", []):
+                    object_key = resource["public_id"][len("edustore/"):]
+                    if resource_type == "image" and resource.get("format"):
+                        object_key = f"{object_key}.{resource['format']}"
+                    created_at = datetime.fromisoformat(resource["created_at"].replace("Z", "+00:00"))
+                    yield object_key, created_at
+
+                cursor = page.get("next_cursor")
+                if not cursor:
+                    break
+
+    def object_id(self, object_key: str) -> str:
+        """'.jpeg' and '.jpg' keys name the same image resource"""
+        public_id, resource_type, _ = _resolve(object_key)
+        return f"{resource_type}:{public_id}"
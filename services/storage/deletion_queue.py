@@ -0,0 +1,186 @@
+"""
+Queued storage deletion.
+
+Request handlers never delete objects inline: they add rows to the
+storage_deletions outbox inside their own transaction (enqueue) and nudge
+the worker after commit (notify). A background thread in each app process
+drains the outbox in batches through Storage.delete_objects, the
+provider's bulk API. Each batch is claimed with FOR UPDATE SKIP LOCKED and
+leased (not_before pushed STORAGE_DELETE_LEASE ahead) in one short
+transaction, so no lock or pooled connection is held during the provider
+call, and any number of processes can drain concurrently without double
+work. A worker that dies mid-batch leaves rows that come back once the
+lease runs out.
+
+Failed keys are retried with exponential backoff; after
+STORAGE_DELETE_MAX_ATTEMPTS they stay in the table as dead letters
+(attempts, last_error) for inspection.
+
+The same thread runs the orphan sweeper every STORAGE_SWEEP_INTERVAL.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+
+from core.config import storage_setting
+from models.storage_deletion import StorageDeletion
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = 3600
+
+
+class DeletionQueue:
+    _thread: threading.Thread | None = None
+    _wake = threading.Event()
+    _stop = threading.Event()
+
+    @staticmethod
+    def enqueue(*, db: Session, object_keys) -> None:
+        """Queue objects for deletion in the caller's transaction (caller commits)."""
+        db.add_all(
+            StorageDeletion(object_key=key)
+            for key in dict.fromkeys(object_keys)
+            # Legacy avatars store full delivery URLs, not keys
+            if key and not key.startswith("http")
+        )
+
+    @classmethod
+    def notify(cls) -> None:
+        """Wake the worker after a commit that queued deletions."""
+        cls._wake.set()
+
+    @staticmethod
+    def _claim(batch_size: int) -> list:
+        """Lease a batch of due rows (short transaction, locks released on commit)."""
+        from db.session import SessionLocal
+
+        with SessionLocal() as db:
+            rows = (
+                db.query(StorageDeletion.id, StorageDeletion.object_key, StorageDeletion.attempts)
+                .filter(
+                    StorageDeletion.attempts < storage_setting.STORAGE_DELETE_MAX_ATTEMPTS,
+                    StorageDeletion.not_before <= func.now(),
+                )
+                .order_by(StorageDeletion.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not rows:
+                db.rollback()
+                return []
+
+            db.execute(
+                update(StorageDeletion)
+                .where(StorageDeletion.id.in_([row.id for row in rows]))
+                .values(not_before=func.now() + timedelta(seconds=storage_setting.STORAGE_DELETE_LEASE))
+            )
+            db.commit()
+        return rows
+
+    @staticmethod
+    def _record(rows: list, failed: set, error: str) -> int:
+        """Delete the rows whose objects are gone, back off the rest. Returns rows done."""
+        from db.session import SessionLocal
+
+        with SessionLocal() as db:
+            done = [row.id for row in rows if row.object_key not in failed]
+            if done:
+                db.execute(delete(StorageDeletion).where(StorageDeletion.id.in_(done)))
+
+            for row in rows:
+                if row.object_key in failed:
+                    backoff = min(30 * 2 ** row.attempts, MAX_BACKOFF)
+                    db.execute(
+                        update(StorageDeletion)
+                        .where(StorageDeletion.id == row.id)
+                        .values(
+                            attempts=StorageDeletion.attempts + 1,
+                            last_error=error[:1000],
+                            not_before=func.now() + timedelta(seconds=backoff),
+                        )
+                    )
+            db.commit()
+        return len(done)
+
+    @classmethod
+    def drain_batch(cls, *, storage, batch_size: int) -> int:
+        """Delete one batch of due objects. Returns the number of rows handled."""
+        rows = cls._claim(batch_size)
+        if not rows:
+            return 0
+
+        keys = list(dict.fromkeys(row.object_key for row in rows))
+        try:
+            failed = set(storage.delete_objects(object_keys=keys))
+            error = "provider reported failure"
+        except Exception as e:
+            failed, error = set(keys), str(e)
+
+        # The provider call ran with no transaction open; record in a new one
+        done = cls._record(rows, failed, error)
+
+        if failed:
+            logger.warning("Storage deletion: %d of %d objects failed, will retry", len(failed), len(keys))
+        print(f"🗑️ Storage deletion batch: {done} rows done, {len(failed)} keys failed")
+        return len(rows)
+
+    @classmethod
+    def drain(cls) -> int:
+        """Drain every due row, batch by batch. Returns rows handled."""
+        from services.storage.factory import StorageFactory
+
+        storage = StorageFactory.get_storage()
+        total = 0
+        while not cls._stop.is_set():
+            handled = cls.drain_batch(
+                storage=storage,
+                batch_size=storage_setting.STORAGE_DELETE_BATCH_SIZE,
+            )
+            total += handled
+            if handled < storage_setting.STORAGE_DELETE_BATCH_SIZE:
+                break
+        return total
+
+    @classmethod
+    def _loop(cls) -> None:
+        from services.storage.orphan_sweeper import OrphanSweeper
+
+        next_sweep = time.monotonic() + storage_setting.STORAGE_SWEEP_INTERVAL
+        while not cls._stop.is_set():
+            cls._wake.clear()
+            try:
+                cls.drain()
+            except Exception:
+                logger.exception("Storage deletion worker failed")
+
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + storage_setting.STORAGE_SWEEP_INTERVAL
+                try:
+                    OrphanSweeper.sweep()
+                except Exception:
+                    logger.exception("Orphan sweep failed")
+                cls._wake.set()  # drain what the sweep queued right away
+
+            cls._wake.wait(storage_setting.STORAGE_DELETE_INTERVAL)
+
+    @classmethod
+    def start(cls) -> None:
+        if not storage_setting.STORAGE_DELETION_WORKER_ENABLED or cls._thread is not None:
+            return
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=cls._loop, name="storage-deletion", daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._stop.set()
+        cls._wake.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=10)
+            cls._thread = None
@@ -0,0 +1,171 @@
+"""
+Async facade over the blocking storage SDK.
+
+Provider SDKs (Cloudinary) do plain blocking HTTP. Called from an
+`async def` route they freeze the whole worker for the duration of the
+upload, so async code goes through AsyncStorage instead: every call runs
+on a dedicated, size-limited thread pool (separate from the anyio pool
+that serves sync routes, so slow uploads cannot starve them).
+
+Backpressure: at most STORAGE_MAX_PENDING operations may be running or
+queued per process; past that, calls fail fast with StorageBusy (503)
+instead of piling up behind a slow provider.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import storage_setting
+from core.exceptions import StorageBusy
+from services.storage.factory import StorageFactory
+
+logger = logging.getLogger(__name__)
+
+
+class StorageMetrics:
+    """Process-wide per-operation timings (exposed on /metrics/storage)"""
+
+    _lock = threading.Lock()
+    _ops: dict[str, dict] = {}
+    _rejected = 0
+
+    @classmethod
+    def record(cls, op: str, *, wait: float, duration: float, ok: bool) -> None:
+        with cls._lock:
+            entry = cls._ops.setdefault(op, {
+                "calls": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "queue_wait_ms": 0.0,
+            })
+            entry["calls"] += 1
+            entry["total_ms"] += duration * 1000
+            entry["max_ms"] = max(entry["max_ms"], duration * 1000)
+            entry["queue_wait_ms"] += wait * 1000
+            if not ok:
+                entry["errors"] += 1
+
+    @classmethod
+    def record_rejected(cls) -> None:
+        with cls._lock:
+            cls._rejected += 1
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        with cls._lock:
+            return {
+                "pending": AsyncStorage.pending(),
+                "max_pending": storage_setting.STORAGE_MAX_PENDING,
+                "rejected": cls._rejected,
+                "ops": {
+                    op: {
+                        "calls": entry["calls"],
+                        "errors": entry["errors"],
+                        "avg_ms": round(entry["total_ms"] / entry["calls"], 3),
+                        "max_ms": round(entry["max_ms"], 3),
+                        "avg_queue_wait_ms": round(entry["queue_wait_ms"] / entry["calls"], 3),
+                    }
+                    for op, entry in cls._ops.items()
+                },
+            }
+
+
+class AsyncStorage:
+    _executor: ThreadPoolExecutor | None = None
+    _lock = threading.Lock()
+    _pending = 0
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=storage_setting.STORAGE_MAX_WORKERS,
+                        thread_name_prefix="storage",
+                    )
+        return cls._executor
+
+    @classmethod
+    def pending(cls) -> int:
+        return cls._pending
+
+    @classmethod
+    def _acquire(cls) -> None:
+        with cls._lock:
+            if cls._pending >= storage_setting.STORAGE_MAX_PENDING:
+                StorageMetrics.record_rejected()
+                raise StorageBusy()
+            cls._pending += 1
+
+    @classmethod
+    def _release(cls) -> None:
+        with cls._lock:
+            cls._pending -= 1
+
+    @classmethod
+    async def run(cls, op: str, **kwargs):
+        """Run `Storage.<op>(**kwargs)` on the storage pool and await the result."""
+        cls._acquire()
+        storage = StorageFactory.get_storage()
+        submitted = time.perf_counter()
+        timing = {}
+
+        def call():
+            started = time.perf_counter()
+            timing["wait"] = started - submitted
+            try:
+                return getattr(storage, op)(**kwargs)
+            finally:
+                timing["duration"] = time.perf_counter() - started
+
+        def done(future):
+            # Runs when the call finishes (or is cancelled before starting),
+            # even if the awaiting request was cancelled meanwhile
+            cls._release()
+            if "duration" not in timing:
+                return
+            ok = not future.cancelled() and future.exception() is None
+            StorageMetrics.record(op, wait=timing["wait"], duration=timing["duration"], ok=ok)
+            if timing["duration"] > storage_setting.STORAGE_SLOW_OP_SECONDS:
+                logger.warning(
+                    "Slow storage %s %.3fs (queued %.3fs)",
+                    op,
+                    timing["duration"],
+                    timing["wait"],
+                )
+
+        try:
+            future = cls._get_executor().submit(call)
+        except Exception:
+            cls._release()
+            raise
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    async def upload_file(cls, *, object_key: str, file_content, content_type: str) -> str:
+        return await cls.run(
+            "upload_file",
+            object_key=object_key,
+            file_content=file_content,
+            content_type=content_type,
+        )
+
+    @classmethod
+    async def download_file(cls, *, object_key: str, destination) -> None:
+        await cls.run("download_file", object_key=object_key, destination=destination)
+
+    @classmethod
+    async def delete_object(cls, *, object_key: str) -> None:
+        await cls.run("delete_object", object_key=object_key)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
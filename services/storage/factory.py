@@ -1,14 +1,34 @@
+import threading
+
 from services.storage.base import Storage
 from core.config import storage_setting
 
 
 class StorageFactory:
+    # One client per process: construction configures the provider SDK
+    _instance: Storage | None = None
+    _lock = threading.Lock()
+
     @staticmethod
     def get_storage() -> Storage:
+        if StorageFactory._instance is not None:
+            return StorageFactory._instance
+
+        with StorageFactory._lock:
+            if StorageFactory._instance is None:
+                StorageFactory._instance = StorageFactory._create()
+        return StorageFactory._instance
+
+    @staticmethod
+    def _create() -> Storage:
         provider = storage_setting.STORAGE_PROVIDER.lower()
         
         if provider == "cloudinary":
             from services.storage.cloudinary import CloudinaryStorage
             return CloudinaryStorage()
+
+        if provider == "local":
+            from services.storage.local import LocalStorage
+            return LocalStorage()
         
-        raise RuntimeError(f"Unsupported storage provider: {provider}. Only 'cloudinary' is supported.")
\ No newline at end of file
+        raise RuntimeError(f"Unsupported storage provider: {provider}. Use 'cloudinary' or 'local'.")
@@ -24,3 +24,16 @@ def profile_avatar_key(*, user_id: int, extension: str) -> str:
     extension = extension.lstrip(".")
     return f"{BASE}/{user_id}/{PROFILE}/{uid}.{extension}"
 
+
+def document_variant_key(*, object_key: str, variant: str) -> str:
+    """Rendered variant (thumbnail, preview) stored next to its source object"""
+    base = object_key.rsplit(".", 1)[0] if "." in object_key.rsplit("/", 1)[-1] else object_key
+    return f"{base}_{variant}.webp"
+
+
+UPLOADS = "uploads"
+
+
+def upload_chunk_key(*, user_id: int, upload_id: str, offset: int) -> str:
+    """One chunk of a resumable upload (sorts by offset; unique per attempt)"""
+    return f"{BASE}/{int(user_id)}/{UPLOADS}/{upload_id}/{offset:012d}-{uuid4().hex[:8]}"
@@ -0,0 +1,167 @@
+"""
+Local filesystem storage implementation.
+
+Objects live under LOCAL_STORAGE_ROOT at their object key. Download URLs
+point back at this app (GET /files/{object_key}) and carry an expiry and an
+HMAC signature, so they can be handed out exactly like Cloudinary URLs
+without a database or Redis lookup per request.
+"""
+import hashlib
+import hmac
+import math
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from urllib.parse import quote
+
+from services.storage.base import Storage
+from core.config import storage_setting, mail_setting
+from core.exceptions import StorageOperationFailed
+
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Expiries are rounded up to this step: the same object requested within
+# one step gets the same URL, so browsers and CDNs can cache it
+EXPIRY_STEP = 60
+
+
+def _signing_key() -> bytes:
+    if storage_setting.LOCAL_STORAGE_SIGNING_KEY:
+        return storage_setting.LOCAL_STORAGE_SIGNING_KEY.encode()
+    # Domain-separated from the JWT secret: a file signature never verifies a token
+    return hashlib.sha256(b"local-storage:" + mail_setting.SECRET_KEY.encode()).digest()
+
+
+def sign(object_key: str, expires: int) -> str:
+    message = f"{object_key}\n{expires}".encode()
+    return hmac.new(_signing_key(), message, hashlib.sha256).hexdigest()
+
+
+def verify_signature(object_key: str, expires: int, signature: str) -> bool:
+    """True if `signature` is valid for the key and the URL has not expired."""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign(object_key, expires), signature)
+
+
+class LocalStorage(Storage):
+    """Filesystem storage provider implementation"""
+
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or storage_setting.LOCAL_STORAGE_ROOT).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = storage_setting.LOCAL_STORAGE_BASE_URL.rstrip("/")
+
+    def path_for(self, object_key: str) -> Path:
+        """Absolute path of an object; rejects keys that escape the root."""
+        if not object_key or "\x00" in object_key:
+            raise ValueError("object_key empty")
+        path = (self.root / object_key).resolve()
+        if not path.is_relative_to(self.root) or path == self.root:
+            raise ValueError("invalid object_key")
+        return path
+
+    def generate_upload_url(
+        self,
+        *,
+        object_key: str,
+        content_type: str,
+        expires_in: int = 300,
+    ) -> str:
+        """Local storage has no presigned uploads; files go through upload_file"""
+        raise StorageOperationFailed("Presigned uploads are not supported by local storage")
+
+    def generate_download_url(
+        self,
+        *,
+        object_key: str,
+        expires_in: int = 300,
+        page: int = None,
+    ) -> str:
+        """Signed, expiring URL served by GET /files/{object_key}"""
+        self.path_for(object_key)
+
+        expires = math.ceil((time.time() + expires_in) / EXPIRY_STEP) * EXPIRY_STEP
+        return (
+            f"{self.base_url}/files/{quote(object_key)}"
+            f"?expires={expires}&sig={sign(object_key, expires)}"
+        )
+
+    def delete_object(self, *, object_key: str) -> None:
+        """Delete file from disk (missing files are ignored)"""
+        path = self.path_for(object_key)
+
+        try:
+            path.unlink(missing_ok=True)
+        except Exception as e:
+            raise StorageOperationFailed(f"Failed to delete object: {str(e)}") from e
+
+    def upload_file(
+        self,
+        *,
+        object_key: str,
+        file_content: bytes | BinaryIO,
+        content_type: str,
+    ) -> str:
+        """
+        Write the object atomically (temp file + rename) and return its key.
+
+        Local URLs are signed and expire, so callers store the key and sign
+        a URL on read (StorageURLCache handles keys and full URLs alike).
+        """
+        path = self.path_for(object_key)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    if isinstance(file_content, (bytes, bytearray)):
+                        tmp.write(file_content)
+                    else:
+                        shutil.copyfileobj(file_content, tmp, COPY_CHUNK_SIZE)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return object_key
+
+        except Exception as e:
+            raise StorageOperationFailed(f"Failed to upload file: {str(e)}") from e
+
+    def download_file(
+        self,
+        *,
+        object_key: str,
+        destination: BinaryIO,
+    ) -> None:
+        """Copy the object into `destination`"""
+        path = self.path_for(object_key)
+
+        try:
+            with open(path, "rb") as source:
+                shutil.copyfileobj(source, destination, COPY_CHUNK_SIZE)
+        except Exception as e:
+            raise StorageOperationFailed(f"Failed to download file: {str(e)}") from e
+
+    def list_objects(self, *, prefix: str) -> Iterator[tuple[str, datetime]]:
+        """Walk the files under root/prefix (in-progress temp files excluded)"""
+        base = self.path_for(prefix) if prefix else self.root
+        for directory, _, filenames in os.walk(base):
+            for filename in filenames:
+                if filename.startswith(".upload-"):
+                    continue
+                path = Path(directory) / filename
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                yield (
+                    path.relative_to(self.root).as_posix(),
+                    datetime.fromtimestamp(mtime, tz=timezone.utc),
+                )
@@ -0,0 +1,98 @@
+"""
+Periodic sweep for storage objects nothing references.
+
+Objects leak when a request dies between upload and commit, when a
+presigned upload is never committed, or (historically) when an inline
+delete failed. The sweeper lists everything under SWEEP_PREFIX and queues
+for deletion each object that is:
+  - older than STORAGE_SWEEP_MIN_AGE (uploads in flight are left alone),
+  - not referenced by a live document (file, thumbnail or preview), a
+    document_blobs entry, or a student's profile_url,
+  - not already queued.
+
+Each sweep first expires resumable upload sessions past their TTL and
+queues their chunks. Only one process sweeps at a time (Postgres advisory
+lock).
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from core.config import storage_setting
+
+logger = logging.getLogger(__name__)
+
+# Everything keyed by services.storage.keys lives under users/. Legacy
+# direct avatar uploads (avatars/) are stored as full URLs, not keys, so
+# they cannot be matched to references and are never swept.
+SWEEP_PREFIX = "users/"
+
+_SWEEP_LOCK_ID = 0x5EED0B1E
+
+_REFERENCED_KEYS = text("""
+    SELECT object_key FROM documents WHERE is_deleted IS false AND object_key IS NOT NULL
+    UNION ALL
+    SELECT thumbnail_key FROM documents WHERE is_deleted IS false AND thumbnail_key IS NOT NULL
+    UNION ALL
+    SELECT preview_key FROM documents WHERE is_deleted IS false AND preview_key IS NOT NULL
+    UNION ALL
+    SELECT object_key FROM document_blobs
+    UNION ALL
+    SELECT profile_url FROM students WHERE profile_url IS NOT NULL
+    UNION ALL
+    SELECT object_key FROM upload_chunks
+    UNION ALL
+    SELECT object_key FROM storage_deletions
+""")
+
+_EXPIRE_UPLOAD_SESSIONS = text("""
+    WITH expired AS (
+        DELETE FROM upload_sessions WHERE expires_at < now() RETURNING id
+    )
+    SELECT c.object_key FROM upload_chunks c JOIN expired e ON e.id = c.session_id
+""")
+
+
+class OrphanSweeper:
+    @staticmethod
+    def sweep(*, dry_run: bool = False) -> list[str]:
+        """Queue unreferenced objects for deletion. Returns the orphaned keys."""
+        from db.session import SessionLocal
+        from services.storage.factory import StorageFactory
+        from services.storage.deletion_queue import DeletionQueue
+
+        storage = StorageFactory.get_storage()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=storage_setting.STORAGE_SWEEP_MIN_AGE)
+
+        with SessionLocal() as db:
+            # Transaction-scoped: released by the commit/rollback below
+            if not db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": _SWEEP_LOCK_ID}).scalar():
+                print("🧹 Orphan sweep already running elsewhere, skipping")
+                return []
+
+            if not dry_run:
+                # Chunk rows go with their session (ON DELETE CASCADE)
+                expired_chunks = db.execute(_EXPIRE_UPLOAD_SESSIONS).scalars().all()
+                DeletionQueue.enqueue(db=db, object_keys=expired_chunks)
+                db.flush()  # visible to the reference snapshot below
+
+            # Snapshot references first: anything committed later is
+            # younger than the cutoff anyway
+            referenced = {
+                storage.object_id(key)
+                for (key,) in db.execute(_REFERENCED_KEYS).yield_per(10000)
+            }
+
+            orphans = [
+                key
+                for key, created_at in storage.list_objects(prefix=SWEEP_PREFIX)
+                if created_at < cutoff and storage.object_id(key) not in referenced
+            ]
+
+            if orphans and not dry_run:
+                DeletionQueue.enqueue(db=db, object_keys=orphans)
+            db.commit()
+
+        logger.info("Orphan sweep: %d unreferenced objects%s", len(orphans), " (dry run)" if dry_run else " queued")
+        return orphans
@@ -0,0 +1,60 @@
+"""
+Shared fixtures.
+
+Tests that need the database run against DATABASE_URL (a migrated
+Postgres, `alembic upgrade head`) inside one outer transaction that is
+rolled back afterwards, so nothing they write survives. Without a
+configured, reachable database those tests are skipped.
+"""
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODELS = [
+    "models.user",
+    "models.student",
+    "models.document",
+    "models.document_blob",
+    "models.storage_deletion",
+    "models.upload_session",
+    "models.chat_sync_outbox",
+    "models.email_outbox",
+    "models.follow",
+    "models.comments",
+    "models.likes",
+    "models.bookmark",
+]
+
+
+@pytest.fixture
+def db():
+    try:
+        from db.session import engine
+    except (Exception, SystemExit) as e:
+        pytest.skip(f"app settings not configured: {e}")
+
+    # Every mapped class, so relationships resolve (as alembic/env.py does)
+    for module in MODELS:
+        importlib.import_module(module)
+
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"database not reachable: {e}")
+
+    transaction = connection.begin()
+    # Service code may commit: commits release savepoints, not the outer transaction
+    session = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
@@ -0,0 +1,56 @@
+"""client_ip: which address rate limits and session metadata are keyed on."""
+import pytest
+from starlette.requests import Request
+
+try:
+    from services.rate_limit.limiter import client_ip, request_identity
+except (Exception, SystemExit) as e:
+    pytest.skip(f"app settings not configured: {e}", allow_module_level=True)
+
+
+PEER = "10.1.2.3"  # the proxy, as seen on the socket
+
+
+def _request(forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return Request({"type": "http", "headers": headers, "client": (PEER, 40000)})
+
+
+@pytest.fixture
+def hops(monkeypatch):
+    from core.config import rate_limit_setting
+
+    def set_hops(value: int) -> None:
+        monkeypatch.setattr(rate_limit_setting, "TRUSTED_PROXY_HOPS", value)
+
+    return set_hops
+
+
+def test_without_trusted_proxies_header_is_ignored(hops):
+    hops(0)
+    assert client_ip(_request("203.0.113.9")) == PEER
+
+
+def test_one_trusted_hop_uses_entry_appended_by_proxy(hops):
+    hops(1)
+    assert client_ip(_request("203.0.113.9")) == "203.0.113.9"
+
+
+def test_one_trusted_hop_ignores_client_supplied_entries(hops):
+    hops(1)
+    # The client sent "6.6.6.6"; the proxy appended the real address
+    assert client_ip(_request("6.6.6.6, 203.0.113.9")) == "203.0.113.9"
+    assert request_identity(_request("1.1.1.1, 203.0.113.9")) == "ip:203.0.113.9"
+
+
+def test_one_trusted_hop_without_header_falls_back_to_peer(hops):
+    hops(1)
+    assert client_ip(_request()) == PEER
+    assert client_ip(_request("")) == PEER
+
+
+def test_two_trusted_hops(hops):
+    hops(2)
+    assert client_ip(_request("6.6.6.6, 203.0.113.9, 10.0.0.7")) == "203.0.113.9"
+    # Shorter chain than configured: the request skipped a proxy
+    assert client_ip(_request("203.0.113.9")) == PEER
@@ -0,0 +1,133 @@
+"""GET /documents/ listing: constant statements per page, cursor round trip."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from db import query_stats
+
+PAGE_SIZE = 5
+DOCUMENTS = 13  # three pages: 5, 5, 3
+
+
+class FakeStorage:
+    def __init__(self):
+        self.signed = []
+
+    def generate_download_url(self, *, object_key, expires_in, **kwargs):
+        self.signed.append(object_key)
+        return f"https://files.test/{object_key}"
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    from services.file_service import document_service
+
+    fake = FakeStorage()
+    monkeypatch.setattr(document_service.StorageFactory, "get_storage", staticmethod(lambda: fake))
+    return fake
+
+
+@pytest.fixture
+def owner(db):
+    from models.user import User
+    from models.student import Student
+    from models.document import Document
+    from models.likes import Like
+
+    suffix = datetime.now(timezone.utc).strftime("%H%M%S%f")
+    user = User(email=f"listing-owner-{suffix}@example.com", is_verified=True)
+    fans = [User(email=f"listing-fan{i}-{suffix}@example.com", is_verified=True) for i in range(3)]
+    db.add_all([user, *fans])
+    db.flush()
+    db.add(Student(user_id=user.id, name="Listing Owner", profile_url="avatars/owner.webp"))
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    documents = []
+    for i in range(DOCUMENTS):
+        # Pairs share a timestamp: the cursor must break ties on id
+        documents.append(Document(
+            user_id=user.id,
+            title=f"Doc {i}",
+            doc_type="notes",
+            content=f"notes {i}",
+            visibility="public" if i % 2 else "private",
+            created_at=base + timedelta(minutes=i // 2),
+        ))
+    db.add_all(documents)
+    db.flush()
+
+    # Likes on every document, some by the owner: counts and is_liked vary per row
+    for i, document in enumerate(documents):
+        for fan in fans[: i % 4]:
+            db.add(Like(user_id=fan.id, document_id=document.id))
+        if i % 3 == 0:
+            db.add(Like(user_id=user.id, document_id=document.id))
+    db.flush()
+    return user, documents
+
+
+def _page(db, user, cursor):
+    from services.file_service.document_service import DocumentService
+
+    token = query_stats.start_request()
+    try:
+        page = DocumentService.list_my_documents(db=db, current_user=user, limit=PAGE_SIZE, cursor=cursor)
+    finally:
+        stats = query_stats.end_request(token)
+    return page, stats.count
+
+
+def test_statements_per_page_are_constant(db, owner, storage):
+    user, documents = owner
+
+    counts = []
+    cursor = None
+    while True:
+        page, statements = _page(db, user, cursor)
+        counts.append(statements)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(counts) == 3
+    assert counts == [1, 1, 1]
+    # One avatar signature per page, not per row
+    assert storage.signed == ["avatars/owner.webp"] * 3
+
+
+def test_cursor_round_trip_returns_every_document_once(db, owner, storage):
+    from models.likes import Like
+
+    user, documents = owner
+    expected = sorted(documents, key=lambda d: (d.created_at, d.id), reverse=True)
+
+    seen = []
+    cursor = None
+    while True:
+        page, _ = _page(db, user, cursor)
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            assert len(page["items"]) == DOCUMENTS % PAGE_SIZE
+            break
+        assert len(page["items"]) == PAGE_SIZE
+
+    assert [item["id"] for item in seen] == [d.id for d in expected]
+
+    likes = {d.id: db.query(Like).filter(Like.document_id == d.id).count() for d in documents}
+    owner_liked = {
+        document_id
+        for (document_id,) in db.query(Like.document_id).filter(Like.user_id == user.id)
+    }
+    for item in seen:
+        assert item["like_count"] == likes[item["id"]]
+        assert item["is_liked"] == (item["id"] in owner_liked)
+        assert item["owner_avatar"] == "https://files.test/avatars/owner.webp"
+
+
+def test_invalid_cursor_is_rejected(db, owner, storage):
+    from core.exceptions import InvalidCursor
+
+    user, _ = owner
+    with pytest.raises(InvalidCursor):
+        _page(db, user, "not-a-cursor")
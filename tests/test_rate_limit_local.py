@@ -0,0 +1,50 @@
+"""In-process rate limiting: what happens when the local counter table fills up."""
+import pytest
+
+try:
+    from services.rate_limit import limiter
+    from services.rate_limit.limiter import RateLimiter, RateLimitPolicy
+except (Exception, SystemExit) as e:
+    pytest.skip(f"app settings not configured: {e}", allow_module_level=True)
+
+
+POLICY = RateLimitPolicy("test", limit=3, window=60)
+
+
+@pytest.fixture
+def local_counts(monkeypatch):
+    monkeypatch.setattr(limiter, "LOCAL_MAX_KEYS", 10)
+    monkeypatch.setattr(RateLimiter, "_local_counts", {})
+    return RateLimiter._local_counts
+
+
+def _fill(local_counts, count: int, expires: float) -> None:
+    for i in range(count):
+        local_counts[f"rl:test:ip:filler-{i}:1"] = (1, expires)
+
+
+def test_full_table_keeps_live_windows(local_counts):
+    # A client at its limit must stay limited when the table overflows
+    for _ in range(POLICY.limit):
+        RateLimiter._hit_local("rl:test:ip:a:2", "rl:test:ip:a:1", POLICY, 0.5, expires=1e12)
+    _fill(local_counts, 5, expires=0.0)
+    live = {f"rl:test:ip:live-{i}:2": (1, 1e12) for i in range(5)}
+    local_counts.update(live)
+
+    allowed, current, _ = RateLimiter._hit_local("rl:test:ip:a:2", "rl:test:ip:a:1", POLICY, 0.5, expires=1e12)
+
+    assert not allowed
+    assert current == POLICY.limit
+    assert not any(key.startswith("rl:test:ip:filler-") for key in local_counts)
+    assert set(live) <= set(local_counts)
+
+
+def test_full_table_of_live_windows_drops_oldest(local_counts):
+    _fill(local_counts, 11, expires=1e12)
+
+    RateLimiter._hit_local("rl:test:ip:new:2", "rl:test:ip:new:1", POLICY, 0.5, expires=1e12)
+
+    assert len(local_counts) <= limiter.LOCAL_MAX_KEYS
+    assert "rl:test:ip:filler-0:1" not in local_counts
+    assert "rl:test:ip:filler-10:1" in local_counts
+    assert local_counts["rl:test:ip:new:2"] == (1, 1e12)